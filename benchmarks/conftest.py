@@ -0,0 +1,73 @@
+import tracemalloc
+import pytest
+from benchmarks.synthetic import synthetic_conversation
+from benchmarks.synthetic import synthetic_corpus
+from benchmarks.synthetic import write_cha
+from benchmarks.synthetic import write_eaf
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("synthetic", "synthetic benchmark data")
+    group.addoption("--synthetic-utterances", type=int, default=2000,
+                    help="number of utterances per synthetic conversation")
+    group.addoption("--synthetic-conversations", type=int, default=10,
+                    help="number of conversations in the synthetic corpus")
+    group.addoption("--synthetic-participants", type=int, default=2,
+                    help="number of participants per synthetic conversation")
+    group.addoption("--synthetic-overlap-rate", type=float, default=0.2,
+                    help="proportion of utterances overlapping the previous utterance")
+    group.addoption("--synthetic-missing-timing-rate", type=float, default=0.01,
+                    help="proportion of utterances without timing information")
+    group.addoption("--synthetic-seed", type=int, default=0,
+                    help="seed of the synthetic data generator")
+
+
+@pytest.fixture(scope="session")
+def synthetic_args(request):
+    return {
+        "n_utterances": request.config.getoption("--synthetic-utterances"),
+        "n_participants": request.config.getoption("--synthetic-participants"),
+        "overlap_rate": request.config.getoption("--synthetic-overlap-rate"),
+        "missing_timing_rate": request.config.getoption("--synthetic-missing-timing-rate"),
+        "seed": request.config.getoption("--synthetic-seed"),
+    }
+
+
+@pytest.fixture
+def conversation(synthetic_args):
+    return synthetic_conversation(**synthetic_args)
+
+
+@pytest.fixture
+def corpus(request, synthetic_args):
+    return synthetic_corpus(request.config.getoption("--synthetic-conversations"),
+                            **synthetic_args)
+
+
+@pytest.fixture(scope="session")
+def cha_path(tmp_path_factory, synthetic_args):
+    path = tmp_path_factory.mktemp("synthetic") / "synthetic.cha"
+    write_cha(path, synthetic_conversation(**synthetic_args))
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def eaf_path(tmp_path_factory, synthetic_args):
+    path = tmp_path_factory.mktemp("synthetic") / "synthetic.eaf"
+    write_eaf(path, synthetic_conversation(**synthetic_args))
+    return str(path)
+
+
+@pytest.fixture
+def track_peak_memory(benchmark):
+    """Run a function once under tracemalloc and record its peak memory in the benchmark results."""
+    def track(func, *args, **kwargs):
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["peak_memory_bytes"] = peak
+        return peak
+    return track
@@ -0,0 +1,143 @@
+"""Seeded generator of synthetic conversations, for benchmarking.
+
+The generated conversations mimic the structure of real transcriptions:
+participants take turns, sometimes overlap with the previous speaker,
+sometimes continue their own turn, and some utterances lack timing information.
+"""
+import random
+from typing import Optional
+from pympi import Elan
+from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.corpus import Corpus
+from sktalk.corpus.utterance import Utterance
+
+
+VOCABULARY = ["yeah", "no", "I", "you", "think", "that", "the", "was", "so", "uh",
+              "mm", "really", "okay", "and", "then", "we", "went", "there", "what", "right"]
+
+
+def synthetic_utterances(n_utterances: int = 1000,   # noqa: too-many-arguments
+                         n_participants: int = 2,
+                         overlap_rate: float = 0.2,
+                         missing_timing_rate: float = 0.01,
+                         seed: int = 0,
+                         max_words: int = 12) -> list[Utterance]:
+    """Generate a list of synthetic utterances
+
+    Note that utterances with a timing beyond 24 hours are invalid; with the default
+    durations this limits a single conversation to roughly 40.000 utterances.
+
+    Args:
+        n_utterances (int, optional): Number of utterances. Defaults to 1000.
+        n_participants (int, optional): Number of participants. Defaults to 2.
+        overlap_rate (float, optional): Proportion of utterances that start before the
+            previous utterance has ended. Defaults to 0.2.
+        missing_timing_rate (float, optional): Proportion of utterances without timing
+            information. Defaults to 0.01.
+        seed (int, optional): Seed for the random number generator. Defaults to 0.
+        max_words (int, optional): Maximum number of words per utterance. Defaults to 12.
+
+    Returns:
+        list[Utterance]: the generated utterances, in order of their begin time
+    """
+    rng = random.Random(seed)
+    participants = [f"P{i}" for i in range(n_participants)]
+    utterances = []
+    participant = participants[0]
+    previous_end = 0
+    for _ in range(n_utterances):
+        # mostly alternate between speakers, but sometimes continue
+        if n_participants > 1 and rng.random() < 0.7:
+            participant = rng.choice([p for p in participants if p != participant])
+        duration = rng.randint(300, 3000)
+        if rng.random() < overlap_rate:
+            begin = max(0, previous_end - rng.randint(50, 600))
+        else:
+            begin = previous_end + rng.randint(0, 1500)
+        end = begin + duration
+        previous_end = end
+        words = rng.choices(VOCABULARY, k=rng.randint(1, max_words))
+        time = None if rng.random() < missing_timing_rate else [begin, end]
+        utterances.append(Utterance(" ".join(words),
+                                    participant=participant,
+                                    time=time))
+    return utterances
+
+
+def synthetic_conversation(seed: int = 0, source: Optional[str] = None, **kwargs) -> Conversation:
+    """Generate a synthetic conversation
+
+    Args:
+        seed (int, optional): Seed for the random number generator. Defaults to 0.
+        source (str, optional): Source name stored in the metadata. Defaults to "synthetic-<seed>".
+        kwargs (dict): arguments passed on to `synthetic_utterances`
+
+    Returns:
+        Conversation: the generated conversation
+    """
+    utterances = synthetic_utterances(seed=seed, **kwargs)
+    metadata = {"source": source or f"synthetic-{seed}",
+                "Languages": ["eng"],
+                "Participants": {p: {"name": p} for p in sorted({u.participant for u in utterances})}}
+    return Conversation(utterances, metadata)
+
+
+def synthetic_corpus(n_conversations: int = 10, seed: int = 0, **kwargs) -> Corpus:
+    """Generate a synthetic corpus
+
+    Args:
+        n_conversations (int, optional): Number of conversations. Defaults to 10.
+        seed (int, optional): Seed of the first conversation; subsequent conversations
+            use consecutive seeds. Defaults to 0.
+        kwargs (dict): arguments passed on to `synthetic_utterances`
+
+    Returns:
+        Corpus: the generated corpus
+    """
+    conversations = [synthetic_conversation(seed=seed + i, **kwargs)
+                     for i in range(n_conversations)]
+    return Corpus(conversations, language="eng", generator="synthetic")
+
+
+def write_cha(path: str, conversation: Conversation):
+    """Write a conversation as a CHAT file
+
+    Utterances without timing information are written without a time bullet,
+    which means they are not read back by the `ChaFile` parser.
+
+    Args:
+        path (str): Path to the output file
+        conversation (Conversation): Conversation to write
+    """
+    participants = sorted(p for p in conversation.participants if p is not None)
+    lines = ["@UTF8",
+             "@Begin",
+             "@Languages:\teng",
+             "@Participants:\t" + ", ".join(f"{p} {p} Adult" for p in participants)]
+    lines += [f"@ID:\teng|synthetic|{p}|||||Adult|||" for p in participants]
+    for utterance in conversation.utterances:
+        bullet = f" \x15{utterance.time[0]}_{utterance.time[1]}\x15" if utterance.time else ""
+        lines.append(f"*{utterance.participant}:\t{utterance.utterance}{bullet}")
+    lines.append("@End")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_eaf(path: str, conversation: Conversation):
+    """Write a conversation as an ELAN file, with one tier per participant
+
+    Utterances without timing information cannot be represented in ELAN and are skipped.
+
+    Args:
+        path (str): Path to the output file
+        conversation (Conversation): Conversation to write
+    """
+    eaf = Elan.Eaf()
+    eaf.remove_tier("default")
+    for participant in sorted(p for p in conversation.participants if p is not None):
+        eaf.add_tier(participant)
+    for utterance in conversation.utterances:
+        if utterance.time:
+            eaf.add_annotation(utterance.participant, *utterance.time,
+                               value=utterance.utterance)
+    Elan.to_eaf(path, eaf, pretty=False)
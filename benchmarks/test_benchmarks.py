@@ -0,0 +1,100 @@
+import os
+from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.parsing.cha import ChaFile
+from sktalk.corpus.parsing.eaf import EafFile
+
+
+def _reset_caches(obj):
+    obj._utterance_df = None  # noqa: W0212
+    obj._metadata_df = None   # noqa: W0212
+
+
+class TestParsing:
+    def test_cha_parse(self, benchmark, track_peak_memory, cha_path):
+        track_peak_memory(ChaFile(cha_path).parse)
+        utterances, _ = benchmark(ChaFile(cha_path).parse)
+        assert utterances
+
+    def test_eaf_parse(self, benchmark, track_peak_memory, eaf_path):
+        track_peak_memory(EafFile(eaf_path).parse)
+        utterances, _ = benchmark(EafFile(eaf_path).parse)
+        assert utterances
+
+    def test_eaf_sorting(self, benchmark, track_peak_memory, eaf_path):
+        """Extracting and sorting utterances from an already loaded ELAN file"""
+        eaf = EafFile(eaf_path)
+        eaf.pympi_eaf  # noqa: pointless-statement
+        track_peak_memory(eaf._extract_utterances)   # noqa: W0212
+        utterances = benchmark(eaf._extract_utterances)   # noqa: W0212
+        assert utterances
+
+
+class TestConversation:
+    def test_calculate_FTO(self, benchmark, track_peak_memory, conversation):
+        track_peak_memory(conversation.calculate_FTO)
+        benchmark(conversation.calculate_FTO)
+        assert "FTO" in conversation.metadata["Calculations"]
+
+    def test_transitions(self, benchmark, track_peak_memory, conversation):
+        def transitions():
+            conversation._reset_utterance_caches()  # noqa: W0212
+            return conversation.transitions()
+        track_peak_memory(transitions)
+        df = benchmark(transitions)
+        assert len(df) == len(conversation) - 1
+
+    def test_utterance_df(self, benchmark, track_peak_memory, conversation):
+        def utterance_df():
+            _reset_caches(conversation)
+            return conversation.utterance_df
+        track_peak_memory(utterance_df)
+        df = benchmark(utterance_df)
+        assert len(df) == len(conversation)
+
+    def test_write_json(self, benchmark, track_peak_memory, conversation, tmp_path):
+        path = tmp_path / "conversation.json"
+        track_peak_memory(conversation.write_json, path)
+        benchmark(conversation.write_json, path)
+        assert os.path.exists(path)
+
+    def test_from_json(self, benchmark, track_peak_memory, conversation, tmp_path):
+        path = tmp_path / "conversation.json"
+        conversation.write_json(path)
+        track_peak_memory(Conversation.from_json, path)
+        json_in = benchmark(Conversation.from_json, path)
+        assert len(json_in) == len(conversation)
+
+    def test_from_csv(self, benchmark, track_peak_memory, conversation, tmp_path):
+        path = tmp_path / "conversation.csv"
+        conversation.write_csv(path)
+        track_peak_memory(Conversation.from_csv, path)
+        csv_in = benchmark(Conversation.from_csv, path)
+        assert len(csv_in) == len(conversation)
+
+
+class TestCorpus:
+    def test_utterance_df(self, benchmark, track_peak_memory, corpus):
+        def utterance_df():
+            _reset_caches(corpus)
+            for conversation in corpus.conversations:
+                _reset_caches(conversation)
+            return corpus.utterance_df
+        track_peak_memory(utterance_df)
+        df = benchmark(utterance_df)
+        assert len(df) == sum(len(c) for c in corpus.conversations)
+
+    def test_metadata_df(self, benchmark, track_peak_memory, corpus):
+        def metadata_df():
+            _reset_caches(corpus)
+            for conversation in corpus.conversations:
+                _reset_caches(conversation)
+            return corpus.metadata_df
+        track_peak_memory(metadata_df)
+        df = benchmark(metadata_df)
+        assert len(df) == len(corpus.conversations)
+
+    def test_write_json(self, benchmark, track_peak_memory, corpus, tmp_path):
+        path = tmp_path / "corpus.json"
+        track_peak_memory(corpus.write_json, path)
+        benchmark(corpus.write_json, path)
+        assert os.path.exists(path)
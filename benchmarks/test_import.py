@@ -0,0 +1,20 @@
+import subprocess
+import sys
+
+
+def _import_sktalk():
+    subprocess.run([sys.executable, "-c", "import sktalk; sktalk.Conversation; sktalk.Corpus"], check=True)
+
+
+def _import_python():
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+
+
+def test_import_time(benchmark):
+    """Interpreter startup including importing sktalk and its main classes"""
+    benchmark.pedantic(_import_sktalk, rounds=10, warmup_rounds=1)
+
+
+def test_startup_time(benchmark):
+    """Bare interpreter startup, as a baseline for `test_import_time`"""
+    benchmark.pedantic(_import_python, rounds=10, warmup_rounds=1)
@@ -1,9 +1,30 @@
 """Documentation about scikit-talk"""
+import importlib
 import logging
-# Import the modules that are part of the sktalk package
-from .corpus.conversation import Conversation  # noqa: F401
-from .corpus.corpus import Corpus  # noqa: F401
-from .corpus.utterance import Utterance  # noqa: F401
+
+
+# The main classes are imported lazily, on first attribute access,
+# to keep `import sktalk` fast; heavy dependencies (pandas, NumPy,
+# pylangacq, pympi) are only imported when they are used.
+_LAZY_IMPORTS = {
+    "Conversation": ".corpus.conversation",
+    "Corpus": ".corpus.corpus",
+    "LazyCorpus": ".corpus.lazy",
+    "Utterance": ".corpus.utterance",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
 
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -0,0 +1,219 @@
+"""Command-line interface of scikit-talk
+
+Subcommands:
+- convert: convert conversation files to JSON or CSV
+- fto: calculate the Floor Transfer Offset of each utterance, and write the conversations to JSON or CSV
+- stats: print summary statistics of conversation files, including the FTO, followed by their total
+
+Inputs can be conversation files, or directories in which files matching `--pattern` are processed.
+Files are processed in parallel with `--jobs` worker processes. Every output directory has a
+manifest (".sktalk.json") of the inputs, subcommand and parameters of its outputs; outputs of which
+none of these changed are skipped, unless `--force` is given. Inputs that would overwrite each
+other's output, or their own file, are not processed.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+from .corpus.manifest import Manifest
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the command-line interface
+
+    Args:
+        argv (list[str], optional): the command-line arguments. Defaults to None,
+            in which case `sys.argv` is used.
+
+    Returns:
+        int: the exit code; 1 if any of the files could not be processed
+    """
+    args = _parser().parse_args(argv)
+    paths = _find_files(args.inputs, args.pattern)
+    calculation = None
+    if args.command in ("fto", "stats"):
+        calculation = {"window": args.window,
+                       "planning_buffer": args.planning_buffer,
+                       "n_participants": args.n_participants}
+    if args.command == "stats":
+        tasks = [(str(path), None, None, calculation) for path in paths]
+    else:
+        tasks = [(str(path), str(_output_path(path, args.output, args.format)), args.format, calculation)
+                 for path in paths]
+
+    start = time.perf_counter()
+    results, skipped, failed = [], 0, 0
+    parameters = [[args.command, calculation]]
+    for (path, *_), result in zip(tasks, _run(tasks, args.jobs, getattr(args, "force", False), parameters)):
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"Could not process {path}: {result}", file=sys.stderr)
+        elif result is None:
+            skipped += 1
+        else:
+            results.append(result)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    if args.command == "stats" and results:
+        _print_stats(results, args.output)
+    n_utterances = sum(result.n_utterances if args.command == "stats" else result["utterances"]
+                       for result in results)
+    print(f"Processed {len(results)} files ({n_utterances} utterances) in {elapsed:.2f} s: "
+          f"{len(results) / elapsed:.1f} files/s, {n_utterances / elapsed:.0f} utterances/s; "
+          f"{skipped} skipped, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="sktalk", description="Process transcribed conversations.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("inputs", nargs="+",
+                        help="conversation files, or directories containing conversation files")
+    common.add_argument("--pattern", default="*.cha",
+                        help="glob pattern of the files to process in directories (default: %(default)s)")
+    common.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes (default: %(default)s)")
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("-o", "--output",
+                        help="output directory (default: the directory of each input file)")
+    output.add_argument("-f", "--format", choices=["json", "csv"], default="json",
+                        help="output format (default: %(default)s)")
+    output.add_argument("--force", action="store_true",
+                        help="also process files of which the output is up to date")
+
+    fto_options = argparse.ArgumentParser(add_help=False)
+    fto_options.add_argument("--window", type=int, default=10000,
+                             help="time in ms prior to an utterance in which to find the relevant prior utterance "
+                                  "(default: %(default)s)")
+    fto_options.add_argument("--planning-buffer", type=int, default=200,
+                             help="minimum speaking time in ms to allow for a response (default: %(default)s)")
+    fto_options.add_argument("--n-participants", type=int, default=2,
+                             help="maximum number of participants overlapping with the utterance and window "
+                                  "(default: %(default)s)")
+
+    subparsers.add_parser("convert", parents=[common, output],
+                          help="convert conversation files to JSON or CSV")
+    subparsers.add_parser("fto", parents=[common, output, fto_options],
+                          help="calculate the Floor Transfer Offset (FTO) of each utterance")
+    stats = subparsers.add_parser("stats", parents=[common, fto_options],
+                                  help="print summary statistics of conversations, including their FTO")
+    stats.add_argument("-o", "--output", help="write the statistics to this CSV file instead of printing them")
+    return parser
+
+
+def _find_files(inputs: list[str], pattern: str) -> list[Path]:
+    paths = []
+    for item in map(Path, inputs):
+        paths.extend(sorted(item.glob(pattern)) if item.is_dir() else [item])
+    return paths
+
+
+def _output_path(path: Path, output: Optional[str], extension: str) -> Path:
+    directory = Path(output) if output is not None else path.parent
+    return directory / f"{path.stem}.{extension}"
+
+
+class _OutputManifest(Manifest):
+    """Record of the inputs, subcommand and parameters of the outputs in a directory"""
+
+    FILENAME = ".sktalk.json"
+
+
+def _run(tasks: list[tuple], jobs: int, force: bool, parameters: list) -> list:
+    """Process the tasks; the result of skipped tasks is None"""
+    results = [None] * len(tasks)
+    errors = _check_outputs(tasks)
+    manifests, entries, todo = {}, {}, []
+    for index, (path, output, *_) in enumerate(tasks):
+        if index in errors:
+            results[index] = errors[index]
+            continue
+        if output is not None:
+            directory, name = os.path.split(output)
+            if directory not in manifests:
+                manifests[directory] = _OutputManifest.read(directory)
+            try:
+                entries[index] = manifests[directory].entry(path, name, parameters, name)
+            except OSError:
+                # the error is reported when the file is processed
+                pass
+            else:
+                if not force and os.path.exists(output) and not manifests[directory].changed(name, entries[index]):
+                    continue
+        todo.append(index)
+
+    pending = [tasks[index] for index in todo]
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            processed = list(executor.map(_process, pending, chunksize=4))
+    else:
+        processed = [_process(task) for task in pending]
+    for index, result in zip(todo, processed):
+        results[index] = result
+        if index in entries and not isinstance(result, Exception):
+            directory, name = os.path.split(tasks[index][1])
+            manifests[directory].files[name] = entries[index]
+    for directory, manifest in manifests.items():
+        if manifest.files:
+            manifest.write(directory)
+    return results
+
+
+def _check_outputs(tasks: list[tuple]) -> dict[int, Exception]:
+    """Find tasks of which the output is the output of another task, or the input itself"""
+    outputs = {}
+    for index, (_, output, *_) in enumerate(tasks):
+        if output is not None:
+            outputs.setdefault(os.path.realpath(output), []).append(index)
+    errors = {}
+    for output, indices in outputs.items():
+        if len(indices) > 1:
+            inputs = ", ".join(tasks[index][0] for index in indices)
+            for index in indices:
+                errors[index] = ValueError(f"the output {output} would be written for each of {inputs}")
+        elif os.path.realpath(tasks[indices[0]][0]) == output:
+            errors[indices[0]] = ValueError(f"the output {output} would overwrite the input")
+    return errors
+
+
+def _process(task: tuple):
+    """Process a single file in a worker; errors are returned rather than raised, so other files are processed"""
+    from .corpus.lazy import ConversationSequence  # noqa: import-outside-toplevel
+    from .corpus.stats import Summary  # noqa: import-outside-toplevel
+    path, output, output_format, calculation = task
+    try:
+        parser = ConversationSequence.PARSERS.get(Path(path).suffix.lower())
+        if parser is None:
+            raise ValueError(f"unsupported file type {Path(path).suffix!r}")
+        conversation = parser(path)
+        if calculation is not None:
+            conversation.calculate_FTO(**calculation)
+        if output is None:
+            return Summary.from_conversation(conversation)
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(conversation, f"write_{output_format}")(output)
+        return {"source": path, "utterances": len(conversation)}
+    except Exception as e:  # noqa: broad-exception-caught
+        return e
+
+
+def _print_stats(summaries: list, output: Optional[str]):
+    from .corpus.stats import summary_df  # noqa: import-outside-toplevel
+    df = summary_df(summaries)
+    if output is None:
+        print(df.to_string(index=False))
+    else:
+        df.to_csv(output, index=False)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import struct
+from typing import Optional
+
+
+class WavFile:
+    """Memory-mapped access to the samples in a WAV file
+
+    Only the header of the file is read; the samples are memory-mapped, so that
+    segments of long recordings can be accessed without reading the whole file.
+    Integer PCM (8, 16 or 32 bit) and 32 or 64 bit floating point samples are supported.
+    """
+
+    PCM = 1
+    IEEE_FLOAT = 3
+    EXTENSIBLE = 0xFFFE
+    DTYPES = {(PCM, 8): "u1", (PCM, 16): "<i2", (PCM, 32): "<i4",
+              (IEEE_FLOAT, 32): "<f4", (IEEE_FLOAT, 64): "<f8"}
+
+    def __init__(self, path: str) -> None:
+        """Read the header of a WAV file
+
+        Args:
+            path (str): Path to the WAV file
+
+        Raises:
+            ValueError: if the file is not a WAV file, or its sample format is not supported
+        """
+        self._path = str(path)
+        self._samples = None
+        with open(path, "rb") as f:
+            riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+            if riff != b"RIFF" or wave != b"WAVE":
+                raise ValueError(f"{path} is not a WAV file")
+            audio_format = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    raise ValueError(f"{path} contains no audio data")
+                chunk_id, size = struct.unpack("<4sI", header)
+                if chunk_id == b"fmt ":
+                    fmt = f.read(size)
+                    audio_format, self.n_channels, self.sample_rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+                    if audio_format == self.EXTENSIBLE:
+                        # the format is the first two bytes of the subformat GUID
+                        audio_format, = struct.unpack("<H", fmt[24:26])
+                elif chunk_id == b"data":
+                    if audio_format is None:
+                        raise ValueError(f"{path} has no format chunk before its audio data")
+                    self._offset = f.tell()
+                    self._size = size
+                    break
+                else:
+                    f.seek(size, 1)
+                # chunks are aligned to two bytes
+                if size % 2:
+                    f.seek(1, 1)
+        if (audio_format, bits) not in self.DTYPES:
+            raise ValueError(f"Unsupported WAV sample format {audio_format} with {bits} bits in {path}")
+        self.dtype = self.DTYPES[(audio_format, bits)]
+        self.n_frames = self._size // (bits // 8 * self.n_channels)
+
+    @property
+    def samples(self) -> "np.memmap":  # noqa: F821
+        """
+        Get the samples of the file, memory-mapped.
+
+        Returns:
+            np.memmap: array of shape (frames, channels)
+        """
+        if self._samples is None:
+            import numpy as np  # noqa: import-outside-toplevel
+            self._samples = np.memmap(self._path, dtype=self.dtype, mode="r", offset=self._offset,
+                                      shape=(self.n_frames, self.n_channels))
+        return self._samples
+
+    @property
+    def duration(self) -> float:
+        """
+        Get the duration of the recording.
+
+        Returns:
+            float: duration in ms
+        """
+        return self.n_frames * 1000 / self.sample_rate
+
+    def segment(self, begin: float, end: float) -> Optional["np.ndarray"]:  # noqa: F821
+        """Get the samples between two times, without reading the rest of the file
+
+        Args:
+            begin (float): begin time in ms
+            end (float): end time in ms
+
+        Returns:
+            np.ndarray: view of the memory-mapped samples, of shape (frames, channels);
+                times beyond the end of the recording are left out
+        """
+        start = min(max(round(begin * self.sample_rate / 1000), 0), self.n_frames)
+        stop = min(max(round(end * self.sample_rate / 1000), start), self.n_frames)
+        return self.samples[start:stop]
@@ -0,0 +1,142 @@
+"""Compact columnar representation of utterances, used to pickle conversations
+
+Instead of pickling every Utterance as a separate object, the fields of all utterances
+are packed in a few NumPy arrays, which makes pickles smaller and faster to create and load.
+This only changes the size of the pickle: multiprocessing pools (and `ProcessPoolExecutor`)
+still pickle conversations in-band, and no shared memory is used. Callers that pickle with
+protocol 5 and a `buffer_callback` can transfer the arrays out-of-band themselves.
+"""
+from dataclasses import fields
+from .utterance import Utterance
+
+
+STRING_FIELDS = ["utterance", "participant", "begin_timestamp", "end_timestamp", "utterance_raw", "utterance_id"]
+NUMBER_FIELDS = ["begin", "end", "n_words", "n_characters", "FTO"]
+UTTERANCE_FIELDS = [field.name for field in fields(Utterance)]
+
+
+def pack_strings(values: list) -> dict:
+    """Pack a list of optional strings in a single UTF-8 encoded array
+
+    Args:
+        values (list[str | None]): the strings to pack
+
+    Returns:
+        dict: the encoded text, the character offsets of the strings and a mask of missing values
+    """
+    import numpy as np  # noqa: import-outside-toplevel
+    missing = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+    strings = ["" if value is None else value for value in values]
+    lengths = _compact(np.fromiter(map(len, strings), dtype=np.int64, count=len(values)))
+    text = np.frombuffer("".join(strings).encode("utf-8"), dtype=np.uint8)
+    return {"text": text, "lengths": lengths, "missing": missing if missing.any() else None}
+
+
+def unpack_strings(packed: dict) -> list:
+    """Unpack a list of optional strings packed with `pack_strings`
+
+    Args:
+        packed (dict): the packed strings
+
+    Returns:
+        list[str | None]: the strings
+    """
+    import numpy as np  # noqa: import-outside-toplevel
+    text = packed["text"].tobytes().decode("utf-8")
+    offsets = np.cumsum(packed["lengths"], dtype=np.int64).tolist()
+    values = [text[start:stop] for start, stop in zip([0] + offsets[:-1], offsets)]
+    if packed["missing"] is not None:
+        for index in packed["missing"].nonzero()[0].tolist():
+            values[index] = None
+    return values
+
+
+def pack_numbers(values: list) -> dict:
+    """Pack a list of optional numbers in an array
+
+    Args:
+        values (list[int | float | None]): the numbers to pack
+
+    Returns:
+        dict: the numbers, and a mask of missing values
+    """
+    import numpy as np  # noqa: import-outside-toplevel
+    missing = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+    array = _compact(np.array([0 if value is None else value for value in values]))
+    return {"values": array, "missing": missing if missing.any() else None}
+
+
+def _compact(array):
+    """Store integers in the smallest data type that can hold them"""
+    import numpy as np  # noqa: import-outside-toplevel
+    if array.dtype.kind != "i" or not array.size:
+        return array
+    return array.astype(np.promote_types(np.min_scalar_type(array.min()), np.min_scalar_type(array.max())))
+
+
+def unpack_numbers(packed: dict) -> list:
+    """Unpack a list of optional numbers packed with `pack_numbers`
+
+    Args:
+        packed (dict): the packed numbers
+
+    Returns:
+        list[int | float | None]: the numbers
+    """
+    values = packed["values"].tolist()
+    if packed["missing"] is not None:
+        for index in packed["missing"].nonzero()[0].tolist():
+            values[index] = None
+    return values
+
+
+def pack_utterances(utterances: list[Utterance]) -> dict:
+    """Pack the fields of a list of utterances in arrays
+
+    Args:
+        utterances (list[Utterance]): the utterances to pack
+
+    Returns:
+        dict: the packed fields
+    """
+    packed = {"n": len(utterances)}
+    for name in STRING_FIELDS:
+        packed[name] = pack_strings([getattr(u, name) for u in utterances])
+    for name in NUMBER_FIELDS:
+        packed[name] = pack_numbers([getattr(u, name) for u in utterances])
+    packed["time"] = [pack_numbers([None if u.time is None else u.time[i] for u in utterances])
+                      for i in range(2)]
+    # the utterance list is only stored if it differs from the split utterance
+    lists = [None if u.utterance_list == u.utterance.split() else u.utterance_list for u in utterances]
+    exceptions = {index: utterance_list for index, utterance_list in enumerate(lists) if utterance_list is not None}
+    packed["utterance_list"] = exceptions or None
+    metadata = [u.metadata for u in utterances]
+    packed["metadata"] = metadata if any(m is not None for m in metadata) else None
+    return packed
+
+
+def unpack_utterances(packed: dict) -> list[Utterance]:
+    """Unpack a list of utterances packed with `pack_utterances`
+
+    The utterances are restored as they were packed, without cleaning and validating them again.
+
+    Args:
+        packed (dict): the packed fields
+
+    Returns:
+        list[Utterance]: the utterances
+    """
+    n = packed["n"]
+    columns = {name: unpack_strings(packed[name]) for name in STRING_FIELDS}
+    columns |= {name: unpack_numbers(packed[name]) for name in NUMBER_FIELDS}
+    begins, ends = (unpack_numbers(time) for time in packed["time"])
+    columns["time"] = [None if begin is None else [begin, end] for begin, end in zip(begins, ends)]
+    columns["utterance_list"] = [utterance.split() for utterance in columns["utterance"]]
+    for index, utterance_list in (packed["utterance_list"] or {}).items():
+        columns["utterance_list"][index] = utterance_list
+    columns["metadata"] = packed["metadata"] or [None] * n
+    utterances = [Utterance.__new__(Utterance) for _ in range(n)]
+    for utterance, values in zip(utterances, zip(*(columns[name] for name in UTTERANCE_FIELDS))):
+        # restore the fields directly, as unpickling a dataclass does
+        utterance.__dict__ = dict(zip(UTTERANCE_FIELDS, values))
+    return utterances
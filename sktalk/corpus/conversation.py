@@ -1,25 +1,52 @@
-import json
+import copy
+import threading
 import warnings
+from collections import Counter
+from pathlib import Path
 from typing import Optional
-import pandas as pd
+from typing import Union
+from urllib.parse import unquote
+from urllib.parse import urlparse
+from ..profiling import count_self
+from ..profiling import instrument
+from .columnar import pack_utterances
+from .columnar import unpack_utterances
+from .jsonfile import load
 from .parsing.cha import ChaFile
+from .parsing.csv import CsvFile
 from .parsing.eaf import EafFile
+from .parsing.xml import XmlFile
+from .query import Query
+from .query import as_query
 from .utterance import Utterance
 from .write.writer import Writer
 
 
 class Conversation(Writer):
+    @instrument("Conversation.__init__", count=count_self)
     def __init__(
         self,
         utterances: list["Utterance"],
         metadata: Optional[dict] = None,
-        suppress_warnings: bool = False
+        suppress_warnings: bool = False,
+        copy_on_write: bool = False
     ) -> None:
         """Representation of a transcribed conversation
 
+        Cached representations of the utterances (such as `utterance_df`) are created under a lock,
+        so that a Conversation can be read from multiple threads. Calculations (such as
+        `calculate_FTO`) update the utterances in place, which affects other conversations that
+        share the same Utterance objects, e.g. sub-conversations and query results; the cached
+        representations of a conversation and of the sub-conversations and query results created
+        from it are rebuilt after such an update. With `copy_on_write`, calculations
+        update copies of the utterances instead, and replace the utterances and metadata of the
+        conversation at once; readers in other threads see either the old or the new utterances.
+
         Args:
             utterances (list[Utterance]): A list of Utterance objects representing the utterances in the conversation.
             metadata (dict, optional): Additional metadata associated with the conversation. Defaults to None.
+            suppress_warnings (bool, optional): do not warn if the conversation is empty. Defaults to False.
+            copy_on_write (bool, optional): update copies of the utterances in calculations. Defaults to False.
         """
         self._metadata = metadata or {"source": "unknown"}
 
@@ -39,8 +66,42 @@ class Conversation(Writer):
             warnings.warn(
                 "This conversation appears to be empty: no Utterances are read.")
 
+        self._copy_on_write = copy_on_write
+        self._lock = threading.RLock()
         self._metadata_df = None
         self._utterance_df = None
+        self._columns = None
+        self._utterance_ids = None
+        self._participant_counts = None
+        # revision of the utterances, shared with the conversations created from this conversation
+        # that share its Utterance objects; updating the utterances in place increments it
+        self._revision = [0]
+        self._cached_revision = 0
+
+    def _share(self, utterances: list["Utterance"], metadata: Optional[dict] = None, **kwargs) -> "Conversation":
+        """Create a conversation sharing Utterance objects with this conversation, and their revision"""
+        conversation = Conversation(utterances, metadata, suppress_warnings=True, **kwargs)
+        conversation._revision = self._revision
+        conversation._cached_revision = self._revision[0]
+        return conversation
+
+    def _check_revision(self):
+        """Reset cached representations of the utterances if they were updated through another conversation"""
+        if self._cached_revision != self._revision[0]:
+            self._reset_utterance_caches()
+
+    def __reduce__(self):
+        """Pickle the Conversation in a compact columnar form
+
+        The utterances are packed in NumPy arrays, which makes the pickle smaller; see
+        `sktalk.corpus.columnar`. Worker pools still copy the pickle to each process.
+        Cached dataframes and the lock are not pickled.
+        """
+        return (type(self)._from_packed, (pack_utterances(self._utterances), self._metadata, self._copy_on_write))
+
+    @classmethod
+    def _from_packed(cls, packed: dict, metadata: dict, copy_on_write: bool = False):
+        return cls(unpack_utterances(packed), metadata, suppress_warnings=True, copy_on_write=copy_on_write)
 
     @property
     def utterances(self):
@@ -71,6 +132,25 @@ class Conversation(Writer):
         """
         return len(self._utterances)
 
+    def __getitem__(self, index):
+        """
+        Get an utterance by position, or a range of utterances as a sub-conversation.
+
+        Args:
+            index (int | slice): position of the utterance, or slice of positions
+
+        Returns:
+            Utterance | Conversation: the utterance, or a Conversation object without metadata
+                sharing the selected Utterance objects
+        """
+        if isinstance(index, slice):
+            return self._share(self._utterances[index])
+        return self._utterances[index]
+
+    def __iter__(self):
+        """Iterate over the utterances in the conversation."""
+        return iter(self._utterances)
+
     @property
     def participants(self):
         """
@@ -79,29 +159,72 @@ class Conversation(Writer):
         Returns:
             set[str]: A set of unique participant names.
         """
-        return {u.participant for u in self._utterances}
+        return set(self.participant_counts)
+
+    @property
+    def participant_counts(self):
+        """
+        Get the number of utterances of each participant; the counts are cached.
+
+        Returns:
+            dict[str, int]: the number of utterances per participant name, in order of
+                their first utterance; utterances without a participant are counted under None
+        """
+        with self._lock:
+            self._check_revision()
+            if self._participant_counts is None:
+                self._participant_counts = dict(Counter(u.participant for u in self._utterances))
+            return dict(self._participant_counts)
 
     @classmethod
-    def from_cha(cls, path):
+    def from_records(cls, records: list[dict], metadata: Optional[dict] = None, **kwargs):
+        """Create a conversation from utterance records
+
+        The utterances are created at once with `Utterance.from_arrays`, so that their
+        timing is validated in a single pass.
+
+        Args:
+            records (list[dict]): one dict per utterance, with the key "utterance" and optionally
+                "participant", "utterance_id", and "time" (as [begin, end]) or "begin" and "end" (in ms)
+            metadata (dict, optional): metadata of the conversation. Defaults to None.
+            kwargs (dict): further arguments for `Conversation`
+
+        Returns:
+            Conversation: A Conversation object containing the utterances
+        """
+        times = [record.get("time") or [record.get("begin"), record.get("end")] for record in records]
+        utterances = Utterance.from_arrays([record["utterance"] for record in records],
+                                           participants=[record.get("participant") for record in records],
+                                           begin=[time[0] for time in times],
+                                           end=[time[1] for time in times],
+                                           utterance_ids=[record.get("utterance_id") for record in records])
+        return cls(utterances, metadata, **kwargs)
+
+    @classmethod
+    def from_cha(cls, path, content: Optional[bytes] = None):
         """Parse conversation file in Cha format
 
         Args:
             path (str): Path to the Cha file
+            content (bytes, optional): Content of the file, e.g. read from an archive; `path` is then
+                only used as the source. Defaults to None.
 
         Returns:
             Conversation: A Conversation object representing the conversation in the file.
         """
-        utterances, metadata = ChaFile(path).parse()
+        utterances, metadata = ChaFile(path, content).parse()
         return cls(utterances, metadata)
 
     @classmethod
-    def from_eaf(cls, path: str, tiers: Optional[list[str]] = None):
+    def from_eaf(cls, path: str, tiers: Optional[list[str]] = None, content: Optional[bytes] = None):
         """Parse conversation file in ELAN format
 
         Args:
             path (str): Path to the ELAN file
             tiers (Optional[list[str]], optional): List of tiers to parse. Defaults to None, in which case all tiers are parsed.
                 If an empty list is passed, all tiers are parsed, but a warning is issued.
+            content (bytes, optional): Content of the file, e.g. read from an archive; `path` is then
+                only used as the source. Defaults to None.
 
         Raises:
             KeyError if tiers are named that are not found in the file.
@@ -109,19 +232,56 @@ class Conversation(Writer):
         Returns:
             Conversation: A Conversation object representing the conversation in the file.
         """
-        utterances, metadata = EafFile(path, tiers).parse()
+        utterances, metadata = EafFile(path, tiers, content).parse()
+        return cls(utterances, metadata)
+
+    @classmethod
+    def from_csv(cls, path: str, **kwargs):
+        """Parse conversation file in CSV format, such as written by `write_csv`
+
+        Args:
+            path (str): Path to the CSV file
+            kwargs (dict): further arguments for `CsvFile`
+
+        Raises:
+            ValueError if the file contains multiple conversations; use `Corpus.from_csv` instead.
+
+        Returns:
+            Conversation: A Conversation object representing the conversation in the file.
+        """
+        utterances, metadata = CsvFile(path, **kwargs).parse()
         return cls(utterances, metadata)
 
     @classmethod
-    def from_json(cls, path):
+    def from_xml(cls, path: str):
+        """Parse conversation file in TalkBank XML format
+
+        Args:
+            path (str): Path to the XML file
+
+        Raises:
+            ValueError if the file contains multiple conversations; use `Corpus.from_xml` instead.
+
+        Returns:
+            Conversation: A Conversation object representing the conversation in the file.
+        """
+        utterances, metadata = XmlFile(path).parse()
+        return cls(utterances, metadata)
+
+    @classmethod
+    def from_json(cls, path, backend: str = "json"):
         """Parse conversation file in JSON format
 
+        Files ending in ".gz", ".xz" or ".zst" are decompressed.
+
+        Args:
+            path (str): Path to the JSON file
+            backend (str, optional): JSON decoder, "json" or the faster "orjson". Defaults to "json".
+
         Returns:
             Conversation: A Conversation object representing the conversation in the file.
         """
-        with open(path, encoding='utf-8') as f:
-            json_in = json.load(f)
-        return cls._fromdict(json_in)
+        return cls._fromdict(load(path, backend))
 
     @classmethod
     def _fromdict(cls, fields):
@@ -133,8 +293,82 @@ class Conversation(Writer):
                 "This object cannot be imported as a Conversation.") from e
         return Conversation(utterances, metadata=fields)
 
-    def get_utterance(self, index) -> "Utterance":  # noqa: F821
-        raise NotImplementedError
+    def get_utterance(self, utterance_id: str) -> "Utterance":  # noqa: F821
+        """
+        Get an utterance by its identifier.
+
+        The parsers identify utterances by their position in the file (e.g. "u3"), unless the file
+        stores identifiers; identifiers are unique within a conversation, not across a corpus.
+        Utterances without an identifier cannot be looked up.
+
+        Args:
+            utterance_id (str): identifier of the utterance
+
+        Raises:
+            KeyError: if no utterance has this identifier
+
+        Returns:
+            Utterance: the utterance with this identifier
+        """
+        with self._lock:
+            self._check_revision()
+            if self._utterance_ids is None:
+                self._utterance_ids = {u.utterance_id: u for u in self._utterances if u.utterance_id is not None}
+            utterance_ids = self._utterance_ids
+        try:
+            return utterance_ids[utterance_id]
+        except KeyError as e:
+            raise KeyError(f"No utterance with id {utterance_id!r} in the conversation") from e
+
+    def media_path(self) -> Path:
+        """
+        Find the WAV file of the recording of the conversation.
+
+        The file is resolved from the media descriptors of ELAN files, or from the "Media"
+        entry of CHAT files (e.g. "conv01, audio", referring to conv01.wav). Relative paths
+        are resolved relative to the directory of the source of the conversation.
+
+        Raises:
+            FileNotFoundError: if the metadata does not refer to a WAV file that exists
+
+        Returns:
+            Path: path to the WAV file
+        """
+        directory = Path(self._metadata.get("source", ".")).parent
+        candidates = []
+        for descriptor in self._metadata.get("media_descriptors") or []:
+            urls = [descriptor.get("RELATIVE_MEDIA_URL"), descriptor.get("MEDIA_URL")]
+            is_wav = descriptor.get("MIME_TYPE") == "audio/x-wav"
+            for url in filter(None, urls):
+                path = Path(unquote(urlparse(url).path))
+                if is_wav or path.suffix.lower() == ".wav":
+                    candidates.append(directory / path)
+        if media := self._metadata.get("Media"):
+            name = media.split(",")[0].strip()
+            candidates.append(directory / (name if name.lower().endswith(".wav") else f"{name}.wav"))
+        for candidate in candidates:
+            if candidate.is_file():
+                return candidate
+        raise FileNotFoundError(
+            f"No WAV file found for {self._metadata.get('source')}; tried: {', '.join(map(str, candidates))}")
+
+    def audio_segments(self, media: Optional[str] = None) -> list:
+        """
+        Get the audio of every utterance from the recording of the conversation.
+
+        The recording is memory-mapped, so only the samples of the utterances are read.
+
+        Args:
+            media (str | WavFile, optional): the WAV file, or its path. Defaults to None,
+                in which case the file is found with `media_path`.
+
+        Returns:
+            list[np.ndarray | None]: the samples of each utterance, of shape (frames, channels),
+                or None for utterances without timing information
+        """
+        from .audio import WavFile  # noqa: import-outside-toplevel
+        wav = media if isinstance(media, WavFile) else WavFile(media or self.media_path())
+        return [utterance.get_audio(wav) for utterance in self._utterances]
 
     def summary(self, n=10, **fields):
         """
@@ -163,7 +397,7 @@ class Conversation(Writer):
         """
         utterances = [utterance for utterance in self._utterances if all(
             getattr(utterance, key) == value for key, value in fields.items())]
-        return Conversation(utterances, suppress_warnings=True)
+        return self._share(utterances)
 
     def remove(self, **fields):
         """Remove utterances based on content in specific fields
@@ -171,9 +405,20 @@ class Conversation(Writer):
         Args:
             fields (dict): key-value pairs with which specific utterances can be selected
         """
-        to_remove = self.select(**fields)
-        self._utterances = [
-            u for u in self._utterances if u not in to_remove.utterances]
+        with self._lock:
+            to_remove = self.select(**fields)
+            self._utterances = [
+                u for u in self._utterances if u not in to_remove.utterances]
+            self._reset_utterance_caches()
+
+    def _reset_utterance_caches(self):
+        """Reset cached representations of the utterances, after they have changed"""
+        with self._lock:
+            self._utterance_df = None
+            self._columns = None
+            self._utterance_ids = None
+            self._participant_counts = None
+            self._cached_revision = self._revision[0]
 
     def asdict(self):
         """
@@ -187,19 +432,253 @@ class Conversation(Writer):
     @property
     def metadata_df(self):
         """Return the conversation metadata as a pandas dataframe."""
-        if self._metadata_df is None:
-            self._metadata_df = self._metadata_to_df(self._metadata)
-        return self._metadata_df
+        with self._lock:
+            if self._metadata_df is None:
+                self._metadata_df = self._metadata_to_df(self._metadata)
+            return self._metadata_df
 
     @property
     def utterance_df(self):
         """Return the conversation utterances as a pandas dataframe."""
-        if self._utterance_df is None:
-            self._utterance_df = pd.DataFrame(self._utterances)
-            self._utterance_df.insert(loc=0,
-                                      column="source",
-                                      value=self._metadata["source"])
-        return self._utterance_df
+        with self._lock:
+            self._check_revision()
+            if self._utterance_df is None:
+                import pandas as pd  # noqa: import-outside-toplevel
+                utterance_df = pd.DataFrame(self._utterances)
+                utterance_df.insert(loc=0,
+                                    column="source",
+                                    value=self._metadata["source"])
+                self._utterance_df = utterance_df
+            return self._utterance_df
+
+    @property
+    def columns(self):
+        """
+        Get the fields of the utterances as NumPy arrays.
+
+        Missing numbers (such as timing information) are represented as NaN;
+        missing participants as None.
+
+        Returns:
+            dict[str, np.ndarray]: arrays "index" (int, the position of each utterance),
+                "begin", "end" and "duration" (float, in ms), "n_words", "n_characters" and "FTO" (float),
+                and "participant", "utterance" and "utterance_id" (object)
+        """
+        with self._lock:
+            self._check_revision()
+            if self._columns is None:
+                import numpy as np  # noqa: import-outside-toplevel
+                n = len(self._utterances)
+                times = [u.time if u.time else (np.nan, np.nan) for u in self._utterances]
+                timing = np.array(times, dtype=float).reshape(n, 2)
+
+                def numbers(field):
+                    values = (getattr(u, field) for u in self._utterances)
+                    return np.fromiter((np.nan if value is None else value for value in values), float, n)
+
+                def objects(field):
+                    values = np.empty(n, dtype=object)
+                    values[:] = [getattr(u, field) for u in self._utterances]
+                    return values
+
+                self._columns = {
+                    "index": np.arange(n),
+                    "begin": timing[:, 0],
+                    "end": timing[:, 1],
+                    "duration": timing[:, 1] - timing[:, 0],
+                    "participant": objects("participant"),
+                    "utterance": objects("utterance"),
+                    "utterance_id": objects("utterance_id"),
+                    "n_words": numbers("n_words"),
+                    "n_characters": numbers("n_characters"),
+                    "FTO": numbers("FTO")
+                }
+            return self._columns
+
+    def query(self, query: Union[str, Query]) -> "Conversation":
+        """Select the utterances that match a query
+
+        The query is evaluated on the `columns` of the conversation at once, e.g.
+        `convo.query('n_words > 3 and FTO between -500 and 1000 and participant in {"A", "B"}')`;
+        see `sktalk.corpus.query` for the syntax.
+
+        Args:
+            query (str | Query): the query expression, or a parsed `Query`
+
+        Returns:
+            Conversation: Conversation object with the metadata of the conversation,
+                sharing the matching Utterance objects
+        """
+        mask = as_query(query).mask(self.columns)
+        return self._share([self._utterances[index] for index in mask.nonzero()[0]], dict(self._metadata),
+                           copy_on_write=self._copy_on_write)
+
+    @instrument("Conversation.transitions", count=count_self)
+    def transitions(self):
+        """Calculate the transition between each pair of adjacent utterances
+
+        For every utterance (except the first), the transition from the preceding utterance is described by:
+        - offset: the time in ms from the end of the prior utterance to the begin of the utterance;
+            positive for a gap or pause, negative for an overlap
+        - overlap_duration: the duration in ms that the utterances overlap (0 if they do not overlap)
+        - overlap_percentage: the overlap as a percentage of the duration of the utterance
+        - transition: "gap" or "overlap" between different participants, "pause" or "overlap"
+            within the same participant, or None if timing or participant information is missing
+
+        Returns:
+            pd.DataFrame: dataframe with one row per transition
+        """
+        import numpy as np  # noqa: import-outside-toplevel
+        import pandas as pd  # noqa: import-outside-toplevel
+        columns = self.columns
+        begin, end, participant = columns["begin"], columns["end"], columns["participant"]
+        prior = slice(None, -1)
+        current = slice(1, None)
+        offset = begin[current] - end[prior]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            overlap = np.minimum(end[current], end[prior]) - np.maximum(begin[current], begin[prior])
+            overlap_duration = np.where(np.isnan(overlap), np.nan, np.maximum(overlap, 0))
+            overlap_percentage = overlap_duration / (end[current] - begin[current]) * 100
+        has_participant = np.not_equal(participant, None)
+        known_speakers = has_participant[current] & has_participant[prior]
+        same_speaker = participant[current] == participant[prior]
+        known = known_speakers & ~np.isnan(offset)
+        transition = np.select(
+            [~known, same_speaker & (offset >= 0), ~same_speaker & (offset >= 0)],
+            [None, "pause", "gap"],
+            default="overlap").astype(object)
+        indices = np.arange(1, len(begin))
+        return pd.DataFrame({
+            "source": self._metadata["source"],
+            "index": indices,
+            "prior_index": indices - 1,
+            "participant": participant[current],
+            "prior_participant": participant[prior],
+            "same_speaker": pd.array(np.where(known_speakers, same_speaker, None), dtype="boolean"),
+            "offset": offset,
+            "overlap_duration": overlap_duration,
+            "overlap_percentage": overlap_percentage,
+            "transition": transition
+        })
+
+    @instrument("Conversation.activity_matrix", count=count_self)
+    def activity_matrix(self, bin_ms: int = 10, fraction: bool = False, run_length: bool = False):
+        """Calculate the speech activity of each participant in time bins
+
+        The time from 0 to the end of the last utterance is divided in bins of `bin_ms` ms.
+        Utterances without timing or participant information are ignored.
+
+        Args:
+            bin_ms (int, optional): size of the time bins in ms. Defaults to 10.
+            fraction (bool, optional): if True, the activity is the fraction of the bin in which the
+                participant speaks (capped at 1 when utterances of a participant overlap);
+                otherwise, a bin is active if the participant speaks in any part of it. Defaults to False.
+            run_length (bool, optional): if True, the activity is returned run-length encoded, as a
+                dictionary with for each participant an array of [start bin, stop bin) runs of activity.
+                Cannot be combined with `fraction`. Defaults to False.
+
+        Returns:
+            tuple[np.ndarray | dict, list]: the activity, as a participant x bin matrix (boolean, or float
+                if `fraction` is True), or run-length encoded; and the participants, in order of the rows
+        """
+        import numpy as np  # noqa: import-outside-toplevel
+        if fraction and run_length:
+            raise ValueError("Run-length encoding is only available for boolean activity")
+        columns = self.columns
+        valid = np.not_equal(columns["participant"], None) & ~np.isnan(columns["begin"])
+        participants, rows = np.unique(columns["participant"][valid].astype(str), return_inverse=True)
+        participants = participants.tolist()
+        begin, end = columns["begin"][valid], columns["end"][valid]
+        n_bins = int(np.ceil(end.max() / bin_ms)) if len(end) else 0
+        first_bin = (begin // bin_ms).astype(int)
+        stop_bin = np.ceil(end / bin_ms).astype(int)
+        if run_length:
+            return self._activity_runs(rows, first_bin, stop_bin, participants, n_bins), participants
+        shape = (len(participants), n_bins + 1)
+        if not fraction:
+            changes = np.zeros(shape, dtype=np.int32)
+            np.add.at(changes, (rows, first_bin), 1)
+            np.add.at(changes, (rows, stop_bin), -1)
+            return np.cumsum(changes, axis=1)[:, :n_bins] > 0, participants
+        # The speaking time up to each bin boundary t is the sum over utterances of
+        # (t - begin) for utterances begun before t, minus (t - end) for utterances ended before t.
+        boundaries = np.arange(n_bins + 1) * bin_ms
+        begun, begun_sum = np.zeros(shape), np.zeros(shape)
+        ended, ended_sum = np.zeros(shape), np.zeros(shape)
+        np.add.at(begun, (rows, np.ceil(begin / bin_ms).astype(int)), 1)
+        np.add.at(begun_sum, (rows, np.ceil(begin / bin_ms).astype(int)), begin)
+        np.add.at(ended, (rows, stop_bin), 1)
+        np.add.at(ended_sum, (rows, stop_bin), end)
+        speaking_time = (boundaries * np.cumsum(begun, axis=1) - np.cumsum(begun_sum, axis=1)
+                         - boundaries * np.cumsum(ended, axis=1) + np.cumsum(ended_sum, axis=1))
+        return np.clip(np.diff(speaking_time, axis=1) / bin_ms, 0, 1), participants
+
+    @staticmethod
+    def _activity_runs(rows, first_bin, stop_bin, participants, n_bins):
+        import numpy as np  # noqa: import-outside-toplevel
+        if not participants:
+            return {}
+        # offset the bins of each participant, so that runs of all participants can be merged at once
+        offset = rows * (n_bins + 1)
+        order = np.lexsort((first_bin, rows))
+        starts, stops = (first_bin + offset)[order], (stop_bin + offset)[order]
+        covered = np.maximum.accumulate(stops)
+        new_run = np.concatenate(([True], starts[1:] > covered[:-1]))
+        run_starts = starts[new_run]
+        run_stops = covered[np.append(np.flatnonzero(new_run)[1:] - 1, len(starts) - 1)]
+        run_rows = rows[order][new_run]
+        runs = np.stack([run_starts, run_stops], axis=1) - (run_rows * (n_bins + 1))[:, None]
+        return {participant: runs[run_rows == row] for row, participant in enumerate(participants)}
+
+    def to_turns(self, max_gap: Optional[int] = None) -> "Conversation":
+        """Merge consecutive utterances by the same participant into turns
+
+        Consecutive utterances are merged if they have the same participant, and, if `max_gap`
+        is set, if the second utterance starts at most `max_gap` ms after the turn so far has ended.
+        Utterances without timing or participant information are never merged.
+
+        The text of a turn is the concatenation of the raw text of its utterances,
+        and its timing spans from the earliest begin to the latest end of its utterances.
+
+        Args:
+            max_gap (int, optional): maximum time in ms between utterances of the same turn.
+                Defaults to None, in which case all consecutive utterances by the same participant are merged.
+
+        Returns:
+            Conversation: Conversation object with the same metadata (except calculations), containing the turns
+        """
+        import numpy as np  # noqa: import-outside-toplevel
+        metadata = {key: value for key, value in self._metadata.items() if key != "Calculations"}
+        if not self._utterances:
+            return Conversation([], metadata, suppress_warnings=True)
+        columns = self.columns
+        begin, end, participant = columns["begin"], columns["end"], columns["participant"]
+        timed = ~np.isnan(begin)
+        known = np.not_equal(participant, None) & timed
+        merge = known[1:] & known[:-1] & (participant[1:] == participant[:-1])
+        if max_gap is not None and timed.any():
+            # the gap is measured from the end of the turn so far, which is the running maximum of
+            # the ends within each run of utterances by the same participant; runs are offset by
+            # more than the range of the ends, so that a single accumulate restarts at every run
+            run = np.cumsum(np.concatenate(([True], ~merge)))
+            lowest = np.nanmin(end)
+            offset = run * (np.nanmax(end) - lowest + 1)
+            turn_so_far = np.maximum.accumulate(np.nan_to_num(end - lowest) + offset) - offset + lowest
+            merge &= begin[1:] - turn_so_far[:-1] <= max_gap
+        starts = np.flatnonzero(np.concatenate(([True], ~merge)))
+        stops = np.append(starts[1:], len(self))
+        turn_begin = np.minimum.reduceat(begin, starts)
+        turn_end = np.maximum.reduceat(end, starts)
+        turns = []
+        for turn, (start, stop) in enumerate(zip(starts, stops)):
+            first = self._utterances[start]
+            if stop - start == 1:
+                text = first.utterance_raw
+            else:
+                text = " ".join(u.utterance_raw for u in self._utterances[start:stop])
+            time = [int(turn_begin[turn]), int(turn_end[turn])] if timed[start] else None
+            turns.append(Utterance(text, participant=first.participant, time=time))
+        return Conversation(turns, metadata, suppress_warnings=True)
 
     def _subconversation_by_index(self,
                                   index: int,
@@ -225,8 +704,7 @@ class Conversation(Writer):
             after = before
         left_bound = max(index-before, 0)
         right_bound = min(index + after + 1, len(self._utterances))
-        return Conversation(utterances=self._utterances[left_bound:right_bound],
-                            suppress_warnings=True)
+        return self._share(self._utterances[left_bound:right_bound])
 
     def _subconversation_by_time(self,
                                  index: int,
@@ -274,7 +752,7 @@ class Conversation(Writer):
             # if the utterance has no time[0] or time[1], an IndexError is raised
             # In both cases, there is missing timing information, so no data can be returned.
             returned_utterances = []
-        return Conversation(utterances=returned_utterances, suppress_warnings=True)
+        return self._share(returned_utterances)
 
     def count_participants(self, except_none: bool = False) -> int:
         """Count the number of participants in a conversation
@@ -305,17 +783,29 @@ class Conversation(Writer):
             values (list): list of values to update each utterance with
             kwargs (dict): information about the calculation to store in the Conversation metadata
         """
-        if len(values) != len(self.utterances):
-            raise ValueError(
-                "The number of values must match the number of utterances")
-        metadata = {field: kwargs}
-        try:
-            self._metadata["Calculations"].update(metadata)
-        except KeyError:
-            self._metadata = self._metadata | {"Calculations": metadata}
-        for index, utterance in enumerate(self.utterances):
-            setattr(utterance, field, values[index])
-
+        with self._lock:
+            if len(values) != len(self.utterances):
+                raise ValueError(
+                    "The number of values must match the number of utterances")
+            metadata = {field: kwargs}
+            if self._copy_on_write:
+                utterances = [copy.copy(utterance) for utterance in self._utterances]
+                for utterance, value in zip(utterances, values):
+                    setattr(utterance, field, value)
+                calculations = self._metadata.get("Calculations", {}) | metadata
+                self._utterances, self._metadata = utterances, self._metadata | {"Calculations": calculations}
+            else:
+                try:
+                    self._metadata["Calculations"].update(metadata)
+                except KeyError:
+                    self._metadata = self._metadata | {"Calculations": metadata}
+                for index, utterance in enumerate(self.utterances):
+                    setattr(utterance, field, values[index])
+                self._revision[0] += 1
+            self._metadata_df = None
+            self._reset_utterance_caches()
+
+    @instrument("Conversation.calculate_FTO", count=count_self)
     def calculate_FTO(self, window: int = 10000, planning_buffer: int = 200, n_participants: int = 2):
         """Calculate Floor Transfer Offset (FTO) per utterance
 
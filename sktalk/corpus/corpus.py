@@ -1,7 +1,32 @@
-import json
-import pandas as pd
+import bisect
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Union
 from .conversation import Conversation
+from .index import TextIndex
+from .jsonfile import dumps
+from .jsonfile import iter_items
+from .jsonfile import load
+from .jsonfile import sidecar_path
+from .parsing.archive import iter_members
+from .parsing.csv import CsvFile
 from .parsing.xml import XmlFile
+from .query import Query
+from .query import as_query
+from .sqlite import read_sqlite
+from .sqlite import write_sqlite
+from .stats import Summary
+from .stats import summary_df
 from .write.writer import Writer
 
 
@@ -16,11 +41,87 @@ class Corpus(Writer):
                     "All conversations should be of type Conversation")
         self._metadata = metadata
 
+        self._lock = threading.RLock()
         self._metadata_df = None
         self._utterance_df = None
+        # dataframes of added conversations, which are concatenated with the cached dataframes when used
+        self._metadata_df_parts = []
+        self._utterance_df_parts = []
+        self._index = None
+        self._sources = None
+        self._participants = None
+
+    def __getstate__(self):
+        # cached dataframes and the indexes are rebuilt when needed, rather than pickled
+        state = self.__dict__ | {"_metadata_df": None, "_utterance_df": None,
+                                 "_metadata_df_parts": [], "_utterance_df_parts": [],
+                                 "_index": None, "_sources": None, "_participants": None}
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
 
     def __add__(self, other: "Corpus") -> "Corpus":
-        pass
+        """
+        Combine two corpora into a new Corpus
+
+        See `Corpus.concat` for how the conversations and metadata are combined.
+
+        Args:
+            other (Corpus): the Corpus to add
+
+        Returns:
+            Corpus: Corpus containing the conversations of both corpora
+        """
+        if not isinstance(other, Corpus):
+            return NotImplemented
+        return self.concat([self, other])
+
+    @classmethod
+    def concat(cls, corpora: list["Corpus"], **metadata) -> "Corpus":
+        """
+        Combine multiple corpora into a new Corpus
+
+        The Conversation objects are shared with the original corpora, rather than copied.
+        The metadata of the corpora is combined: if the corpora have different values
+        for the same key, the new value is the list of the distinct values; list values
+        are combined into a single list of their distinct items.
+        Cached utterance dataframes of the corpora are reused.
+
+        Args:
+            corpora (list[Corpus]): the corpora to combine
+            metadata (dict): metadata of the new Corpus, which takes precedence over the combined metadata
+
+        Returns:
+            Corpus: Corpus containing the conversations of all corpora
+        """
+        corpora = list(corpora)
+        combined = cls._merge_metadata([corpus.metadata for corpus in corpora])
+        corpus = cls(**(combined | metadata))
+        for other in corpora:
+            corpus.extend(other)
+        return corpus
+
+    @staticmethod
+    def _merge_metadata(metadata: list[dict]) -> dict:
+        """Combine metadata; values that are lists, or that differ, become a list of the distinct values
+
+        List values are flattened into the combined list, so that merging is associative:
+        merging (A, B) and then C gives the same as merging A and then (B, C).
+        """
+        merged, is_list = {}, set()
+        for fields in metadata:
+            for key, value in fields.items():
+                values = merged.setdefault(key, [])
+                if isinstance(value, list):
+                    is_list.add(key)
+                for item in value if isinstance(value, list) else [value]:
+                    if item not in values:
+                        values.append(item)
+        return {key: values if key in is_list or len(values) != 1 else values[0]
+                for key, values in merged.items()}
 
     def append(self, conversation: Conversation):
         """
@@ -29,11 +130,128 @@ class Corpus(Writer):
         Args:
             conversation (Conversation): Conversation object that should be added to the Corpus
         """
-        if isinstance(conversation, Conversation):
-            self._conversations.append(conversation)
-        else:
+        self.extend([conversation])
+
+    def extend(self, conversations: Union["Corpus", Iterable[Conversation]]):
+        """
+        Append multiple conversations, or the conversations of another Corpus, to the Corpus
+
+        The indexes of the Corpus are extended with the new conversations, rather than rebuilt;
+        cached dataframes are extended once, when they are next used.
+
+        Args:
+            conversations (Corpus | Iterable[Conversation]): the Conversation objects to add, or a Corpus
+        """
+        utterance_dfs = None
+        if isinstance(conversations, Corpus):
+            if conversations._utterance_df is not None or conversations._utterance_df_parts:
+                # the pieces of the dataframe of the other Corpus are reused, without concatenating them
+                utterance_dfs = [df for df in [conversations._utterance_df] if df is not None]
+                utterance_dfs += conversations._utterance_df_parts
+            conversations = conversations.conversations
+        conversations = list(conversations)
+        if not all(isinstance(conversation, Conversation) for conversation in conversations):
             raise TypeError(
                 "Conversations added should be of type Conversation")
+        with self._lock:
+            was_empty = not self._conversations
+            start = len(self._conversations)
+            self._conversations.extend(conversations)
+            for position in range(start, len(self._conversations)):
+                self._add_to_indexes(position)
+            self._extend_caches(conversations, utterance_dfs, was_empty)
+
+    def _add_to_indexes(self, position: int):
+        """Add the conversation at a position at the end of the Corpus to the indexes that have been built"""
+        if self._sources is not None:
+            self._sources.setdefault(self._source(position), []).append(position)
+        if self._index is None and self._participants is None:
+            return
+        conversation = self._conversations[position]
+        if self._index is not None:
+            self._index.add(conversation)
+        if self._participants is not None:
+            self._add_participants(self._participants, position, conversation)
+
+    def _source(self, position: int) -> Optional[str]:
+        return self._conversations[position].metadata.get("source")
+
+    @staticmethod
+    def _add_participants(participants: dict, position: int, conversation: Conversation):
+        for participant, count in conversation.participant_counts.items():
+            participants.setdefault(participant, {})[position] = count
+
+    def remove(self, source: str):
+        """
+        Remove the conversations with a source from the Corpus
+
+        The indexes of the Corpus are updated, rather than rebuilt; later conversations
+        move up in the Corpus.
+
+        Args:
+            source (str): the source of the conversations to remove
+
+        Raises:
+            KeyError: if no conversation in the Corpus has this source
+        """
+        with self._lock:
+            try:
+                removed = self.source_index[source]
+            except KeyError as e:
+                raise KeyError(f"No conversation with source {source!r} in the Corpus") from e
+            for position in reversed(removed):
+                del self._conversations[position]
+                if self._index is not None:
+                    self._index.remove(position)
+            self._sources, self._participants = self._remove_from_lookup(self._sources, self._participants, removed)
+            if self._utterance_df is not None or self._utterance_df_parts:
+                utterance_df = self.utterance_df
+                self._utterance_df = utterance_df[utterance_df["source"] != source].reset_index(drop=True)
+            self._metadata_df = None
+            self._metadata_df_parts = []
+
+    @staticmethod
+    def _remove_from_lookup(sources: dict, participants: Optional[dict],
+                            removed: list[int]) -> tuple[dict, Optional[dict]]:
+        """Remove the conversations at the (sorted) positions, and move up the positions after them"""
+        removed_set = set(removed)
+
+        def moved(position):
+            return position - bisect.bisect_left(removed, position)
+        sources = {source: [moved(p) for p in positions if p not in removed_set]
+                   for source, positions in sources.items()}
+        sources = {source: positions for source, positions in sources.items() if positions}
+        if participants is not None:
+            participants = {participant: {moved(p): count for p, count in counts.items() if p not in removed_set}
+                            for participant, counts in participants.items()}
+            participants = {participant: counts for participant, counts in participants.items() if counts}
+        return sources, participants
+
+    def _extend_caches(self, conversations: list[Conversation], utterance_dfs: Optional[list], was_empty: bool):
+        """Keep the dataframes of added conversations, if the dataframes of the Corpus are cached
+
+        The dataframes are concatenated once, when they are next used, so that extending
+        the Corpus many times does not copy the cached dataframes every time.
+        """
+        import pandas as pd  # noqa: import-outside-toplevel
+        if not conversations:
+            return
+        if self._utterance_df is not None or self._utterance_df_parts:
+            if utterance_dfs is None:
+                utterance_dfs = [c.utterance_df for c in conversations]
+            self._utterance_df_parts.extend(utterance_dfs)
+        elif was_empty and utterance_dfs is not None:
+            # the dataframes of the other Corpus are copied when the parts are concatenated,
+            # so that changes to either do not affect the other
+            self._utterance_df_parts.extend(utterance_dfs)
+        if self._metadata_df is not None or self._metadata_df_parts:
+            self._metadata_df_parts.append(self._metadata_to_df(self._metadata).merge(
+                pd.concat([c.metadata_df for c in conversations]), how="cross"))
+
+    @staticmethod
+    def _concat_parts(df, parts: list):
+        import pandas as pd  # noqa: import-outside-toplevel
+        return pd.concat(([] if df is None else [df]) + parts, ignore_index=True)
 
     def asdict(self):
         """
@@ -44,6 +262,35 @@ class Corpus(Writer):
         """
         return self._metadata | {"Conversations": [u.asdict() for u in self._conversations]}
 
+    def _dump_json(self, file, indent: Optional[int] = 4, backend: str = "json"):
+        """Write the Corpus as JSON, one conversation at a time
+
+        The output is identical to `file.write(dumps(self.asdict(), indent, backend))`,
+        but only a single conversation dictionary is held in memory at a time.
+        """
+        if indent is None:
+            file.write("{")
+            for key, value in self._metadata.items():
+                file.write(f"{dumps(key, None, backend)}:{dumps(value, None, backend)},")
+            file.write('"Conversations":[')
+            for index, conversation in enumerate(self._conversations):
+                file.write(f"{',' if index else ''}{dumps(conversation.asdict(), None, backend)}")
+            file.write("]}")
+            return
+
+        def nested_dumps(obj, level):
+            # newlines cannot occur within JSON strings, so nested output can be indented by replacing them
+            return dumps(obj, indent, backend).replace("\n", "\n" + " " * indent * level)
+
+        newline = "\n" + " " * indent
+        file.write("{")
+        for key, value in self._metadata.items():
+            file.write(f"{newline}{dumps(key, indent, backend)}: {nested_dumps(value, 1)},")
+        file.write(f'{newline}"Conversations": [')
+        for index, conversation in enumerate(self._conversations):
+            file.write(f"{',' if index else ''}{newline}{' ' * indent}{nested_dumps(conversation.asdict(), 2)}")
+        file.write(f"{newline if self._conversations else ''}]\n}}")
+
     @property
     def metadata(self):
         """
@@ -65,15 +312,71 @@ class Corpus(Writer):
         return self._conversations
 
     @classmethod
-    def from_json(cls, path):
+    def from_json(cls, path, backend: str = "json", sources: Optional[Iterable[str]] = None,
+                  fields: Optional[Iterable[str]] = None):
         """Parse corpus file in JSON format
 
+        Files ending in ".gz", ".xz" or ".zst" are decompressed. If a text index was
+        saved alongside the corpus (see `write_json`), it is read as well.
+
+        If `sources` or `fields` are given, the file is read incrementally, one conversation
+        at a time, and only the selected conversations and fields are kept.
+
+        Args:
+            path (str): Path to the JSON file
+            backend (str, optional): JSON decoder, "json" or the faster "orjson". Defaults to "json".
+                Files are read incrementally with the json decoder.
+            sources (Iterable[str], optional): only read the conversations with these sources. Defaults to None.
+            fields (Iterable[str], optional): only read these fields of the utterances; "utterance" is always read,
+                and fields derived from it (such as "n_words") are recalculated. Defaults to None.
+
         Returns:
             Corpus: A Corpus object representing the corpus in the file.
         """
-        with open(path, encoding='utf-8') as f:
-            json_in = json.load(f)
-        return cls._fromdict(json_in)
+        if sources is None and fields is None:
+            json_in = load(path, backend)
+        else:
+            json_in = cls._select_json(path, sources, fields)
+        corpus = cls._fromdict(json_in)
+        index_path = sidecar_path(path, "index")
+        if sources is None and os.path.exists(index_path):
+            index = TextIndex.from_json(index_path)
+            if index.matches(corpus.conversations):
+                corpus._index = index
+        return corpus
+
+    @staticmethod
+    def _select_json(path, sources: Optional[Iterable[str]], fields: Optional[Iterable[str]]) -> dict:
+        sources = None if sources is None else set(sources)
+        fields = None if fields is None else set(fields) | {"utterance"}
+        json_in = {}
+        for key, value in iter_items(path, "Conversations"):
+            if key != "Conversations":
+                json_in[key] = value
+                continue
+            conversations = json_in.setdefault("Conversations", [])
+            if sources is not None and value.get("source") not in sources:
+                continue
+            if fields is not None:
+                value["Utterances"] = [{name: u[name] for name in fields if name in u}
+                                       for u in value.get("Utterances", [])]
+            conversations.append(value)
+        return json_in
+
+    def write_json(self, path: str = "./file.json", indent: Optional[int] = 4, backend: str = "json"):
+        """
+        Write the Corpus to a JSON file.
+
+        If the text index of the corpus has been built, it is saved alongside the corpus,
+        with "_index" appended to the filename (e.g. file_index.json).
+        See `Writer.write_json` for compression and the other arguments.
+
+        Args:
+            path (str): The path to the output file.
+        """
+        super().write_json(path, indent, backend)
+        if self._index is not None:
+            self._index.write_json(sidecar_path(path, "index"))
 
     @classmethod
     def _fromdict(cls, fields):
@@ -86,24 +389,384 @@ class Corpus(Writer):
         return Corpus(conversations, metadata=fields)
 
     @classmethod
-    def from_xml(cls, path):
-        return XmlFile(path).parse()
+    def from_csv(cls, path: str, chunksize: int = 100000, **metadata):
+        """Parse corpus file in CSV format, such as written by `write_csv`
+
+        The file is read in chunks, and consecutive rows with the same source form a conversation.
+
+        Args:
+            path (str): Path to the CSV file
+            chunksize (int, optional): Number of rows read at once. Defaults to 100000.
+            metadata (dict): metadata of the Corpus
+
+        Returns:
+            Corpus: A Corpus object representing the corpus in the file.
+        """
+        conversations = [Conversation(utterances, conversation_metadata, suppress_warnings=True)
+                         for utterances, conversation_metadata in CsvFile(path, chunksize).conversations()]
+        return cls(conversations, **metadata)
+
+    @classmethod
+    def from_xml(cls, path: str, **metadata):
+        """Parse corpus file in TalkBank XML format
+
+        The file is read incrementally, one conversation at a time, so that
+        files containing entire corpora can be read.
+
+        Args:
+            path (str): Path to the XML file
+            metadata (dict): metadata of the Corpus
+
+        Returns:
+            Corpus: A Corpus object representing the corpus in the file.
+        """
+        conversations = [Conversation(utterances, conversation_metadata, suppress_warnings=True)
+                         for utterances, conversation_metadata in XmlFile(path).conversations()]
+        return cls(conversations, **metadata)
+
+    @classmethod
+    def from_archive(cls, path: str, pattern: str = "*.cha", workers: Optional[int] = None, **metadata):
+        """Parse the conversation files in a zip or tar archive, without extracting them
+
+        The members are read from the archive one at a time, and parsed in a pool of worker
+        processes; only a few members per worker are read ahead, so that the content of the
+        archive is not held in memory at once. The source of each conversation is the path of
+        the archive followed by the name of the member, e.g. "corpus.zip/dir/file.cha".
+        As pympi only reads ELAN files from a path, each .eaf member is written to a temporary
+        file while it is parsed.
+
+        Args:
+            path (str): Path to the archive; tar archives can be compressed
+            pattern (str, optional): glob pattern of the members to parse, which should be
+                .cha or .eaf files. Defaults to "*.cha".
+            workers (int, optional): maximum number of worker processes; with 1, the members are
+                parsed in the current process. Defaults to None, in which case the default of
+                `concurrent.futures.ProcessPoolExecutor` is used.
+            metadata (dict): metadata of the Corpus
+
+        Returns:
+            Corpus: A Corpus object containing the conversations in the archive, in archive order.
+        """
+        members = iter_members(path, pattern)
+        if workers == 1:
+            conversations = [_parse_member(member) for member in members]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                window = 4 * (workers or os.cpu_count() or 1)
+                conversations = list(_bounded_map(executor, _parse_member, members, window))
+        return cls(conversations, **metadata)
+
+    def to_sqlite(self, path: str):
+        """Write the Corpus to a SQLite database
+
+        The database contains tables of the conversations, the utterances and the flattened metadata
+        of the conversations, which can be queried with SQL; see `sktalk.corpus.sqlite`.
+        Existing tables in the database are replaced.
+
+        Args:
+            path (str): Path to the database file
+        """
+        write_sqlite(self, path)
+        print("Corpus saved to", path)
+
+    @classmethod
+    def from_sqlite(cls, path: str, where: Optional[str] = None, params: Iterable = (),
+                    sources: Optional[list[str]] = None):
+        """Read a corpus from a SQLite database written by `to_sqlite`
+
+        Only the utterances that match `where` are read, e.g.
+        `Corpus.from_sqlite(path, where='participant = ? AND "begin" >= ?', params=("A", 60000))`.
+
+        Args:
+            path (str): Path to the database file
+            where (str, optional): SQL condition on the columns of the utterances table, and of the
+                conversations table prefixed with "conversations." (see `sktalk.corpus.sqlite.read_sqlite`).
+                Conversations without matching utterances are left out. Defaults to None, in which case
+                all conversations are read.
+            params (Iterable, optional): values of the placeholders in `where`. Defaults to ().
+            sources (list[str], optional): only read the conversations with these sources. Defaults to None.
+
+        Returns:
+            Corpus: A Corpus object containing the selected conversations
+        """
+        conversations, metadata = read_sqlite(path, where, params, sources)
+        return cls(conversations, **metadata)
+
+    @property
+    def index(self):
+        """
+        Get the text index of the Corpus; the index is built on first access.
+
+        Returns:
+            TextIndex: inverted index of the words in all utterances in the Corpus
+        """
+        with self._lock:
+            if self._index is None:
+                self.build_index()
+            return self._index
+
+    def build_index(self):
+        """(Re)build the text index of the Corpus.
+
+        The index is updated when conversations are appended to or removed from the Corpus,
+        but needs to be rebuilt if utterances are removed from its conversations.
+        """
+        with self._lock:
+            self._index = TextIndex.from_conversations(self._conversations)
+
+    def search(self, query: str) -> list[tuple[int, int]]:
+        """Find utterances containing a word, phrase or prefix
+
+        The search is case-insensitive. Multiple words are matched as a phrase,
+        and a word ending in an asterisk is matched as a prefix, e.g. "hel*".
+
+        Args:
+            query (str): the word, phrase or prefix to search for
+
+        Returns:
+            list[tuple[int, int]]: (conversation index, utterance index) pairs of the matching utterances
+        """
+        return self.index.search(query, self._conversations)
+
+    @property
+    def source_index(self) -> dict:
+        """
+        Get the positions of the conversations in the Corpus per source; the index is built on first access.
+
+        The index is built from the metadata of the conversations only; conversations of a
+        `LazyCorpus` whose source is the path of their file are not parsed to build it.
+        The index is updated when conversations are appended to or removed from the Corpus,
+        and should not be modified.
+
+        Returns:
+            dict[str, list[int]]: the positions of the conversations with each source
+        """
+        with self._lock:
+            if self._sources is None:
+                self._sources = self._build_sources()
+            return self._sources
+
+    @property
+    def participant_index(self) -> dict:
+        """
+        Get the conversations in which each participant speaks; the index is built on first access.
+
+        The index is updated when conversations are appended to or removed from the Corpus,
+        and should not be modified. It reflects the participants at the time the conversations
+        were added; if utterances are removed from a conversation afterwards, rebuild it with
+        `build_lookup`.
+
+        Returns:
+            dict[str, dict[int, int]]: for each participant, the number of utterances
+                per position of a conversation in which the participant speaks
+        """
+        with self._lock:
+            if self._participants is None:
+                self._participants = self._build_participants()
+            return self._participants
+
+    def _build_sources(self) -> dict:
+        sources = {}
+        for position in range(len(self._conversations)):
+            sources.setdefault(self._source(position), []).append(position)
+        return sources
+
+    def _build_participants(self) -> dict:
+        participants = {}
+        for position, conversation in enumerate(self._conversations):
+            self._add_participants(participants, position, conversation)
+        return participants
+
+    def build_lookup(self):
+        """(Re)build the source and participant indexes of the Corpus."""
+        with self._lock:
+            self._sources = self._build_sources()
+            self._participants = self._build_participants()
+
+    def get_conversation(self, source: str) -> Conversation:
+        """
+        Get a conversation by its source.
+
+        Args:
+            source (str): the source of the conversation, e.g. the path of its file
+
+        Raises:
+            KeyError: if no conversation in the Corpus has this source
+
+        Returns:
+            Conversation: the (first) conversation with this source
+        """
+        try:
+            position = self.source_index[source][0]
+        except KeyError as e:
+            raise KeyError(f"No conversation with source {source!r} in the Corpus") from e
+        return self._conversations[position]
+
+    def conversations_with(self, participant: str) -> list[Conversation]:
+        """
+        Get the conversations in which a participant speaks.
+
+        Args:
+            participant (str): the name of the participant
+
+        Returns:
+            list[Conversation]: the conversations with utterances by the participant, in order
+        """
+        return [self._conversations[position] for position in self.participant_index.get(participant, {})]
 
     @property
     def metadata_df(self):
         """Return the corpus metadata as a pandas dataframe."""
-        if self._metadata_df is None:
-            metadata_df = self._metadata_to_df(self._metadata)
-            metadata_df_conversations = pd.concat(
-                [c.metadata_df for c in self._conversations])
-            self._metadata_df = metadata_df.merge(
-                metadata_df_conversations, how="cross")
-        return self._metadata_df
+        with self._lock:
+            if self._metadata_df_parts:
+                self._metadata_df = self._concat_parts(self._metadata_df, self._metadata_df_parts)
+                self._metadata_df_parts = []
+            if self._metadata_df is None:
+                import pandas as pd  # noqa: import-outside-toplevel
+                metadata_df = self._metadata_to_df(self._metadata)
+                metadata_df_conversations = pd.concat(
+                    [c.metadata_df for c in self._conversations])
+                self._metadata_df = metadata_df.merge(
+                    metadata_df_conversations, how="cross")
+            return self._metadata_df
+
+    def calculate_FTO(self, window: int = 10000, planning_buffer: int = 200, n_participants: int = 2):
+        """Calculate Floor Transfer Offset (FTO) per utterance in all conversations
+
+        See `Conversation.calculate_FTO` for a description of the arguments.
+        """
+        for conversation in self._conversations:
+            conversation.calculate_FTO(window, planning_buffer, n_participants)
+
+    def map(self, func: Callable[[Conversation], Any], workers: Optional[int] = None) -> list:
+        """Apply a function to all conversations, using a pool of threads
+
+        Cached representations of conversations and of the Corpus are created under a lock,
+        so they can be used from `func`. Most of the work in pandas and NumPy releases the GIL,
+        so that conversations can be processed in parallel. Calculations that update utterances
+        are applied to one conversation at a time; if conversations share Utterance objects,
+        create them with `copy_on_write` to keep them independent.
+
+        Args:
+            func (Callable[[Conversation], Any]): the function to apply to each conversation
+            workers (int, optional): maximum number of threads. Defaults to None,
+                in which case the default of `concurrent.futures.ThreadPoolExecutor` is used.
+
+        Returns:
+            list: the results of `func`, in the order of the conversations
+        """
+        conversations = self._conversations
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # conversations are retrieved in the worker threads, so that a LazyCorpus parses them in parallel
+            return list(executor.map(lambda index: func(conversations[index]), range(len(conversations))))
+
+    def query(self, query: Union[str, Query], workers: Optional[int] = 1) -> "Corpus":
+        """Select the utterances that match a query in all conversations
+
+        The query is parsed once, and evaluated on the columns of each conversation;
+        see `Conversation.query`, and `sktalk.corpus.query` for the syntax.
+
+        Args:
+            query (str | Query): the query expression, or a parsed `Query`
+            workers (int, optional): maximum number of threads; with 1, the conversations are queried
+                one at a time. Defaults to 1. See `map`.
+
+        Returns:
+            Corpus: Corpus with the metadata of this Corpus, containing a Conversation for each conversation
+                with matching utterances, which shares the matching Utterance objects
+        """
+        query = as_query(query)
+        if workers == 1:
+            selected = [conversation.query(query) for conversation in self._conversations]
+        else:
+            selected = self.map(lambda conversation: conversation.query(query), workers)
+        return Corpus([conversation for conversation in selected if len(conversation)], **self._metadata)
+
+    def stats(self, workers: Optional[int] = None):
+        """Calculate summary statistics of every conversation and of the whole Corpus
+
+        The statistics are calculated in a single pass over the conversations, which are
+        summarised in a pool of threads (see `map`) and merged into the total as they are done;
+        only a few conversations per thread are summarised ahead. See `sktalk.corpus.stats`.
+
+        Args:
+            workers (int, optional): maximum number of threads. Defaults to None,
+                in which case the default of `concurrent.futures.ThreadPoolExecutor` is used.
+
+        Returns:
+            pd.DataFrame: dataframe with a row per conversation and a final "total" row, with the number of
+                utterances, the duration in ms, the number of words and participants, the mean and quartiles
+                of the FTO, and the proportion of utterances without timing information
+        """
+        conversations = self._conversations
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            window = 4 * (workers or os.cpu_count() or 1)
+            return summary_df(_bounded_map(executor, lambda index: Summary.from_conversation(conversations[index]),
+                                           range(len(conversations)), window))
+
+    def transitions(self):
+        """Calculate the transitions between adjacent utterances in all conversations
+
+        See `Conversation.transitions` for a description of the output.
+
+        Returns:
+            pd.DataFrame: dataframe with one row per transition; empty, with the same columns,
+                if the Corpus has no conversations
+        """
+        import pandas as pd  # noqa: import-outside-toplevel
+        transitions = [c.transitions() for c in self._conversations]
+        if not transitions:
+            return Conversation([], suppress_warnings=True).transitions()
+        return pd.concat(transitions, ignore_index=True)
+
+    def activity_matrices(self, bin_ms: int = 10, **kwargs):
+        """Calculate the speech activity per participant in time bins, one conversation at a time
+
+        See `Conversation.activity_matrix` for a description of the arguments and output.
+        The activity of each conversation is calculated when the next item is requested,
+        so that not all matrices need to be held in memory.
+
+        Args:
+            bin_ms (int, optional): size of the time bins in ms. Defaults to 10.
+            kwargs (dict): further arguments for `Conversation.activity_matrix`
+
+        Yields:
+            tuple[str, np.ndarray | dict, list]: the source of the conversation, its activity and its participants
+        """
+        for conversation in self._conversations:
+            activity, participants = conversation.activity_matrix(bin_ms, **kwargs)
+            yield conversation.metadata["source"], activity, participants
 
     @property
     def utterance_df(self):
         """Return the corpus utterances as a pandas dataframe."""
-        if self._utterance_df is None:
-            self._utterance_df = pd.concat(
-                [c.utterance_df for c in self._conversations], ignore_index=True)
-        return self._utterance_df
+        with self._lock:
+            if self._utterance_df_parts:
+                self._utterance_df = self._concat_parts(self._utterance_df, self._utterance_df_parts)
+                self._utterance_df_parts = []
+            if self._utterance_df is None:
+                import pandas as pd  # noqa: import-outside-toplevel
+                self._utterance_df = pd.concat(
+                    [c.utterance_df for c in self._conversations], ignore_index=True)
+            return self._utterance_df
+
+
+def _bounded_map(executor: Executor, function: Callable, items: Iterable, window: int) -> Iterator:
+    """Map a function over items in an executor, in order, with at most `window` items submitted at once"""
+    pending = deque()
+    for item in items:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(function, item))
+    while pending:
+        yield pending.popleft().result()
+
+
+def _parse_member(member: tuple[str, bytes]) -> Conversation:
+    """Parse a conversation file read from an archive; conversations are returned to the main process pickled"""
+    source, content = member
+    parsers = {".cha": Conversation.from_cha, ".eaf": Conversation.from_eaf}
+    suffix = Path(source).suffix.lower()
+    if suffix not in parsers:
+        raise ValueError(f"Cannot parse {source}: archive members should be .cha or .eaf files")
+    return parsers[suffix](source, content=content)
@@ -0,0 +1,238 @@
+import bisect
+from array import array
+from typing import Iterable
+from .jsonfile import dumps
+from .jsonfile import load
+from .jsonfile import open_json
+
+
+class TextIndex:
+    """Inverted index of the words in the utterances of a collection of conversations
+
+    The index maps every (case-folded) word in `Utterance.utterance_list` to the
+    utterances it occurs in. Utterances are identified by the index of their
+    conversation in the collection and their own index in the conversation.
+    The postings of a word are a sorted array of keys, which combine an identifier of the
+    conversation, which does not change when other conversations are removed, with the
+    index of the utterance; queries intersect these arrays.
+
+    The index reflects the conversations at the time they were added; if utterances
+    are removed from a conversation afterwards, the index needs to be rebuilt.
+    Whole conversations can be removed with `remove`.
+    """
+
+    # postings are stored as (conversation identifier << SHIFT) | utterance index
+    SHIFT = 32
+    MASK = (1 << SHIFT) - 1
+
+    def __init__(self) -> None:
+        self._postings = {}
+        self._n_utterances = []
+        self._vocabulary = None
+        # identifier of the conversation at each position, in increasing order
+        self._ids = []
+        self._positions = None
+        # the words of the conversation at each position, built when a conversation is first removed
+        self._words = []
+
+    def __len__(self):
+        """
+        Get the number of conversations in the index.
+
+        Returns:
+            int: The number of conversations in the index.
+        """
+        return len(self._n_utterances)
+
+    @classmethod
+    def from_conversations(cls, conversations: Iterable["Conversation"]) -> "TextIndex":  # noqa: F821
+        """Build an index for a collection of conversations
+
+        Args:
+            conversations (Iterable[Conversation]): the conversations to index, in order
+
+        Returns:
+            TextIndex: the index of all words in the conversations
+        """
+        index = cls()
+        for conversation in conversations:
+            index.add(conversation)
+        return index
+
+    def add(self, conversation: "Conversation"):  # noqa: F821
+        """Add a conversation to the index, as the next conversation in the collection
+
+        Args:
+            conversation (Conversation): the conversation to add
+        """
+        conversation_id = self._ids[-1] + 1 if self._ids else 0
+        conversation_key = conversation_id << self.SHIFT
+        postings = self._postings
+        words = set()
+        for utterance_index, utterance in enumerate(conversation.utterances):
+            key = conversation_key | utterance_index
+            utterance_words = {word.casefold() for word in utterance.utterance_list or []}
+            for word in utterance_words:
+                try:
+                    postings[word].append(key)
+                except KeyError:
+                    postings[word] = array("Q", [key])
+                    self._vocabulary = None
+            words |= utterance_words
+        self._n_utterances.append(len(conversation))
+        self._ids.append(conversation_id)
+        self._positions = None
+        if self._words is not None:
+            self._words.append(list(words))
+
+    def remove(self, conversation_index: int):
+        """Remove a conversation from the index; later conversations move up one position
+
+        Args:
+            conversation_index (int): the index of the conversation in the collection
+        """
+        if self._words is None:
+            self._words = self._conversation_words()
+        del self._n_utterances[conversation_index]
+        conversation_id = self._ids.pop(conversation_index)
+        self._positions = None
+        first = conversation_id << self.SHIFT
+        stop = (conversation_id + 1) << self.SHIFT
+        # postings are sorted, so the keys of the conversation are a contiguous range;
+        # only the postings of the words in the conversation change
+        for word in self._words.pop(conversation_index):
+            keys = self._postings[word]
+            del keys[bisect.bisect_left(keys, first):bisect.bisect_left(keys, stop)]
+            if not keys:
+                del self._postings[word]
+                self._vocabulary = None
+
+    def _conversation_words(self) -> list[list[str]]:
+        words = {conversation_id: [] for conversation_id in self._ids}
+        for word, keys in self._postings.items():
+            for conversation_id in {key >> self.SHIFT for key in keys}:
+                words[conversation_id].append(word)
+        return list(words.values())
+
+    @property
+    def vocabulary(self) -> list[str]:
+        """
+        Get all indexed words.
+
+        Returns:
+            list[str]: sorted list of case-folded words
+        """
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        return self._vocabulary
+
+    def matches(self, conversations: list["Conversation"]) -> bool:  # noqa: F821
+        """Check whether the index corresponds to a collection of conversations
+
+        Args:
+            conversations (list[Conversation]): the conversations the index should describe
+
+        Returns:
+            bool: True if the number of conversations and their lengths correspond to the index
+        """
+        return self._n_utterances == [len(conversation) for conversation in conversations]
+
+    def search(self, query: str, conversations: list["Conversation"]) -> list[tuple[int, int]]:  # noqa: F821
+        """Find the utterances matching a query
+
+        The query is case-insensitive, and consists of one or more words:
+        - a single word matches utterances containing that word, e.g. "hello"
+        - multiple words match utterances containing the words as a phrase, e.g. "hello world"
+        - a word ending in an asterisk matches words with that prefix, e.g. "hel*"
+
+        Args:
+            query (str): the word, phrase or prefix to search for
+            conversations (list[Conversation]): the indexed conversations, used to verify phrase matches
+
+        Returns:
+            list[tuple[int, int]]: sorted (conversation index, utterance index) pairs of the matching utterances
+        """
+        import numpy as np  # noqa: import-outside-toplevel
+        terms = [term.casefold() for term in query.split()]
+        if not terms:
+            return []
+        candidates = None
+        for term in terms:
+            keys = self._lookup(term)
+            candidates = keys if candidates is None else np.intersect1d(candidates, keys, assume_unique=True)
+            if not len(candidates):
+                return []
+        if self._positions is None:
+            self._positions = {conversation_id: position for position, conversation_id in enumerate(self._ids)}
+        positions = self._positions
+        results = [(positions[key >> self.SHIFT], key & self.MASK) for key in candidates.tolist()]
+        if len(terms) > 1:
+            results = [(c, u) for c, u in results
+                       if self._contains_phrase(conversations[c].utterances[u].utterance_list, terms)]
+        return results
+
+    def _lookup(self, term: str) -> "np.ndarray":  # noqa: F821
+        """Get the sorted keys of the utterances containing a word, or a word with a prefix"""
+        import numpy as np  # noqa: import-outside-toplevel
+        if not term.endswith("*"):
+            return np.array(self._postings.get(term, ()), dtype=np.uint64)
+        prefix = term[:-1]
+        vocabulary = self.vocabulary
+        keys = []
+        for position in range(bisect.bisect_left(vocabulary, prefix), len(vocabulary)):
+            word = vocabulary[position]
+            if not word.startswith(prefix):
+                break
+            keys.append(np.array(self._postings[word], dtype=np.uint64))
+        return np.unique(np.concatenate(keys)) if keys else np.empty(0, dtype=np.uint64)
+
+    @staticmethod
+    def _contains_phrase(words: list[str], terms: list[str]) -> bool:
+        words = [word.casefold() for word in words]
+        for start in range(len(words) - len(terms) + 1):
+            if all(word.startswith(term[:-1]) if term.endswith("*") else word == term
+                   for word, term in zip(words[start:], terms)):
+                return True
+        return False
+
+    def asdict(self):
+        """
+        Return the index as a dictionary
+
+        Returns:
+            dict: dictionary containing the number of utterances per conversation and the postings per word
+        """
+        return {"n_utterances": self._n_utterances,
+                "conversation_ids": self._ids,
+                "postings": {word: list(keys) for word, keys in self._postings.items()}}
+
+    @classmethod
+    def _fromdict(cls, fields):
+        index = cls()
+        index._n_utterances = list(fields["n_utterances"])
+        index._ids = list(fields.get("conversation_ids", range(len(index._n_utterances))))
+        index._postings = {word: array("Q", keys) for word, keys in fields["postings"].items()}
+        index._words = None
+        return index
+
+    def write_json(self, path: str):
+        """
+        Write the index to a JSON file, compressed if the path ends in ".gz", ".xz" or ".zst".
+
+        Args:
+            path (str): The path to the output file.
+        """
+        with open_json(path, "w") as file:
+            file.write(dumps(self.asdict(), indent=None))
+
+    @classmethod
+    def from_json(cls, path: str) -> "TextIndex":
+        """Read an index from a JSON file
+
+        Args:
+            path (str): The path to the index file.
+
+        Returns:
+            TextIndex: the index stored in the file
+        """
+        return cls._fromdict(load(path))
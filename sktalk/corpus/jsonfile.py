@@ -0,0 +1,218 @@
+"""Reading and writing JSON files, optionally compressed or with a faster backend
+
+Files are compressed based on their suffix: ".gz" (gzip), ".xz" (lzma) or ".zst" (Zstandard,
+which requires the zstandard package). The "orjson" backend requires the orjson package.
+"""
+import gzip
+import json
+import lzma
+import re
+from pathlib import Path
+from typing import Iterator
+from typing import Optional
+
+
+COMPRESSION = [".gz", ".xz", ".zst"]
+BACKENDS = ["json", "orjson"]
+_INDENTATION = re.compile(r"^ +", re.MULTILINE)
+
+
+def json_path(path: str) -> Path:
+    """Give a path the suffix ".json", followed by its compression suffix, if any
+
+    Args:
+        path (str): the path, e.g. "file", "file.json" or "file.gz"
+
+    Returns:
+        Path: the path with the suffix ".json", e.g. "file.json" or "file.json.gz"
+    """
+    path = Path(path)
+    if path.suffix not in COMPRESSION:
+        return path.with_suffix(".json")
+    return path.with_name(path.with_suffix("").with_suffix(".json").name + path.suffix)
+
+
+def sidecar_path(path: str, specifier: str) -> Path:
+    """Get the path of a file written alongside a JSON file, with the same compression
+
+    Args:
+        path (str): the path of the JSON file, e.g. "file.json.gz"
+        specifier (str): the specifier of the sidecar file, e.g. "index"
+
+    Returns:
+        Path: the path of the sidecar file, e.g. "file_index.json.gz"
+    """
+    path = json_path(path)
+    compression = path.suffix if path.suffix in COMPRESSION else ""
+    stem = path.with_suffix("").stem if compression else path.stem
+    return path.with_name(f"{stem}_{specifier}.json{compression}")
+
+
+def open_json(path: str, mode: str = "r"):
+    """Open a (compressed) JSON file in text mode
+
+    Args:
+        path (str): path to the file; the compression is chosen by its suffix
+        mode (str, optional): "r" to read or "w" to write. Defaults to "r".
+
+    Returns:
+        file object: the opened file
+    """
+    suffix = Path(path).suffix
+    if suffix == ".gz":
+        return gzip.open(path, f"{mode}t", encoding="utf-8")
+    if suffix == ".xz":
+        return lzma.open(path, f"{mode}t", encoding="utf-8")
+    if suffix == ".zst":
+        try:
+            import zstandard  # noqa: import-outside-toplevel
+        except ImportError as e:
+            raise ImportError("Reading and writing .zst files requires the zstandard package") from e
+        return zstandard.open(path, f"{mode}t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")  # noqa: consider-using-with
+
+
+def dumps(obj, indent: Optional[int] = 4, backend: str = "json") -> str:
+    """Encode an object as JSON
+
+    Args:
+        obj: the object to encode
+        indent (int, optional): number of spaces to indent with. Defaults to 4;
+            None gives compact output, without indentation and whitespace.
+        backend (str, optional): "json" or "orjson". Defaults to "json".
+            The orjson backend does not escape non-ASCII characters.
+
+    Returns:
+        str: the encoded object
+    """
+    if backend == "orjson":
+        orjson = _import_orjson()
+        if indent is None:
+            return orjson.dumps(obj).decode("utf-8")
+        encoded = orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+        if indent == 2:
+            return encoded
+        # orjson only indents with 2 spaces; newlines cannot occur within JSON strings,
+        # so the indentation of every line can be scaled
+        return _INDENTATION.sub(lambda match: " " * (len(match.group()) // 2 * indent), encoded)
+    _check_backend(backend)
+    return json.dumps(obj, indent=indent, separators=(",", ":") if indent is None else None)
+
+
+def load(path: str, backend: str = "json"):
+    """Read a (compressed) JSON file
+
+    Args:
+        path (str): path to the file
+        backend (str, optional): "json" or "orjson". Defaults to "json".
+
+    Returns:
+        the decoded contents of the file
+    """
+    with open_json(path) as file:
+        if backend == "orjson":
+            return _import_orjson().loads(file.read())
+        _check_backend(backend)
+        return json.load(file)
+
+
+def iter_items(path: str, array_key: str = "Conversations", chunksize: int = 1 << 20) -> Iterator[tuple]:
+    """Read the items of a (compressed) JSON object incrementally
+
+    The file is read in chunks, and the elements of the array `array_key` are decoded one at a
+    time, so that only a single element needs to be held in memory. Unlike `load`, this always
+    uses the json backend.
+
+    Args:
+        path (str): path to the file, which should contain a JSON object
+        array_key (str, optional): key of the array of which elements are yielded one at a time.
+            Defaults to "Conversations".
+        chunksize (int, optional): number of characters read at once. Defaults to 1 << 20.
+
+    Yields:
+        tuple[str, Any]: the key and value of each item in the object; for `array_key`,
+            the key and each element of the array
+    """
+    with open_json(path) as file:
+        stream = _JsonStream(file, chunksize)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            if key == array_key and stream.peek() == "[":
+                stream.expect("[")
+                while stream.peek() != "]":
+                    yield key, stream.value()
+                    if stream.peek() == ",":
+                        stream.expect(",")
+                stream.expect("]")
+            else:
+                yield key, stream.value()
+            if stream.peek() == "}":
+                return
+            stream.expect(",")
+
+
+class _JsonStream:
+    """Decode JSON values one at a time from a file that is read in chunks"""
+
+    WHITESPACE = re.compile(r"\s*")
+
+    def __init__(self, file, chunksize: int):
+        self._file = file
+        self._chunksize = chunksize
+        self._buffer = ""
+        self._position = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        # read at least as much as is buffered, so that large values are read in few steps
+        data = self._file.read(max(self._chunksize, len(self._buffer) - self._position))
+        if not data:
+            return False
+        self._buffer = self._buffer[self._position:] + data
+        self._position = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self._position = self.WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON file")
+
+    def expect(self, character: str):
+        if self.peek() != character:
+            raise ValueError(f"Expected {character!r} in JSON file, found {self.peek()!r}")
+        self._position += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+                # a value at the end of the buffer may continue in the next chunk, e.g. a number
+                if end < len(self._buffer):
+                    self._position = end
+                    return value
+            except json.JSONDecodeError:
+                pass
+            if not self._fill():
+                value, self._position = self._decoder.raw_decode(self._buffer, self._position)
+                return value
+
+
+def _import_orjson():
+    try:
+        import orjson  # noqa: import-outside-toplevel
+    except ImportError as e:
+        raise ImportError("The orjson backend requires the orjson package") from e
+    return orjson
+
+
+def _check_backend(backend: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend {backend!r}; choose from {', '.join(BACKENDS)}")
@@ -0,0 +1,294 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable
+from typing import Optional
+from typing import Union
+from .conversation import Conversation
+from .corpus import Corpus
+from .jsonfile import open_json
+from .manifest import Manifest
+
+
+class ConversationSequence(Sequence):
+    """Sequence of conversations that are parsed from file when they are accessed
+
+    Items are either file references, which are parsed on access, or Conversation objects,
+    which are kept in memory. Parsed conversations are kept in a cache of limited size,
+    from which the least recently used conversation is removed first.
+    """
+
+    PARSERS = {
+        ".cha": Conversation.from_cha,
+        ".eaf": Conversation.from_eaf,
+        ".xml": Conversation.from_xml,
+        ".csv": Conversation.from_csv,
+        ".json": Conversation.from_json,
+    }
+    # file types of which the parser uses the path of the file as the source of the conversation
+    SOURCE_IS_PATH = {".cha", ".eaf"}
+
+    def __init__(self, items: list[Union[str, Conversation]], max_cached: int = 16) -> None:
+        self._items = []
+        self._cache = OrderedDict()
+        self._lock = threading.RLock()
+        self._max_cached = max_cached
+        self._calculations = []
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getstate__(self):
+        # parsed conversations are parsed again after unpickling, rather than pickled
+        state = self.__dict__ | {"_cache": OrderedDict()}
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = self._items[index]
+        if isinstance(item, Conversation):
+            return item
+        if index < 0:
+            index += len(self)
+        with self._lock:
+            if index in self._cache:
+                self._cache.move_to_end(index)
+                return self._cache[index]
+        # conversations are parsed outside the lock, so that threads can parse in parallel
+        conversation = self._load(item)
+        with self._lock:
+            self._cache[index] = conversation
+            if len(self._cache) > self._max_cached:
+                self._cache.popitem(last=False)
+        return conversation
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __delitem__(self, index: int):
+        with self._lock:
+            if index < 0:
+                index += len(self)
+            del self._items[index]
+            # cached conversations after the removed item move up one position
+            self._cache = OrderedDict((i - (i > index), conversation)
+                                      for i, conversation in self._cache.items() if i != index)
+
+    def append(self, item: Union[str, Conversation]):
+        """Add a conversation, or a reference to a file containing a conversation
+
+        Args:
+            item (str | Conversation): path to the file, or a Conversation object
+        """
+        if not isinstance(item, Conversation):
+            item = str(item)
+            if Path(item).suffix.lower() not in self.PARSERS:
+                raise TypeError(
+                    "Conversations added should be of type Conversation, or files of type "
+                    + ", ".join(self.PARSERS))
+        self._items.append(item)
+
+    def source(self, index: int) -> Optional[str]:
+        """Get the source of a conversation, without parsing files of which the path is the source
+
+        Args:
+            index (int): the position of the conversation in the sequence
+
+        Returns:
+            str | None: the source in the metadata of the conversation
+        """
+        item = self._items[index]
+        if isinstance(item, Conversation):
+            return item.metadata.get("source")
+        if Path(item).suffix.lower() in self.SOURCE_IS_PATH:
+            return item
+        return self[index].metadata.get("source")
+
+    @property
+    def references(self) -> list[Union[str, Conversation]]:
+        """
+        Get the file references and in-memory conversations in the sequence.
+
+        Returns:
+            list[str | Conversation]: paths of conversations that are parsed on access, or Conversation objects
+        """
+        return list(self._items)
+
+    def add_calculation(self, method: str, **kwargs):
+        """Apply a calculation to all conversations
+
+        The calculation is applied to the conversations in memory immediately,
+        and to all other conversations when they are parsed.
+
+        Args:
+            method (str): name of the Conversation method that performs the calculation
+            kwargs (dict): arguments of the calculation
+        """
+        with self._lock:
+            self._calculations.append((method, kwargs))
+            in_memory = [item for item in self._items if isinstance(item, Conversation)]
+            in_memory += list(self._cache.values())
+        for conversation in in_memory:
+            getattr(conversation, method)(**kwargs)
+
+    def _load(self, path: str) -> Conversation:
+        conversation = self.PARSERS[Path(path).suffix.lower()](path)
+        for method, kwargs in self._calculations:
+            getattr(conversation, method)(**kwargs)
+        return conversation
+
+
+class LazyCorpus(Corpus):
+    def __init__(self, conversations: list[Union[str, Conversation]] = None, max_cached: int = 16, **metadata):
+        """Corpus that parses its conversations on demand
+
+        The corpus stores references to conversation files, which are parsed when the conversation
+        is accessed. At most `max_cached` parsed conversations are kept in memory. Methods that
+        process all conversations, such as `utterance_df`, `write_json` and `calculate_FTO`,
+        handle the conversations one at a time. Combining lazy corpora (e.g. with `+`)
+        combines their file references, without parsing them.
+
+        Calculations are applied to conversations whenever they are parsed. Other changes to
+        conversations parsed from file are lost when they are removed from the cache.
+
+        Args:
+            conversations (list[str | Conversation], optional): paths to conversation files
+                (.cha, .eaf, .xml, .csv or .json), or Conversation objects. Defaults to None.
+            max_cached (int, optional): maximum number of parsed conversations kept in memory. Defaults to 16.
+            metadata (dict): metadata of the Corpus
+        """
+        super().__init__(**metadata)
+        self._conversations = ConversationSequence(conversations or [], max_cached)
+
+    @classmethod
+    def from_directory(cls, path: str, pattern: str = "*.cha", max_cached: int = 16, **metadata) -> "LazyCorpus":
+        """Create a lazy corpus of the conversation files in a directory
+
+        Args:
+            path (str): path to the directory
+            pattern (str, optional): glob pattern of the files to include. Defaults to "*.cha".
+            max_cached (int, optional): maximum number of parsed conversations kept in memory. Defaults to 16.
+            metadata (dict): metadata of the Corpus
+
+        Returns:
+            LazyCorpus: corpus referencing the matching files, in sorted order
+        """
+        return cls(sorted(str(p) for p in Path(path).glob(pattern)), max_cached, **metadata)
+
+    @classmethod
+    def build(cls,
+              source: str,
+              output: str,
+              pattern: str = "*.cha",
+              calculations: Optional[dict[str, dict]] = None,
+              workers: int = 1,
+              max_cached: int = 16,
+              **metadata) -> "LazyCorpus":
+        """Build a corpus directory from conversation files, processing only changed files
+
+        Every file in `source` matching `pattern` is parsed, the calculations are applied,
+        and the conversation is written to a JSON file in `output`, at the same relative path
+        with ".json" appended (e.g. "site1/file01.cha.json"). A manifest of the input files is
+        kept in `output` (see `Manifest`); when the directory is built again, only new files,
+        and files of which the content, the parser version or the calculations changed, are
+        processed again. Outputs of files that no longer exist are removed.
+
+        Args:
+            source (str): directory containing the conversation files
+            output (str): the corpus directory
+            pattern (str, optional): glob pattern of the files to include, relative to `source`;
+                use e.g. "**/*.cha" to include subdirectories. Defaults to "*.cha".
+            calculations (dict[str, dict], optional): Conversation methods to apply, with their arguments,
+                e.g. {"calculate_FTO": {"window": 10000}}. Defaults to None.
+            workers (int, optional): maximum number of worker processes. Defaults to 1.
+            max_cached (int, optional): maximum number of parsed conversations kept in memory. Defaults to 16.
+            metadata (dict): metadata of the Corpus
+
+        Returns:
+            LazyCorpus: corpus referencing the JSON files of all conversations, in sorted order
+        """
+        os.makedirs(output, exist_ok=True)
+        manifest = Manifest.read(output)
+        calculations = [[method, kwargs] for method, kwargs in (calculations or {}).items()]
+        files, todo = {}, []
+        for path in sorted(Path(source).glob(pattern)):
+            name = path.relative_to(source).as_posix()
+            entry = manifest.entry(str(path), name, calculations, f"{name}.json")
+            if manifest.changed(name, entry) or not (Path(output) / entry["output"]).exists():
+                todo.append((str(path), str(Path(output) / entry["output"]), calculations))
+            files[name] = entry
+        for name in manifest.files.keys() - files.keys():
+            removed = Path(output) / manifest.files[name]["output"]
+            if removed.exists():
+                removed.unlink()
+
+        if workers > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_build_conversation, todo))
+        else:
+            for task in todo:
+                _build_conversation(task)
+        Manifest(files).write(output)
+        print(f"Corpus in {output}: {len(todo)} of {len(files)} conversations rebuilt, "
+              f"{len(manifest.files.keys() - files.keys())} removed")
+        return cls([str(Path(output) / entry["output"]) for entry in files.values()], max_cached, **metadata)
+
+    def extend(self, conversations: Union[Corpus, Iterable[Union[str, Conversation]]]):
+        """
+        Append multiple conversations, or references to conversation files, to the Corpus
+
+        The file references of another LazyCorpus are added without parsing them.
+        Cached dataframes are rebuilt when they are next used.
+
+        Args:
+            conversations (Corpus | Iterable[str | Conversation]): paths to conversation files,
+                Conversation objects, or a Corpus
+        """
+        if isinstance(conversations, LazyCorpus):
+            conversations = conversations.conversations.references
+        elif isinstance(conversations, Corpus):
+            conversations = conversations.conversations
+        for conversation in conversations:
+            self._conversations.append(conversation)
+            self._add_to_indexes(len(self._conversations) - 1)
+        self._utterance_df = None
+        self._metadata_df = None
+        self._utterance_df_parts = []
+        self._metadata_df_parts = []
+
+    def _source(self, position: int) -> Optional[str]:
+        return self._conversations.source(position)
+
+    def calculate_FTO(self, window: int = 10000, planning_buffer: int = 200, n_participants: int = 2):
+        """Calculate Floor Transfer Offset (FTO) per utterance in all conversations
+
+        The calculation is applied to each conversation when it is parsed.
+        See `Conversation.calculate_FTO` for a description of the arguments.
+        """
+        self._conversations.add_calculation("calculate_FTO",
+                                            window=window,
+                                            planning_buffer=planning_buffer,
+                                            n_participants=n_participants)
+
+
+def _build_conversation(task: tuple[str, str, list]):
+    """Parse a conversation file, apply the calculations and write it to JSON"""
+    path, output, calculations = task
+    conversation = ConversationSequence.PARSERS[Path(path).suffix.lower()](path)
+    for method, kwargs in calculations:
+        getattr(conversation, method)(**kwargs)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open_json(output, "w") as file:
+        conversation._dump_json(file)  # noqa: W0212
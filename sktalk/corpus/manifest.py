@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+
+class Manifest:
+    """Record of the files from which a corpus directory was built
+
+    For every input file, the manifest stores its size, modification time and SHA-256 hash,
+    the version of the parser and the calculations applied to the parsed conversation, and
+    the output file of the conversation. When the corpus is rebuilt, only files of which the
+    content, parser version or calculations changed need to be processed again.
+    """
+
+    FILENAME = "manifest.json"
+    # version of the output of the parsers; increment it whenever a change to the parsers
+    # (or to the cleaning of utterances) changes the parsed conversations
+    PARSER_VERSION = 1
+
+    def __init__(self, files: Optional[dict[str, dict]] = None) -> None:
+        self.files = files or {}
+
+    @classmethod
+    def read(cls, directory: str) -> "Manifest":
+        """Read the manifest of a corpus directory
+
+        Args:
+            directory (str): the corpus directory
+
+        Returns:
+            Manifest: the manifest, which is empty if the directory has no manifest
+        """
+        path = Path(directory) / cls.FILENAME
+        if not path.exists():
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["files"])
+
+    def write(self, directory: str):
+        """Write the manifest to a corpus directory
+
+        The manifest is replaced at once, so that an interrupted write does not corrupt it.
+
+        Args:
+            directory (str): the corpus directory
+        """
+        path = Path(directory) / self.FILENAME
+        temporary = path.with_suffix(".tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"parser_version": self.PARSER_VERSION, "files": self.files}, f, indent=4)
+        os.replace(temporary, path)
+
+    def entry(self, path: str, name: str, calculations: list, output: str) -> dict:
+        """Describe an input file as it would be recorded in the manifest
+
+        The file is only hashed if its size or modification time differ from the manifest.
+
+        Args:
+            path (str): path to the input file
+            name (str): name of the file in the manifest
+            calculations (list): (method, arguments) pairs of the calculations applied to the conversation
+            output (str): name of the output file, relative to the corpus directory
+
+        Returns:
+            dict: the manifest entry of the file
+        """
+        stat = os.stat(path)
+        previous = self.files.get(name, {})
+        if previous.get("size") == stat.st_size and previous.get("mtime") == stat.st_mtime:
+            sha256 = previous["sha256"]
+        else:
+            sha256 = self._hash(path)
+        return {"size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "sha256": sha256,
+                "parser_version": self.PARSER_VERSION,
+                # stored as JSON, so that entries can be compared with the manifest on disk
+                "calculations": json.loads(json.dumps(calculations)),
+                "output": output}
+
+    def changed(self, name: str, entry: dict) -> bool:
+        """Check whether a file needs to be processed again
+
+        A file has changed if it is new, or if its content, the parser version, the calculations
+        or the output differ from the manifest. Files that were only touched have not changed.
+
+        Args:
+            name (str): name of the file in the manifest
+            entry (dict): the current entry of the file, see `entry`
+
+        Returns:
+            bool: True if the file needs to be processed
+        """
+        previous = self.files.get(name)
+        if previous is None:
+            return True
+        return any(previous.get(key) != entry[key] for key in entry if key != "mtime")
+
+    @staticmethod
+    def _hash(path: str) -> str:
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha256.update(block)
+        return sha256.hexdigest()
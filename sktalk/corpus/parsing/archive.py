@@ -0,0 +1,33 @@
+import fnmatch
+import tarfile
+import zipfile
+from typing import Iterator
+
+
+def iter_members(path: str, pattern: str = "*") -> Iterator[tuple[str, bytes]]:
+    """Read the files in a zip or tar archive (optionally compressed) without extracting them
+
+    Args:
+        path (str): Path to the archive
+        pattern (str, optional): glob pattern of the names of the members to read, e.g. "*.cha".
+            Defaults to "*".
+
+    Raises:
+        ValueError: if the file is not a zip or tar archive
+
+    Yields:
+        tuple[str, bytes]: the source of each member (the path of the archive followed by the
+            name of the member, e.g. "corpus.zip/dir/file.cha") and its content
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and fnmatch.fnmatchcase(info.filename, pattern):
+                    yield f"{path}/{info.filename}", archive.read(info)
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path) as archive:
+            for info in archive:
+                if info.isfile() and fnmatch.fnmatchcase(info.name, pattern):
+                    yield f"{path}/{info.name}", archive.extractfile(info).read()
+    else:
+        raise ValueError(f"{path} is not a zip or tar archive")
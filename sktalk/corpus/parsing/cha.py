@@ -1,5 +1,5 @@
 import re
-import pylangacq
+from ...profiling import instrument
 from ..utterance import Utterance
 from .parser import InputFile
 
@@ -13,32 +13,35 @@ class ChaFile(InputFile):
 
     SPACER_REGEX = r"\((?P<spacer>[\d.]+)\)"
 
-    def _pla_reader(self) -> pylangacq.Reader:
+    @instrument("pylangacq.read_chat")
+    def _pla_reader(self) -> "pylangacq.Reader":  # noqa: F821
+        import pylangacq  # noqa: import-outside-toplevel
+        if self._content is not None:
+            return pylangacq.Reader.from_strs([self._content.decode("utf-8")], ids=[self._path], parallel=False)
         return pylangacq.read_chat(self._path)
 
     def _extract_metadata(self):
         return self._pla_reader().headers()[0]
 
     def _extract_utterances(self):
-        with open(self._path, encoding="utf-8") as f:
+        with self._open() as f:
             lines = f.readlines()
         utterance_info = [self._extract_info(
             line) for line in lines if not line.startswith("@")]
 
-        # collect all utterance info in a terrible, terrible loop
-        collection = []
+        texts, participants, begin, end = [], [], [], []
         participant = None
         for info in utterance_info:
             if info["utterance"] is None:
                 continue
             if info["participant"] is not None:
                 participant = info["participant"]
-            complete_utterance = Utterance(
-                participant=participant,
-                time=info["time"],
-                utterance=info["utterance"])
-            collection.append(complete_utterance)
-        return collection
+            texts.append(info["utterance"])
+            participants.append(participant)
+            time = info["time"] or [None, None]
+            begin.append(time[0])
+            end.append(time[1])
+        return Utterance.from_arrays(texts, participants, begin, end)
 
     @staticmethod
     def _extract_info(line):
@@ -1,6 +1,142 @@
+import ast
+import os
+from pathlib import Path
+from typing import Optional
+from ...profiling import count_parsed
+from ...profiling import instrument
+from ..utterance import Utterance
 from .parser import InputFile
 
 
 class CsvFile(InputFile):
-    def parse(self) -> "Conversation":  # noqa: F821
-        raise NotImplementedError()
+    """Parser for utterance CSV files, such as the files written by `Writer.write_csv`.
+
+    The file should contain a column "utterance", and can further contain the columns
+    "source", "participant", "time" (formatted as "[begin, end]"), "begin" and "end" (in ms),
+    "utterance_raw", "FTO", "metadata" and "utterance_id". Other columns are ignored: derived fields are
+    recalculated. If "utterance_raw" is present, "utterance" is assumed to be cleaned already.
+
+    Consecutive rows with the same "source" form a conversation. The metadata of each conversation
+    is read from the metadata file written alongside the utterances (e.g. file_metadata.csv), if it exists;
+    as the metadata is flattened in that file, nested metadata is returned with flattened keys
+    (e.g. "Participants_A_name").
+    """
+
+    COLUMNS = ["source", "utterance", "participant", "time", "begin", "end", "utterance_raw", "FTO", "metadata",
+               "utterance_id"]
+    DTYPES = {"source": str, "utterance": str, "participant": str, "time": str,
+              "begin": "float64", "end": "float64", "utterance_raw": str, "FTO": "float64", "metadata": str,
+              "utterance_id": str}
+
+    def __init__(self, path: str, chunksize: int = 100000, metadata_path: Optional[str] = None):
+        """Parser for utterance CSV files
+
+        Args:
+            path (str): Path to the CSV file
+            chunksize (int, optional): Number of rows read at once. Defaults to 100000.
+            metadata_path (str, optional): Path to the metadata CSV file. Defaults to None, in which case
+                the file with "_metadata" appended to the filename is used, if it exists.
+        """
+        super().__init__(path)
+        self._chunksize = chunksize
+        if metadata_path is None:
+            _path = Path(path)
+            metadata_path = _path.with_name(f"{_path.stem}_metadata{_path.suffix}")
+        self._metadata_path = metadata_path
+
+    @instrument("CsvFile.parse", count=count_parsed)
+    def parse(self):
+        """Parse a CSV file containing a single conversation
+
+        Raises:
+            ValueError: if the file contains multiple conversations
+
+        Returns:
+            tuple[list[Utterance], dict]: the utterances and metadata of the conversation
+        """
+        return self._parse_single()
+
+    def conversations(self):
+        """Parse the file one conversation at a time
+
+        The file is read in chunks, so that only a single conversation needs to be held in memory.
+
+        Yields:
+            tuple[list[Utterance], dict]: the utterances and metadata of each conversation
+        """
+        import pandas as pd  # noqa: import-outside-toplevel
+        metadata = self._read_metadata()
+        reader = pd.read_csv(self._path,
+                             usecols=lambda column: column in self.COLUMNS,
+                             dtype=self.DTYPES,
+                             keep_default_na=False,
+                             na_values=[""],
+                             chunksize=self._chunksize)
+        source, parts = None, []
+        with reader:
+            for chunk in reader:
+                if "source" not in chunk:
+                    chunk["source"] = self._path
+                sources = chunk["source"].fillna(self._path)
+                boundaries = [0, *(sources.ne(sources.shift()).to_numpy().nonzero()[0][1:]), len(chunk)]
+                for start, stop in zip(boundaries[:-1], boundaries[1:]):
+                    part = chunk.iloc[start:stop]
+                    part_source = sources.iloc[start]
+                    if part_source != source and parts:
+                        yield self._to_utterances(pd.concat(parts)), self._conversation_metadata(source, metadata)
+                        parts = []
+                    source = part_source
+                    parts.append(part)
+        if parts:
+            yield self._to_utterances(pd.concat(parts)), self._conversation_metadata(source, metadata)
+
+    def _read_metadata(self):
+        import pandas as pd  # noqa: import-outside-toplevel
+        if not os.path.exists(self._metadata_path):
+            return {}
+        df = pd.read_csv(self._metadata_path, dtype=str, keep_default_na=False, na_values=[""])
+        metadata = {}
+        for row in df.to_dict(orient="records"):
+            fields = {key: value for key, value in row.items() if not pd.isna(value)}
+            metadata.setdefault(fields.get("source"), []).append(fields)
+        return metadata
+
+    @staticmethod
+    def _conversation_metadata(source, metadata):
+        # each metadata row belongs to the next conversation with the same source
+        rows = metadata.get(source)
+        return rows.pop(0) if rows else {"source": source}
+
+    @staticmethod
+    def _to_utterances(df):
+        import pandas as pd  # noqa: import-outside-toplevel
+        n = len(df)
+        if "time" in df:
+            times = df["time"].str.strip("[]").str.split(",", expand=True).reindex(columns=[0, 1])
+            begin = pd.to_numeric(times[0], errors="coerce")
+            end = pd.to_numeric(times[1], errors="coerce")
+        else:
+            begin = df["begin"] if "begin" in df else pd.Series([None] * n)
+            end = df["end"] if "end" in df else pd.Series([None] * n)
+        timing = [None if pd.isna(b) or pd.isna(e) else [int(b), int(e)]
+                  for b, e in zip(begin, end)]
+        text = df["utterance"].fillna("").tolist()
+        participants = df["participant"].astype(object).where(df["participant"].notna(), None).tolist() \
+            if "participant" in df else [None] * n
+        cleaned = "utterance_raw" in df
+        raw = df["utterance_raw"].fillna("").tolist() if cleaned else [None] * n
+        fto = [None if pd.isna(value) else int(value) for value in df["FTO"]] if "FTO" in df else [None] * n
+        metadata = [None if pd.isna(value) else ast.literal_eval(value) for value in df["metadata"]] \
+            if "metadata" in df else [None] * n
+        ids = df["utterance_id"].astype(object).where(df["utterance_id"].notna(), None).tolist() \
+            if "utterance_id" in df else [None] * n
+        # text that was written with its raw version is cleaned already
+        create = Utterance._from_cleaned if cleaned else Utterance  # noqa: W0212
+        return [create(text[i],
+                       participant=participants[i],
+                       time=timing[i],
+                       utterance_raw=raw[i],
+                       FTO=fto[i],
+                       metadata=metadata[i],
+                       utterance_id=ids[i])
+                for i in range(n)]
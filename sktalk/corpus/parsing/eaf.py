@@ -1,6 +1,8 @@
+import os
+import tempfile
 import warnings
 from typing import Optional
-from pympi.Elan import Eaf
+from ...profiling import instrument
 from ..utterance import Utterance
 from .parser import InputFile
 
@@ -8,8 +10,8 @@ from .parser import InputFile
 class EafFile(InputFile):
     """Parser for ELAN files."""
 
-    def __init__(self, path: str, tiers: Optional[list[str]] = None):
-        super().__init__(path)
+    def __init__(self, path: str, tiers: Optional[list[str]] = None, content: Optional[bytes] = None):
+        super().__init__(path, content)
         self._tiers = [tiers] if isinstance(tiers, str) else tiers
         if self._tiers == []:
             warnings.warn("No tiers specified, parsing all available tiers.")
@@ -54,11 +56,27 @@ class EafFile(InputFile):
     @property
     def pympi_eaf(self):
         if self._pympi_eaf is None:
-            self._pympi_eaf = Eaf(self._path)
+            self._pympi_eaf = self._read_eaf()
         return self._pympi_eaf
 
+    @instrument("pympi.Eaf")
+    def _read_eaf(self):
+        from pympi.Elan import Eaf  # noqa: import-outside-toplevel
+        if self._content is None:
+            return Eaf(self._path)
+        # pympi only reads from a path, so the content is written to a temporary file,
+        # which is removed after parsing, also if writing or parsing fails
+        file = tempfile.NamedTemporaryFile(suffix=".eaf", delete=False)  # noqa: consider-using-with
+        try:
+            with file:
+                file.write(self._content)
+            return Eaf(file.name)
+        finally:
+            os.remove(file.name)
+
     def _annotation_to_utterances(self, tier_id):
         data = self.pympi_eaf.get_annotation_data_for_tier(tier_id)
-        return [Utterance(annotation[2],
-                          time=[annotation[0], annotation[1]],
-                          participant=tier_id) for annotation in data]
+        return Utterance.from_arrays([annotation[2] for annotation in data],
+                                     participants=[tier_id] * len(data),
+                                     begin=[annotation[0] for annotation in data],
+                                     end=[annotation[1] for annotation in data])
@@ -1,16 +1,64 @@
 import abc
+import io
+from typing import Optional
+from ...profiling import count_parsed
+from ...profiling import instrument
 
 
 class InputFile(abc.ABC):
     """Abstract parser class."""
 
-    def __init__(self, path: str) -> None:
+    def __init__(self, path: str, content: Optional[bytes] = None) -> None:
+        """Parser of a conversation file
+
+        Args:
+            path (str): Path to the file; if `content` is given, the path is only used as the source
+            content (bytes, optional): Content of the file, e.g. a member of an archive.
+                Defaults to None, in which case the file is read from `path`.
+        """
         self._path = path
+        self._content = content
         self._metadata = {"source": path}
 
+    def _open(self):
+        """Open the file, or its content, as text"""
+        if self._content is not None:
+            return io.StringIO(self._content.decode("utf-8"))
+        return open(self._path, encoding="utf-8")  # noqa: consider-using-with
+
+    @instrument("InputFile.parse", count=count_parsed)
     def parse(self) -> tuple[list["Utterance"], dict]:  # noqa: F821
         return self.utterances, self.metadata
 
+    def _parse_single(self) -> tuple[list["Utterance"], dict]:  # noqa: F821
+        """Parse a file that can contain multiple conversations, which should contain a single conversation
+
+        For parsers that override `conversations`.
+
+        Raises:
+            ValueError: if the file contains multiple conversations
+
+        Returns:
+            tuple[list[Utterance], dict]: the utterances and metadata of the conversation
+        """
+        conversations = self.conversations()
+        utterances, metadata = next(conversations, ([], self._metadata))
+        if next(conversations, None) is not None:
+            raise ValueError(
+                f"{self._path} contains multiple conversations; read it as a Corpus instead")
+        return utterances, metadata
+
+    def conversations(self):
+        """Parse the file one conversation at a time
+
+        Files containing a single conversation yield the result of `parse` once;
+        parsers for files that can contain multiple conversations override this method.
+
+        Yields:
+            tuple[list[Utterance], dict]: the utterances and metadata of each conversation
+        """
+        yield self.parse()
+
     @property
     def metadata(self):
         metadata = self._extract_metadata()
@@ -20,9 +68,17 @@ class InputFile(abc.ABC):
 
     @property
     def utterances(self):
-        self._utterances = self._extract_utterances()
+        self._utterances = self._assign_ids(self._extract_utterances())
         return self._utterances
 
+    @staticmethod
+    def _assign_ids(utterances: list["Utterance"]) -> list["Utterance"]:  # noqa: F821
+        """Identify parsed utterances without an identifier by their position, e.g. "u0" """
+        for index, utterance in enumerate(utterances):
+            if utterance.utterance_id is None:
+                utterance.utterance_id = f"u{index}"
+        return utterances
+
     def _extract_metadata(self):
         return {}
 
@@ -1,6 +1,124 @@
+from xml.etree import ElementTree
+from ...profiling import count_parsed
+from ...profiling import instrument
+from ..utterance import Utterance
 from .parser import InputFile
 
 
 class XmlFile(InputFile):
-    def parse(self) -> "Conversation":  # noqa: F821
-        raise NotImplementedError()
+    """Parser for TalkBank XML files.
+
+    A file can contain a single transcript (a CHAT element), or a collection of transcripts,
+    e.g. an entire corpus. The file is read incrementally, and processed elements are
+    discarded, so that only a single conversation needs to be held in memory.
+
+    If the file contains a collection of transcripts, the source of each conversation is
+    the path followed by the position of the transcript in the file, e.g. "corpus.xml#0".
+    """
+
+    TERMINATORS = {"p": ".", "q": "?", "e": "!"}
+
+    @instrument("XmlFile.parse", count=count_parsed)
+    def parse(self):
+        """Parse an XML file containing a single conversation
+
+        Raises:
+            ValueError: if the file contains multiple conversations
+
+        Returns:
+            tuple[list[Utterance], dict]: the utterances and metadata of the conversation
+        """
+        return self._parse_single()
+
+    def conversations(self):
+        """Parse the file one conversation at a time
+
+        Yields:
+            tuple[list[Utterance], dict]: the utterances and metadata of each conversation
+        """
+        stack = []
+        utterances, metadata = [], {}
+        n_conversations = 0
+        for event, element in ElementTree.iterparse(self._path, events=("start", "end")):
+            tag = self._local_name(element.tag)
+            if event == "start":
+                stack.append(element)
+                if tag == "CHAT":
+                    source = self._path if len(stack) == 1 else f"{self._path}#{n_conversations}"
+                    utterances, metadata = [], {"source": source} | self._chat_metadata(element)
+                continue
+            stack.pop()
+            if tag == "participant":
+                attributes = self._attributes(element)
+                metadata.setdefault("Participants", {})[attributes.pop("id", None)] = attributes
+            elif tag == "u":
+                utterances.append(self._to_utterance(element))
+            elif tag == "CHAT":
+                n_conversations += 1
+                yield self._assign_ids(utterances), metadata
+            else:
+                continue
+            # discard processed elements
+            if stack:
+                stack[-1].remove(element)
+            element.clear()
+
+    @staticmethod
+    def _local_name(tag):
+        return tag.rsplit("}", 1)[-1]
+
+    @classmethod
+    def _attributes(cls, element):
+        # attributes in other namespaces (e.g. xsi:schemaLocation) are not metadata
+        return {key: value for key, value in element.attrib.items() if not key.startswith("{")}
+
+    @classmethod
+    def _chat_metadata(cls, element):
+        metadata = cls._attributes(element)
+        if "Lang" in metadata:
+            metadata["Languages"] = metadata.pop("Lang").split()
+        if "Media" in metadata:
+            metadata["Media"] = ", ".join(
+                [metadata.pop("Media")] + metadata.pop("Mediatypes", "").split())
+        return metadata
+
+    @classmethod
+    def _tokens(cls, element):
+        """Find the words, terminators and media of an utterance, also within groups
+
+        Words are not searched for nested words, such as the words of a replacement,
+        so that these are not added to the utterance in addition to the word.
+        """
+        for child in element:
+            if cls._local_name(child.tag) in ("w", "t", "media"):
+                yield child
+            else:
+                yield from cls._tokens(child)
+
+    @classmethod
+    def _word_text(cls, element):
+        # the text of a word, without the text of nested words
+        parts = [element.text or ""]
+        for child in element:
+            if cls._local_name(child.tag) != "w":
+                parts.append(cls._word_text(child))
+            parts.append(child.tail or "")
+        return "".join(parts)
+
+    @classmethod
+    def _to_utterance(cls, element):
+        words, time = [], None
+        for child in cls._tokens(element):
+            tag = cls._local_name(child.tag)
+            if tag == "w":
+                words.append(cls._word_text(child).strip())
+            elif tag == "t" and child.get("type") in cls.TERMINATORS:
+                words.append(cls.TERMINATORS[child.get("type")])
+            elif tag == "media":
+                scale = 1 if child.get("unit") == "ms" else 1000
+                time = [round(float(child.get("start")) * scale),
+                        round(float(child.get("end")) * scale)]
+        return Utterance(" ".join(words),
+                         participant=element.get("who"),
+                         time=time,
+                         utterance_id=element.get("uID"))
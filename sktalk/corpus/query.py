@@ -0,0 +1,213 @@
+"""Queries on the utterances of conversations, evaluated as NumPy masks
+
+A query is a Python expression over the columns of `Conversation.columns`, e.g.
+`n_words > 3 and FTO between -500 and 1000 and participant in {"A", "B"}`. Supported are:
+- comparisons with `==`, `!=`, `<`, `<=`, `>` and `>=`, which can be chained, e.g. `0 <= begin < 60000`
+- `value between low and high`, which is short for `low <= value <= high`; the operands can be
+  arithmetic expressions, e.g. `begin between 0 and 60 * 1000`
+- `in` and `not in` a set, list or tuple of values
+- `is None` and `is not None`, which for numeric columns test for missing values
+- `and`, `or`, `not` and parentheses
+- arithmetic with `+`, `-`, `*` and `/`, e.g. `end - begin > 1000`
+
+Comparisons such as `<` and `!=` with missing values (None or NaN) are false.
+"""
+import ast
+import functools
+import io
+import operator
+import tokenize
+from typing import Union
+
+
+OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+# tokens that end the operands of `between`, unless they are within brackets
+_BOUNDARIES = {"and", "or", "not", "in", "is", "if", "else", "between",
+               "==", "!=", "<", "<=", ">", ">=", ",", ":"}
+_NODES = (ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd, ast.BinOp,
+          ast.Compare, ast.In, ast.NotIn, ast.Is, ast.IsNot, ast.Name, ast.Load, ast.Constant,
+          ast.Set, ast.List, ast.Tuple, *OPERATORS)
+
+
+class Query:
+    """Predicate on the utterances of a conversation
+
+    The expression is parsed and validated once, and can then be evaluated on the
+    columns of any number of conversations; see the module documentation for the syntax.
+    """
+
+    def __init__(self, expr: str) -> None:
+        """Parse a query
+
+        Args:
+            expr (str): the query expression
+
+        Raises:
+            ValueError: if the expression is not a valid query
+        """
+        self.expr = expr
+        try:
+            self._tree = ast.parse(_rewrite_between(expr).strip(), mode="eval").body
+        except SyntaxError as e:
+            raise ValueError(f"Invalid query {expr!r}: {e.msg}") from e
+        except tokenize.TokenError as e:
+            raise ValueError(f"Invalid query {expr!r}: {e.args[0]}") from e
+        for node in ast.walk(self._tree):
+            if not isinstance(node, _NODES):
+                raise ValueError(f"Invalid query {expr!r}: {type(node).__name__} is not supported")
+            if isinstance(node, ast.Compare) and any(isinstance(op, (ast.Is, ast.IsNot)) for op in node.ops):
+                if not all(isinstance(c, ast.Constant) and c.value is None for c in node.comparators):
+                    raise ValueError(f"Invalid query {expr!r}: `is` can only be used with None")
+        self.names = sorted({node.id for node in ast.walk(self._tree) if isinstance(node, ast.Name)})
+
+    def __repr__(self):
+        return f"Query({self.expr!r})"
+
+    def mask(self, columns: dict) -> "np.ndarray":  # noqa: F821
+        """Evaluate the query on the columns of a conversation
+
+        Args:
+            columns (dict[str, np.ndarray]): the columns of the utterances, see `Conversation.columns`
+
+        Raises:
+            ValueError: if the query refers to a column that does not exist
+
+        Returns:
+            np.ndarray: boolean array, which is True for the utterances that match the query
+        """
+        import numpy as np  # noqa: import-outside-toplevel
+        unknown = [name for name in self.names if name not in columns]
+        if unknown:
+            raise ValueError(f"Unknown column {unknown[0]!r} in query; choose from {', '.join(columns)}")
+        n = len(next(iter(columns.values()))) if columns else 0
+        return np.broadcast_to(np.asarray(self._evaluate(self._tree, columns), dtype=bool), (n,))
+
+    def _evaluate(self, node: ast.AST, columns: dict):
+        import numpy as np  # noqa: import-outside-toplevel
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            # operands are broadcast, so that constants such as `True` can be combined with columns
+            return functools.reduce(combine, (np.asarray(self._evaluate(value, columns), dtype=bool)
+                                              for value in node.values))
+        if isinstance(node, ast.UnaryOp):
+            operand = self._evaluate(node.operand, columns)
+            if isinstance(node.op, ast.Not):
+                return ~np.asarray(operand, dtype=bool)
+            return -operand if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BinOp):
+            return OPERATORS[type(node.op)](self._evaluate(node.left, columns), self._evaluate(node.right, columns))
+        if isinstance(node, ast.Compare):
+            # chained comparisons, such as a < b < c, hold if every pair holds
+            result = True
+            left = self._evaluate(node.left, columns)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._evaluate(comparator, columns)
+                result = result & self._compare(op, left, right)
+                left = right
+            return result
+        if isinstance(node, ast.Name):
+            return columns[node.id]
+        if isinstance(node, (ast.Set, ast.List, ast.Tuple)):
+            return [self._evaluate(element, columns) for element in node.elts]
+        return node.value
+
+    @staticmethod
+    def _compare(op: ast.cmpop, left, right):
+        import numpy as np  # noqa: import-outside-toplevel
+        if isinstance(op, (ast.In, ast.NotIn)):
+            values = np.asarray(left)
+            if values.dtype == object:
+                choices = set(right)
+                result = np.fromiter((value in choices for value in values), dtype=bool, count=len(values))
+            else:
+                result = np.isin(values, [choice for choice in right if choice is not None])
+            return ~result if isinstance(op, ast.NotIn) else result
+        if isinstance(op, (ast.Is, ast.IsNot)):
+            values = np.asarray(left)
+            result = np.equal(values, None) if values.dtype == object else np.isnan(values)
+            return ~result if isinstance(op, ast.IsNot) else result
+        if left is None or right is None:
+            return False
+        if isinstance(left, np.ndarray) and left.dtype == object or \
+                isinstance(right, np.ndarray) and right.dtype == object:
+            # comparisons with None are false, rather than raising a TypeError
+            return np.frompyfunc(lambda a, b: a is not None and b is not None and OPERATORS[type(op)](a, b),
+                                 2, 1)(left, right).astype(bool)
+        result = OPERATORS[type(op)](left, right)
+        if isinstance(op, ast.NotEq):
+            for side in (left, right):
+                if isinstance(side, np.ndarray) and side.dtype.kind == "f":
+                    result = result & ~np.isnan(side)
+        return result
+
+
+def _rewrite_between(expr: str) -> str:
+    """Rewrite `value between low and high` as `((low) <= (value) <= (high))`
+
+    The expression is rewritten token by token, so that string literals are left as they are.
+    The operands are the longest expressions around `between` and `and` without comparisons
+    or boolean operators outside of brackets.
+    """
+    tokens = [(token.type, token.string) for token in tokenize.generate_tokens(io.StringIO(expr).readline)]
+    if (tokenize.NAME, "between") not in tokens:
+        return expr
+    while (tokenize.NAME, "between") in tokens:
+        between = tokens.index((tokenize.NAME, "between"))
+        start = _operand_end(tokens, between - 1, -1) + 1
+        conjunction = _operand_end(tokens, between + 1, 1)
+        if tokens[conjunction] != (tokenize.NAME, "and"):
+            raise SyntaxError("`between` should be followed by `low and high`")
+        stop = _operand_end(tokens, conjunction + 1, 1)
+        operands = tokens[between + 1:conjunction], tokens[start:between], tokens[conjunction + 1:stop]
+        if not all(operands):
+            raise SyntaxError("`between` needs a value, a lower and an upper bound")
+        rewritten = [(tokenize.OP, "(")]
+        for i, operand in enumerate(operands):
+            rewritten += [(tokenize.OP, "<=")] if i else []
+            rewritten += [(tokenize.OP, "("), *operand, (tokenize.OP, ")")]
+        tokens[start:stop] = rewritten + [(tokenize.OP, ")")]
+    return tokenize.untokenize(tokens)
+
+
+def _operand_end(tokens: list[tuple[int, str]], position: int, step: int) -> int:
+    """Find the position of the token that ends the operand starting at a position, in the direction of step"""
+    opening, closing = ("([{", ")]}") if step > 0 else (")]}", "([{")
+    depth = 0
+    while 0 <= position < len(tokens):
+        kind, string = tokens[position]
+        if kind in (tokenize.NEWLINE, tokenize.ENDMARKER):
+            break
+        if kind == tokenize.OP and string in opening:
+            depth += 1
+        elif kind == tokenize.OP and string in closing:
+            if depth == 0:
+                break
+            depth -= 1
+        elif depth == 0 and kind in (tokenize.NAME, tokenize.OP) and string in _BOUNDARIES:
+            break
+        position += step
+    return position
+
+
+def as_query(query: Union[str, Query]) -> Query:
+    """Parse a query, unless it was parsed already
+
+    Args:
+        query (str | Query): the query expression, or a parsed query
+
+    Returns:
+        Query: the parsed query
+    """
+    return query if isinstance(query, Query) else Query(query)
@@ -0,0 +1,178 @@
+"""Store corpora in SQLite databases
+
+A database contains the tables:
+- corpus: the metadata of the corpus, as JSON
+- conversations: one row per conversation, with its source and metadata (as JSON)
+- utterances: one row per utterance, with the fields of `Utterance` and the position
+    of the utterance in its conversation
+- metadata: the metadata of each conversation, flattened to key-value pairs
+    (e.g. "Participants_A_name"), so that conversations can be selected on their metadata
+
+The utterances table is indexed on conversation, participant, begin and end.
+Conversations can be selected on their metadata with a subquery, e.g.
+`conversations.conversation_id IN (SELECT conversation_id FROM metadata WHERE key = 'Languages' AND value = '["eng"]')`.
+"""
+import json
+import sqlite3
+from typing import Iterable
+from typing import Optional
+from .conversation import Conversation
+from .utterance import Utterance
+
+
+UTTERANCE_COLUMNS = ["utterance_id", "participant", "time", "begin", "end", "begin_timestamp", "end_timestamp",
+                     "utterance", "utterance_raw", "utterance_list", "n_words", "n_characters", "FTO", "metadata"]
+JSON_COLUMNS = ["time", "utterance_list", "metadata"]
+TABLES = ["corpus", "conversations", "utterances", "metadata"]
+
+SCHEMA = """
+CREATE TABLE corpus (metadata TEXT);
+CREATE TABLE conversations (
+    conversation_id INTEGER PRIMARY KEY,
+    source TEXT,
+    metadata TEXT
+);
+CREATE TABLE utterances (
+    conversation_id INTEGER REFERENCES conversations (conversation_id),
+    position INTEGER,
+    utterance_id TEXT,
+    participant TEXT,
+    time TEXT,
+    "begin" NUMERIC,
+    "end" NUMERIC,
+    begin_timestamp TEXT,
+    end_timestamp TEXT,
+    utterance TEXT,
+    utterance_raw TEXT,
+    utterance_list TEXT,
+    n_words INTEGER,
+    n_characters INTEGER,
+    FTO NUMERIC,
+    metadata TEXT
+);
+CREATE TABLE metadata (
+    conversation_id INTEGER REFERENCES conversations (conversation_id),
+    key TEXT,
+    value TEXT
+);
+CREATE INDEX conversations_source ON conversations (source);
+CREATE INDEX utterances_conversation ON utterances (conversation_id, position);
+CREATE INDEX utterances_participant ON utterances (participant);
+CREATE INDEX utterances_begin ON utterances ("begin");
+CREATE INDEX utterances_end ON utterances ("end");
+CREATE INDEX metadata_key ON metadata (key, value);
+"""
+
+
+def write_sqlite(corpus: "Corpus", path: str):  # noqa: F821
+    """Write a corpus to a SQLite database, replacing its tables if they exist
+
+    All rows are inserted in a single transaction.
+
+    Args:
+        corpus (Corpus): the corpus to write
+        path (str): path to the database file
+    """
+    columns = ", ".join(f'"{column}"' for column in UTTERANCE_COLUMNS)
+    placeholders = ", ".join("?" * (len(UTTERANCE_COLUMNS) + 2))
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            drop = "".join(f"DROP TABLE IF EXISTS {table};" for table in TABLES)
+            connection.executescript(f"BEGIN; {drop} {SCHEMA}")
+            connection.execute("INSERT INTO corpus VALUES (?)", (json.dumps(corpus.metadata),))
+            for conversation_id, conversation in enumerate(corpus.conversations):
+                connection.execute("INSERT INTO conversations VALUES (?, ?, ?)",
+                                   (conversation_id, conversation.metadata.get("source"),
+                                    json.dumps(conversation.metadata)))
+                connection.executemany(f"INSERT INTO utterances (conversation_id, position, {columns}) "
+                                       f"VALUES ({placeholders})",
+                                       (_utterance_row(conversation_id, position, utterance)
+                                        for position, utterance in enumerate(conversation.utterances)))
+                connection.executemany("INSERT INTO metadata VALUES (?, ?, ?)",
+                                       ((conversation_id, key, value)
+                                        for key, value in _flatten(conversation.metadata).items()))
+    finally:
+        connection.close()
+
+
+def read_sqlite(path: str,
+                where: Optional[str] = None,
+                params: Iterable = (),
+                sources: Optional[list[str]] = None) -> tuple[list[Conversation], dict]:
+    """Read the conversations in a SQLite database written by `write_sqlite`
+
+    Args:
+        path (str): path to the database file
+        where (str, optional): SQL condition on the columns of the utterances table, and the columns
+            of the conversations table prefixed with "conversations.", e.g. 'participant = ? AND "end" < 60000'.
+            Unqualified names refer to the utterances table; the metadata of the conversations is
+            `conversations.conversation_metadata`. Only matching utterances are read, and conversations
+            without matching utterances are left out. Defaults to None, in which case all conversations
+            are read, including conversations without utterances.
+        params (Iterable, optional): values of the placeholders in `where`. Defaults to ().
+        sources (list[str], optional): only read the conversations with these sources. Defaults to None.
+
+    Returns:
+        tuple[list[Conversation], dict]: the conversations and the metadata of the corpus
+    """
+    conditions, values = [], []
+    if where is not None:
+        conditions.append(f"({where})")
+        values.extend(params)
+    if sources is not None:
+        sources = list(sources)
+        conditions.append(f"conversations.source IN ({', '.join('?' * len(sources))})")
+        values.extend(sources)
+    columns = ", ".join(f'utterances."{column}"' for column in UTTERANCE_COLUMNS)
+    # the metadata of the conversations is renamed, so that "metadata" in `where` refers to the utterances;
+    # conversations without utterances are kept by the left join, unless `where` excludes them
+    query = (f"SELECT conversations.conversation_id, conversations.conversation_metadata, "
+             f"utterances.position, {columns} "
+             "FROM (SELECT conversation_id, source, metadata AS conversation_metadata FROM conversations) "
+             "AS conversations LEFT JOIN utterances USING (conversation_id) "
+             f"{'WHERE ' + ' AND '.join(conditions) if conditions else ''} "
+             "ORDER BY conversations.conversation_id, utterances.position")
+    connection = sqlite3.connect(path)
+    try:
+        (corpus_metadata,), = connection.execute("SELECT metadata FROM corpus")
+        selected = {}
+        for conversation_id, conversation_metadata, position, *row in connection.execute(query, values):
+            if conversation_id not in selected:
+                selected[conversation_id] = json.loads(conversation_metadata), []
+            if position is not None:
+                selected[conversation_id][1].append(_to_utterance(row))
+        conversations = [Conversation(utterances, metadata, suppress_warnings=True)
+                         for metadata, utterances in selected.values()]
+    finally:
+        connection.close()
+    return conversations, json.loads(corpus_metadata)
+
+
+def _utterance_row(conversation_id: int, position: int, utterance: Utterance) -> tuple:
+    row = [conversation_id, position]
+    for column in UTTERANCE_COLUMNS:
+        value = getattr(utterance, column)
+        row.append(value if column not in JSON_COLUMNS or value is None else json.dumps(value))
+    return tuple(row)
+
+
+def _to_utterance(row: tuple) -> Utterance:
+    fields = dict(zip(UTTERANCE_COLUMNS, row))
+    for column in JSON_COLUMNS:
+        if fields[column] is not None:
+            fields[column] = json.loads(fields[column])
+    return Utterance._fromdict(fields)  # noqa: W0212
+
+
+def _flatten(metadata: dict, prefix: str = "") -> dict:
+    """Flatten nested metadata, joining keys with "_" as in `Writer.metadata_df`"""
+    flat = {}
+    for key, value in metadata.items():
+        if isinstance(value, dict):
+            flat |= _flatten(value, f"{prefix}{key}_")
+        elif isinstance(value, str) or value is None:
+            flat[f"{prefix}{key}"] = value
+        else:
+            flat[f"{prefix}{key}"] = json.dumps(value)
+    return flat
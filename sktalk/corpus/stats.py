@@ -0,0 +1,205 @@
+"""Summary statistics of conversations, computed in a single pass
+
+A `Summary` is computed from the columns of one conversation, and summaries of
+conversations can be merged, so that the statistics of a corpus are obtained without
+holding all utterances in memory, and conversations can be summarised in parallel.
+Quantiles of the FTO are exact up to `QuantileSketch.CAPACITY` values, and approximate
+in bounded memory beyond that.
+"""
+from typing import Iterable
+from typing import Optional
+
+
+class QuantileSketch:
+    """Mergeable sketch of a distribution of values, for quantiles in bounded memory
+
+    Values are kept exactly until there are more than `capacity` of them. The values are
+    then compacted as in the KLL sketch: the sorted values are replaced by every other value,
+    with twice the weight. Memory grows with the logarithm of the number of values, and
+    the rank error of quantiles is in the order of log2(n / capacity) / capacity.
+    """
+
+    CAPACITY = 10000
+
+    def __init__(self, capacity: Optional[int] = None) -> None:
+        self.capacity = capacity or self.CAPACITY
+        self.count = 0
+        self.total = 0.0
+        # the values at level i have a weight of 2 ** i
+        self._levels = []
+        self._offset = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, values: "np.ndarray"):  # noqa: F821
+        """Add values to the sketch
+
+        Args:
+            values (np.ndarray): the values to add, which should not be NaN
+        """
+        self.count += len(values)
+        self.total += float(values.sum())
+        self._add(0, values)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add the values of another sketch
+
+        Args:
+            other (QuantileSketch): the sketch to merge into this sketch
+
+        Returns:
+            QuantileSketch: this sketch
+        """
+        self.count += other.count
+        self.total += other.total
+        for level, values in enumerate(other._levels):
+            self._add(level, values)
+        return self
+
+    def _add(self, level: int, values: "np.ndarray"):  # noqa: F821
+        import numpy as np  # noqa: import-outside-toplevel
+        while len(self._levels) <= level:
+            self._levels.append(np.empty(0))
+        self._levels[level] = np.concatenate([self._levels[level], values])
+        while len(self._levels[level]) > self.capacity:
+            values = np.sort(self._levels[level])
+            # an odd value out stays at its level; the offset alternates to avoid a bias
+            kept, values = values[:len(values) % 2], values[len(values) % 2:]
+            self._levels[level] = kept
+            if len(self._levels) == level + 1:
+                self._levels.append(np.empty(0))
+            self._levels[level + 1] = np.concatenate([self._levels[level + 1], values[self._offset::2]])
+            self._offset ^= 1
+            level += 1
+
+    def quantiles(self, quantiles: list[float]) -> list[Optional[float]]:
+        """Calculate quantiles of the values
+
+        Args:
+            quantiles (list[float]): the quantiles to calculate, between 0 and 1
+
+        Returns:
+            list[float | None]: the quantiles, which are exact if the values were not compacted;
+                None if the sketch is empty
+        """
+        import numpy as np  # noqa: import-outside-toplevel
+        if not self.count:
+            return [None] * len(quantiles)
+        if len(self._levels) == 1:
+            return np.quantile(self._levels[0], quantiles).tolist()
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level_values), 2 ** level)
+                                  for level, level_values in enumerate(self._levels)])
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, np.asarray(quantiles) * cumulative[-1], side="left")
+        return values[order][np.minimum(positions, len(values) - 1)].tolist()
+
+    def mean(self) -> Optional[float]:
+        """
+        Get the (exact) mean of the values.
+
+        Returns:
+            float | None: the mean, or None if the sketch is empty
+        """
+        return self.total / self.count if self.count else None
+
+
+class Summary:
+    """Mergeable summary statistics of the utterances of one or more conversations"""
+
+    QUANTILES = {"FTO_q25": 0.25, "FTO_median": 0.5, "FTO_q75": 0.75}
+
+    def __init__(self, source: Optional[str] = None) -> None:
+        self.source = source
+        self.n_utterances = 0
+        self.n_untimed = 0
+        self.n_words = 0
+        self.duration = 0.0
+        self.n_participants = 0
+        self.fto = QuantileSketch()
+
+    @classmethod
+    def from_conversation(cls, conversation: "Conversation") -> "Summary":  # noqa: F821
+        """Summarise a conversation
+
+        Args:
+            conversation (Conversation): the conversation to summarise
+
+        Returns:
+            Summary: the statistics of the utterances in the conversation
+        """
+        import numpy as np  # noqa: import-outside-toplevel
+        columns = conversation.columns
+        begin, end, fto = columns["begin"], columns["end"], columns["FTO"]
+        summary = cls(conversation.metadata.get("source"))
+        summary.n_utterances = len(begin)
+        timed = ~np.isnan(begin)
+        summary.n_untimed = int(len(begin) - timed.sum())
+        summary.n_words = int(np.nansum(columns["n_words"]))
+        if timed.any():
+            summary.duration = float(end[timed].max() - begin[timed].min())
+        summary.n_participants = sum(p is not None for p in conversation.participant_counts)
+        summary.fto.add(fto[~np.isnan(fto)])
+        return summary
+
+    def merge(self, other: "Summary") -> "Summary":
+        """Add the statistics of other conversations to the summary
+
+        The durations of the conversations are added up, and so are the participants:
+        participants are identified by their name within a conversation only, as
+        transcripts commonly reuse codes such as "A" and "B".
+
+        Args:
+            other (Summary): the summary to merge into this summary
+
+        Returns:
+            Summary: this summary
+        """
+        self.n_utterances += other.n_utterances
+        self.n_untimed += other.n_untimed
+        self.n_words += other.n_words
+        self.duration += other.duration
+        self.n_participants += other.n_participants
+        self.fto.merge(other.fto)
+        return self
+
+    def asdict(self) -> dict:
+        """
+        Return the statistics as a dictionary
+
+        Returns:
+            dict: the source, the number of utterances, the duration in ms, the number of words and
+                of participants, the mean and quartiles of the FTO, and the proportion of utterances
+                without timing information; statistics that cannot be calculated are None
+        """
+        quantiles = dict(zip(self.QUANTILES, self.fto.quantiles(list(self.QUANTILES.values()))))
+        return {"source": self.source,
+                "utterances": self.n_utterances,
+                "duration": self.duration if self.n_untimed < self.n_utterances else None,
+                "words": self.n_words,
+                "participants": self.n_participants,
+                "FTO_mean": self.fto.mean(),
+                **quantiles,
+                "untimed": self.n_untimed / self.n_utterances if self.n_utterances else None}
+
+
+def summary_df(summaries: Iterable[Summary], total: str = "total"):
+    """Combine the summaries of conversations in a dataframe, with a row for their total
+
+    Args:
+        summaries (Iterable[Summary]): the summaries of the conversations
+        total (str, optional): the source of the total row. Defaults to "total".
+
+    Returns:
+        pd.DataFrame: dataframe with a row per summary, followed by the total row
+    """
+    import pandas as pd  # noqa: import-outside-toplevel
+    combined = Summary(total)
+    # summaries are merged as they arrive, and only their rows are kept
+    rows = []
+    for summary in summaries:
+        rows.append(summary.asdict())
+        combined.merge(summary)
+    return pd.DataFrame(rows + [combined.asdict()])
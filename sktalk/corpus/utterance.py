@@ -1,3 +1,4 @@
+import dataclasses
 import re
 import warnings
 from dataclasses import asdict
@@ -6,6 +7,10 @@ from datetime import datetime
 from datetime import timezone
 from typing import Any
 from typing import Optional
+from typing import Sequence
+from ..profiling import count_one
+from ..profiling import count_result
+from ..profiling import instrument
 
 
 @dataclass
@@ -23,12 +28,17 @@ class Utterance:
     n_characters: Optional[int] = None
     FTO: Optional[int] = None
     metadata: Optional[dict[str, Any]] = None
+    utterance_id: Optional[str] = None
 
+    @instrument("Utterance.__post_init__", count=count_one)
     def __post_init__(self):
         if self.utterance_raw is None:  # if reading in existing data, we do not want to overwrite the raw utterance
             self.utterance_raw = self.utterance
         self.utterance = self._clean_utterance(self.utterance)
         self.utterance_list = self.utterance.split()
+        self._set_derived_fields()
+
+    def _set_derived_fields(self):
         self.n_words = len(self.utterance_list)
         self.n_characters = sum(len(word) for word in self.utterance_list)
 
@@ -40,8 +50,81 @@ class Utterance:
             self.begin_timestamp = self._to_timestamp(self.begin)
             self.end_timestamp = self._to_timestamp(self.end)
 
-    def get_audio(self):
-        pass
+    @classmethod
+    def _from_cleaned(cls, utterance: str, utterance_raw: str, **fields) -> "Utterance":
+        """Create an utterance of which the text is cleaned already, without cleaning it again
+
+        Used by parsers of files that store both the cleaned and the raw text, such as `CsvFile`.
+        """
+        self = cls.__new__(cls)
+        for field in dataclasses.fields(cls):
+            setattr(self, field.name, field.default)
+        self.__dict__.update(fields, utterance=utterance, utterance_raw=utterance_raw,
+                             utterance_list=utterance.split())
+        self._set_derived_fields()
+        return self
+
+    @classmethod
+    @instrument("Utterance.from_arrays", count=count_result)
+    def from_arrays(cls,
+                    utterances: Sequence[str],
+                    participants: Optional[Sequence[Optional[str]]] = None,
+                    begin: Optional[Sequence[Optional[float]]] = None,
+                    end: Optional[Sequence[Optional[float]]] = None,
+                    utterance_ids: Optional[Sequence[Optional[str]]] = None) -> list["Utterance"]:
+        """Create multiple utterances at once
+
+        The timing of all utterances is validated and formatted at once. Invalid timing is
+        removed, as for single utterances, but a single warning is issued for all invalid times.
+
+        Args:
+            utterances (Sequence[str]): text of the utterances
+            participants (Sequence[str | None], optional): participant of each utterance. Defaults to None.
+            begin (Sequence[float | None], optional): begin time in ms of each utterance,
+                None or NaN if unknown. Defaults to None.
+            end (Sequence[float | None], optional): end time in ms of each utterance,
+                None or NaN if unknown. Defaults to None.
+            utterance_ids (Sequence[str | None], optional): identifier of each utterance. Defaults to None.
+
+        Returns:
+            list[Utterance]: the utterances
+        """
+        n = len(utterances)
+        participants = [None] * n if participants is None else participants
+        utterance_ids = [None] * n if utterance_ids is None else utterance_ids
+        result = [cls(utterance, participant=participant, utterance_id=utterance_id)
+                  for utterance, participant, utterance_id in zip(utterances, participants, utterance_ids)]
+        if begin is None or end is None or not n:
+            return result
+        begin, end, valid = cls._validate_times(begin, end)
+        begin_timestamps = cls._to_timestamps([begin[index] for index in valid])
+        end_timestamps = cls._to_timestamps([end[index] for index in valid])
+        for position, index in enumerate(valid):
+            utterance = result[index]
+            utterance.begin, utterance.end = begin[index], end[index]
+            utterance.time = [utterance.begin, utterance.end]
+            utterance.begin_timestamp = begin_timestamps[position]
+            utterance.end_timestamp = end_timestamps[position]
+        return result
+
+    def get_audio(self, wav) -> Optional["np.ndarray"]:  # noqa: F821
+        """Get the audio of the utterance from a WAV file
+
+        The file is memory-mapped, so only the samples of the utterance are read.
+
+        Args:
+            wav (str | WavFile): the WAV file, or its path
+
+        Returns:
+            np.ndarray | None: the samples of the utterance, of shape (frames, channels),
+                or None if the utterance has no timing information
+        """
+        from .audio import WavFile  # noqa: import-outside-toplevel
+        if not self.time:
+            return None
+        if not isinstance(wav, WavFile):
+            wav = WavFile(wav)
+        return wav.segment(self.time[0], self.time[1])
 
     def asdict(self):
         return asdict(self)
@@ -102,6 +185,48 @@ class Utterance:
         if not valid:
             self.time = None
 
+    @staticmethod
+    def _validate_times(begin, end):
+        """Validate begin and end times of multiple utterances at once
+
+        Times are valid under the same conditions as in `_validate_time`; times that are
+        None or NaN for both begin and end are missing, and do not cause a warning.
+
+        Returns:
+            tuple[list, list, list[int]]: begin and end times, as given, and the indices of the valid times
+        """
+        import numpy as np  # noqa: import-outside-toplevel
+
+        def numbers(times):
+            return np.fromiter((time if isinstance(time, (float, int)) else np.nan for time in times),
+                               dtype=float, count=len(times))
+
+        def absent(times):
+            return np.fromiter((time is None or isinstance(time, float) and np.isnan(time) for time in times),
+                               dtype=bool, count=len(times))
+
+        # elements of NumPy arrays are converted to Python numbers, to be checked as in `_validate_time`
+        begin = begin.tolist() if isinstance(begin, np.ndarray) else list(begin)
+        end = end.tolist() if isinstance(end, np.ndarray) else list(end)
+        begin_array, end_array = numbers(begin), numbers(end)
+        missing = absent(begin) & absent(end)
+        with np.errstate(invalid="ignore"):
+            valid = ((begin_array >= 0) & (end_array < 86399999) & (begin_array < end_array))
+        if n_invalid := int(np.sum(~valid & ~missing)):
+            warnings.warn(f"{n_invalid} utterances have invalid time; their time is set to None")
+        return begin, end, np.flatnonzero(valid).tolist()
+
+    @staticmethod
+    def _to_timestamps(times_ms):
+        """Format multiple times in ms as timestamps, as `_to_timestamp` does"""
+        import numpy as np  # noqa: import-outside-toplevel
+        times = np.floor(np.nan_to_num(np.array(times_ms, dtype=float))).astype(np.int64)
+        hours, remainder = np.divmod(times, 3600000)
+        minutes, remainder = np.divmod(remainder, 60000)
+        seconds, milliseconds = np.divmod(remainder, 1000)
+        return [f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}" for h, m, s, ms in
+                zip(hours.tolist(), minutes.tolist(), seconds.tolist(), milliseconds.tolist())]
+
     @staticmethod
     def _to_timestamp(time_ms):
         time_dt = datetime.fromtimestamp(time_ms/1000, tz=timezone.utc)
@@ -1,8 +1,11 @@
 import abc
 import json
 from pathlib import Path
-import numpy as np
-import pandas as pd
+from typing import Optional
+from ...profiling import instrument
+from ..jsonfile import dumps
+from ..jsonfile import json_path
+from ..jsonfile import open_json
 
 
 class Writer(abc.ABC):
@@ -10,21 +13,29 @@ class Writer(abc.ABC):
     def asdict(self):
         return NotImplemented
 
-    def write_json(self, path: str = "./file.json"):
+    def write_json(self, path: str = "./file.json", indent: Optional[int] = 4, backend: str = "json"):
         """
         Write an object to a JSON file.
 
+        If the path ends in ".gz", ".xz" or ".zst", the file is compressed with gzip, lzma
+        or Zstandard (which requires the zstandard package), e.g. "file.json.gz".
+
         Args:
             path (str): The path to the output file.
+            indent (int, optional): Number of spaces to indent with. Defaults to 4;
+                None gives compact output, without indentation and whitespace.
+            backend (str, optional): JSON encoder, "json" or the faster "orjson" (which requires
+                the orjson package). Defaults to "json".
         """
-        _path = Path(path).with_suffix(".json")
-
-        object_dict = self.asdict()
+        _path = json_path(path)
 
-        with open(_path, "w", encoding='utf-8') as file:
-            json.dump(object_dict, file, indent=4)
+        with open_json(_path, "w") as file:
+            self._dump_json(file, indent, backend)
         print("Object saved to", _path)
 
+    def _dump_json(self, file, indent: Optional[int] = 4, backend: str = "json"):
+        file.write(dumps(self.asdict(), indent, backend))
+
     def write_csv(self, path: str = "./file.csv"):
         """Write the object to CSV files.
 
@@ -48,18 +59,23 @@ class Writer(abc.ABC):
         return path.with_name(f"{path.stem}_{specifier}{path.suffix}")
 
     @classmethod
+    @instrument("Writer._metadata_to_df")
     def _metadata_to_df(cls, metadata: dict):
+        import numpy as np  # noqa: import-outside-toplevel
+        import pandas as pd  # noqa: import-outside-toplevel
         norm = pd.json_normalize(data=metadata, sep="_")
-        df = pd.DataFrame(norm)
+        df = pd.DataFrame(norm).astype(object)
         
         def process_element(x):
-            if isinstance(x, list):
+            if isinstance(x, list) and all(isinstance(item, str) for item in x):
                 return ', '.join(x)
-            if isinstance(x, dict):
+            if isinstance(x, (list, tuple, dict)):
+                # e.g. the media descriptors of ELAN files, which are lists of dictionaries
                 return json.dumps(x)  # or ', '.join([f'{k}: {v}' for k, v in x.items()])
             return x
         
-        df[:] = np.vectorize(process_element)(df)
+        if not df.empty:
+            df[:] = np.vectorize(process_element, otypes=[object])(df)
         return df
 
     @property
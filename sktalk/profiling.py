@@ -0,0 +1,134 @@
+"""Opt-in timing instrumentation of parsing and calculations
+
+Instrumentation is off by default, and only collects data within a `profile` context:
+
+    with sktalk.profiling.profile() as prof:
+        conversation = Conversation.from_cha("file.cha")
+        conversation.calculate_FTO()
+    prof.to_df()
+
+Stages are timed inclusively: the time of a stage includes the time of the
+instrumented stages it calls (e.g. `InputFile.parse` includes `Utterance.__post_init__`).
+"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+from typing import Optional
+
+
+_active_profiles = []
+_lock = threading.Lock()
+
+
+class Profile:
+    """Collection of wall time, call counts and processed utterances per stage."""
+
+    def __init__(self) -> None:
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, duration: float, n_utterances: int = 0):
+        """Record a single call of a stage
+
+        Args:
+            stage (str): name of the stage
+            duration (float): wall time of the call in seconds
+            n_utterances (int, optional): number of utterances processed in the call. Defaults to 0.
+        """
+        with self._lock:
+            calls, total, utterances = self._stages.get(stage, (0, 0.0, 0))
+            self._stages[stage] = (calls + 1, total + duration, utterances + n_utterances)
+
+    def reset(self):
+        """Remove all recorded data."""
+        with self._lock:
+            self._stages = {}
+
+    def asdict(self):
+        """
+        Return the recorded data as a dictionary
+
+        Returns:
+            dict: per stage a dictionary with the number of calls, the total and mean time in seconds,
+                the number of processed utterances and the utterance throughput per second
+        """
+        with self._lock:
+            stages = dict(self._stages)
+        return {stage: {
+            "calls": calls,
+            "total_time": total,
+            "mean_time": total / calls,
+            "utterances": utterances,
+            "utterances_per_second": utterances / total if total > 0 else None
+        } for stage, (calls, total, utterances) in stages.items()}
+
+    def to_df(self):
+        """Return the recorded data as a pandas dataframe, with one row per stage."""
+        import pandas as pd  # noqa: import-outside-toplevel
+        df = pd.DataFrame.from_dict(self.asdict(), orient="index")
+        df.index.name = "stage"
+        return df
+
+
+@contextmanager
+def profile():
+    """Collect timing information of instrumented stages within the context
+
+    Yields:
+        Profile: the profile in which the timing information is collected
+    """
+    prof = Profile()
+    with _lock:
+        _active_profiles.append(prof)
+    try:
+        yield prof
+    finally:
+        with _lock:
+            _active_profiles.remove(prof)
+
+
+def count_self(_result, obj, *_args, **_kwargs) -> int:
+    """Count the utterances of the object on which an instrumented method is called."""
+    return len(obj)
+
+
+def count_parsed(result, *_args, **_kwargs) -> int:
+    """Count the utterances returned by an instrumented parser."""
+    return len(result[0])
+
+
+def count_result(result, *_args, **_kwargs) -> int:
+    """Count the utterances returned by an instrumented function."""
+    return len(result)
+
+
+def count_one(*_args, **_kwargs) -> int:
+    """Count a single utterance per call."""
+    return 1
+
+
+def instrument(stage: str, count: Optional[Callable[..., int]] = None):
+    """Decorator to time a function when profiling is active
+
+    Args:
+        stage (str): name under which the calls are recorded
+        count (Callable, optional): function that returns the number of processed utterances.
+            It is called with the return value of the decorated function, followed by its arguments.
+            Defaults to None, in which case no utterances are counted.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _active_profiles:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            duration = time.perf_counter() - start
+            n_utterances = count(result, *args, **kwargs) if count is not None else 0
+            for prof in list(_active_profiles):
+                prof.record(stage, duration, n_utterances)
+            return result
+        return wrapper
+    return decorator
@@ -235,3 +235,13 @@ def expected_csv_utterances_corpus():
         ["17", "file.cha", "X7 utterance G", "", ""],
         ["18", "file.cha", "X8 utterance H", "B", "[9000, 12500]"],
         ["19", "file.cha", "X9 utterance I", "C", "[12000, 13000]"]]
+
+
+@pytest.fixture
+def conversation_files(convo, tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"convo{i}.json"
+        Conversation(convo.utterances[i:], {"source": f"convo{i}"}).write_json(path)
+        paths.append(str(path))
+    return paths
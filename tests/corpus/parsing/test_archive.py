@@ -0,0 +1,69 @@
+import tarfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.corpus import Corpus
+from sktalk.corpus.corpus import _bounded_map
+from sktalk.corpus.parsing.archive import iter_members
+
+
+FILES = ["tests/testdata/file01.cha", "tests/testdata/file02.eaf"]
+
+
+@pytest.fixture(params=["corpus.zip", "corpus.tar.gz"])
+def archive(request, tmp_path):
+    path = str(tmp_path / request.param)
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path, "w") as f:
+            for file in FILES:
+                f.write(file, f"data/{file.rsplit('/', 1)[-1]}")
+    else:
+        with tarfile.open(path, "w:gz") as f:
+            for file in FILES:
+                f.add(file, f"data/{file.rsplit('/', 1)[-1]}")
+    return path
+
+
+class TestArchive:
+    def test_iter_members(self, archive):
+        members = list(iter_members(archive, "*.cha"))
+        assert [source for source, _ in members] == [f"{archive}/data/file01.cha"]
+        with open(FILES[0], "rb") as f:
+            assert members[0][1] == f.read()
+
+    def test_not_an_archive(self):
+        with pytest.raises(ValueError, match="not a zip or tar archive"):
+            list(iter_members(FILES[0]))
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_from_archive(self, archive, workers):
+        corpus = Corpus.from_archive(archive, "*", workers=workers, language="mixed")
+        assert corpus.metadata == {"language": "mixed"}
+        expected = [Conversation.from_cha(FILES[0]), Conversation.from_eaf(FILES[1])]
+        assert [c.metadata["source"] for c in corpus.conversations] == \
+            [f"{archive}/data/file01.cha", f"{archive}/data/file02.eaf"]
+        for conversation, expected_conversation in zip(corpus.conversations, expected):
+            assert conversation.utterances == expected_conversation.utterances
+            assert conversation.metadata | {"source": None} == expected_conversation.metadata | {"source": None}
+
+    def test_bounded_map(self):
+        # items are read at most `window` ahead of the results
+        read, lag = [], []
+        lock = threading.Lock()
+
+        def items():
+            for i in range(20):
+                with lock:
+                    read.append(i)
+                yield i
+
+        def work(i):
+            with lock:
+                lag.append(len(read) - i)
+            return i * 2
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert list(_bounded_map(executor, work, items(), window=3)) == list(range(0, 40, 2))
+        assert max(lag) <= 4
@@ -0,0 +1,68 @@
+import json
+import os
+import pytest
+from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.corpus import Corpus
+from sktalk.corpus.parsing.csv import CsvFile
+
+
+def utterance_fields(utterance):
+    fields = utterance.asdict()
+    del fields["begin_timestamp"], fields["end_timestamp"]
+    return fields
+
+
+class TestCsvFile:
+    def test_roundtrip_conversation(self, convo_fto, tmp_path):
+        convo_fto.calculate_FTO()
+        path = f"{str(tmp_path)}{os.sep}convo.csv"
+        convo_fto.write_csv(path)
+        convo_in = Conversation.from_csv(path)
+        assert len(convo_in) == len(convo_fto)
+        for utterance_in, utterance in zip(convo_in.utterances, convo_fto.utterances):
+            assert utterance_in == utterance
+        assert convo_in.metadata["source"] == "file.cha"
+        assert convo_in.metadata["Participants_A_name"] == "Aone"
+
+    @pytest.mark.parametrize("chunksize", [3, 100])
+    def test_roundtrip_corpus(self, convo, tmp_path, chunksize):
+        other = Conversation(convo.utterances[:4], {"source": "other.cha"})
+        corpus = Corpus([convo, other], language="French")
+        path = f"{str(tmp_path)}{os.sep}corpus.csv"
+        corpus.write_csv(path)
+        corpus_in = Corpus.from_csv(path, chunksize=chunksize)
+        assert [len(c) for c in corpus_in.conversations] == [10, 4]
+        assert [c.metadata["source"] for c in corpus_in.conversations] == ["file.cha", "other.cha"]
+        assert corpus_in.conversations[1].metadata["language"] == "French"
+        assert corpus_in.conversations[0].utterances[7].participant is None
+        assert corpus_in.conversations[0].utterances[7].time is None
+
+    def test_roundtrip_eaf(self, tmp_path):
+        # list and dictionary metadata, as in ELAN files, is written as JSON
+        convo = Conversation.from_eaf("tests/testdata/file02.eaf")
+        path = f"{str(tmp_path)}{os.sep}eaf.csv"
+        Corpus([convo]).write_csv(path)
+        convo_in = Corpus.from_csv(path).conversations[0]
+        assert [utterance_fields(u) for u in convo_in] == [utterance_fields(u) for u in convo]
+        assert json.loads(convo_in.metadata["media_descriptors"]) == convo.metadata["media_descriptors"]
+
+    def test_multiple_conversations(self, convo, tmp_path):
+        other = Conversation(convo.utterances[:4], {"source": "other.cha"})
+        path = f"{str(tmp_path)}{os.sep}corpus.csv"
+        Corpus([convo, other]).write_csv(path)
+        with pytest.raises(ValueError, match="multiple conversations"):
+            Conversation.from_csv(path)
+
+    def test_minimal_csv(self, tmp_path):
+        """CSV files from other tools, with begin and end columns and uncleaned utterances"""
+        path = tmp_path / "minimal.csv"
+        path.write_text("utterance,participant,begin,end\n"
+                        "Hello [laugh] world,A,0,1000\n"
+                        "NA,B,900,\n", encoding="utf-8")
+        utterances, metadata = CsvFile(str(path)).parse()
+        assert metadata == {"source": str(path)}
+        assert utterances[0].utterance == "Hello world"
+        assert utterances[0].utterance_raw == "Hello [laugh] world"
+        assert utterances[0].time == [0, 1000]
+        assert utterances[1].utterance == "NA"
+        assert utterances[1].time is None
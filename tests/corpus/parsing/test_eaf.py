@@ -1,3 +1,4 @@
+import tempfile
 from contextlib import nullcontext as does_not_raise
 import pytest
 from sktalk.corpus.conversation import Conversation
@@ -149,3 +150,13 @@ class TestEafFile:
             parsed_eaf = Conversation.from_eaf(path_source, tiers=tiers)
             assert {u.participant for u in parsed_eaf.utterances} == participants
             assert len(parsed_eaf.utterances) == n_utterances
+
+    def test_content_temporary_file(self, path_source, tmp_path, monkeypatch):
+        # the temporary file for the content is removed, also if the content cannot be parsed
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        with open(path_source, "rb") as f:
+            content = f.read()
+        assert len(EafFile("archive.zip/file02.eaf", content=content).parse()[0]) == 12
+        with pytest.raises(Exception, match="Unable to parse eaf"):
+            EafFile("archive.zip/broken.eaf", content=b"not xml").parse()
+        assert not list(tmp_path.iterdir())
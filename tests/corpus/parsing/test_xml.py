@@ -0,0 +1,76 @@
+import pytest
+from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.corpus import Corpus
+from sktalk.corpus.parsing.xml import XmlFile
+
+
+@pytest.fixture
+def path_source():
+    return "tests/testdata/corpus.xml"
+
+
+@pytest.fixture
+def expected_metadata():
+    return {
+        "source": "tests/testdata/corpus.xml#0",
+        "Corpus": "test",
+        "Date": "2023-01-01",
+        "PID": "11312/c-1",
+        "Version": "2.20.0",
+        "Languages": ["eng"],
+        "Media": "conv01, audio",
+        "Participants": {
+            "A": {"name": "Ann", "role": "Adult", "language": "eng"},
+            "B": {"name": "Bert", "role": "Adult", "language": "eng", "age": "P37Y"}
+        }
+    }
+
+
+@pytest.fixture
+def nested_path(tmp_path):
+    # a replacement and a compound contain nested <w> elements
+    path = tmp_path / "nested.xml"
+    path.write_text('<CHAT xmlns="http://www.talkbank.org/ns/talkbank" Lang="eng">'
+                    '<u who="A"><w>gonna<replacement><w>going</w><w>to</w></replacement></w>'
+                    '<g><w>ice<wk type="cmp"/>cream</w></g><w><shortening>be</shortening>cause</w>'
+                    '<t type="p"/></u></CHAT>',
+                    encoding="utf-8")
+    return str(path)
+
+
+class TestXmlFile:
+    def test_conversations(self, path_source, expected_metadata):
+        conversations = list(XmlFile(path_source).conversations())
+        assert len(conversations) == 2
+        utterances, metadata = conversations[0]
+        assert metadata == expected_metadata
+        assert [u.utterance_raw for u in utterances] == ["hello world .", "hi there ?", "no timing ."]
+        assert [u.utterance for u in utterances] == ["hello world", "hi there", "no timing"]
+        assert [u.participant for u in utterances] == ["A", "B", "A"]
+        assert [u.time for u in utterances] == [[0, 1500], [1400, 2775], None]
+        assert [u.utterance_id for u in utterances] == ["u0", "u1", "u2"]
+        utterances, metadata = conversations[1]
+        assert metadata["source"] == "tests/testdata/corpus.xml#1"
+        assert metadata["Languages"] == ["fra"]
+        assert utterances[0].time == [250, 900]
+
+    def test_corpus(self, path_source):
+        corpus = Corpus.from_xml(path_source, language="mixed")
+        assert isinstance(corpus, Corpus)
+        assert [len(c) for c in corpus.conversations] == [3, 1]
+        assert corpus.metadata == {"language": "mixed"}
+
+    def test_single_conversation(self, path_source, tmp_path):
+        with pytest.raises(ValueError, match="multiple conversations"):
+            Conversation.from_xml(path_source)
+        path = tmp_path / "single.xml"
+        path.write_text('<CHAT xmlns="http://www.talkbank.org/ns/talkbank" Lang="eng">'
+                        '<u who="A"><w>hello</w><media start="1" end="2" unit="s"/></u></CHAT>',
+                        encoding="utf-8")
+        convo = Conversation.from_xml(str(path))
+        assert convo.metadata == {"source": str(path), "Languages": ["eng"]}
+        assert convo.utterances[0].time == [1000, 2000]
+
+    def test_nested_words(self, nested_path):
+        utterances, _ = XmlFile(nested_path).parse()
+        assert utterances[0].utterance_raw == "gonna icecream because ."
@@ -0,0 +1,69 @@
+import shutil
+import wave
+import numpy as np
+import pytest
+from sktalk.corpus.audio import WavFile
+from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.utterance import Utterance
+
+
+RATE = 8000
+
+
+def write_wav(path, n_channels=1, sample_width=2, seconds=30):
+    dtype = {1: "u1", 2: "<i2", 4: "<i4"}[sample_width]
+    samples = (np.arange(RATE * seconds * n_channels) % 100).astype(dtype).reshape(-1, n_channels)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(n_channels)
+        f.setsampwidth(sample_width)
+        f.setframerate(RATE)
+        f.writeframes(samples.tobytes())
+    return samples
+
+
+class TestWavFile:
+    @pytest.mark.parametrize("n_channels, sample_width", [(1, 2), (2, 2), (1, 1), (2, 4)])
+    def test_segment(self, tmp_path, n_channels, sample_width):
+        samples = write_wav(tmp_path / "audio.wav", n_channels, sample_width, seconds=3)
+        wav = WavFile(tmp_path / "audio.wav")
+        assert (wav.sample_rate, wav.n_channels, wav.n_frames) == (RATE, n_channels, 3 * RATE)
+        assert wav.duration == 3000
+        segment = wav.segment(1000, 1500)
+        assert isinstance(segment.base, np.memmap) or isinstance(segment, np.memmap)
+        np.testing.assert_array_equal(segment, samples[RATE:RATE * 3 // 2])
+        # segments are cut off at the end of the recording
+        assert len(wav.segment(2500, 4000)) == RATE // 2
+
+    def test_not_a_wav(self):
+        with pytest.raises(ValueError, match="not a WAV file"):
+            WavFile("tests/testdata/file01.cha")
+
+    def test_get_audio(self, tmp_path):
+        samples = write_wav(tmp_path / "audio.wav", seconds=3)
+        assert Utterance("no timing").get_audio(tmp_path / "audio.wav") is None
+        audio = Utterance("timing", time=[500, 1000]).get_audio(tmp_path / "audio.wav")
+        np.testing.assert_array_equal(audio, samples[RATE // 2:RATE])
+
+
+class TestConversationAudio:
+    def test_eaf(self, tmp_path):
+        shutil.copy("tests/testdata/file02.eaf", tmp_path / "file02.eaf")
+        convo = Conversation.from_eaf(str(tmp_path / "file02.eaf"))
+        with pytest.raises(FileNotFoundError, match="file.wav"):
+            convo.media_path()
+        samples = write_wav(tmp_path / "file.wav")
+        assert convo.media_path() == tmp_path / "file.wav"
+        segments = convo.audio_segments()
+        assert len(segments) == len(convo)
+        begin, end = (t * RATE // 1000 for t in convo[0].time)
+        np.testing.assert_array_equal(segments[0], samples[begin:end])
+
+    def test_cha(self, tmp_path):
+        shutil.copy("tests/testdata/file01.cha", tmp_path / "file01.cha")
+        write_wav(tmp_path / "01.wav")
+        convo = Conversation.from_cha(str(tmp_path / "file01.cha"))
+        assert convo.media_path() == tmp_path / "01.wav"
+        segments = convo.audio_segments(WavFile(tmp_path / "01.wav"))
+        assert [s is None for s in segments] == [u.time is None for u in convo]
+        assert all(len(s) == round((u.time[1] - u.time[0]) * RATE / 1000)
+                   for s, u in zip(segments, convo) if u.time and u.time[1] <= 30000)
@@ -0,0 +1,81 @@
+import pickle
+import pytest
+from sktalk.corpus.columnar import pack_numbers
+from sktalk.corpus.columnar import pack_strings
+from sktalk.corpus.columnar import pack_utterances
+from sktalk.corpus.columnar import unpack_numbers
+from sktalk.corpus.columnar import unpack_strings
+from sktalk.corpus.columnar import unpack_utterances
+from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.lazy import LazyCorpus
+from sktalk.corpus.utterance import Utterance
+
+
+class TestColumnar:
+    @pytest.mark.parametrize("values", [
+        ["a", None, "", "上学 去"],
+        [],
+        [None]
+    ])
+    def test_strings(self, values):
+        assert unpack_strings(pack_strings(values)) == values
+
+    @pytest.mark.parametrize("values", [
+        [1, None, -300, 70000],
+        [1.5, 2],
+        [],
+        [None, None]
+    ])
+    def test_numbers(self, values):
+        assert unpack_numbers(pack_numbers(values)) == values
+
+    def test_utterances(self, convo_fto):
+        convo_fto.calculate_FTO()
+        utterances = convo_fto.utterances + [
+            Utterance("with metadata", metadata={"gesture": "nod"}),
+            Utterance("custom list", utterance_list=["custom", "list", "!"]),
+        ]
+        unpacked = unpack_utterances(pack_utterances(utterances))
+        assert unpacked == utterances
+        assert [u.asdict() for u in unpacked] == [u.asdict() for u in utterances]
+
+
+class TestPickle:
+    @pytest.mark.parametrize("protocol", [2, 4, 5])
+    def test_conversation(self, convo, protocol):
+        convo.calculate_FTO()
+        convo.utterance_df  # noqa: pointless-statement
+        convo_in = pickle.loads(pickle.dumps(convo, protocol=protocol))
+        assert isinstance(convo_in, Conversation)
+        assert convo_in.utterances == convo.utterances
+        assert convo_in.metadata == convo.metadata
+        # cached dataframes are not pickled
+        assert convo_in._utterance_df is None  # noqa: W0212
+
+    def test_out_of_band(self, convo):
+        buffers = []
+        data = pickle.dumps(convo, protocol=5, buffer_callback=buffers.append)
+        assert buffers
+        convo_in = pickle.loads(data, buffers=buffers)
+        assert convo_in.utterances == convo.utterances
+
+    def test_compact(self, convo):
+        large_convo = Conversation([Utterance(u.utterance_raw, participant=u.participant, time=u.time)
+                                    for u in convo.utterances * 100])
+        assert len(pickle.dumps(large_convo)) < len(pickle.dumps(large_convo.utterances))
+
+    def test_corpus(self, my_corpus_with_convo):
+        my_corpus_with_convo.search("utterance")
+        corpus_in = pickle.loads(pickle.dumps(my_corpus_with_convo))
+        assert corpus_in.metadata == my_corpus_with_convo.metadata
+        assert [c.utterances for c in corpus_in.conversations] == \
+            [c.utterances for c in my_corpus_with_convo.conversations]
+        assert corpus_in._index is None  # noqa: W0212
+
+    def test_lazy_corpus(self, convo, tmp_path):
+        convo.write_json(tmp_path / "convo.json")
+        corpus = LazyCorpus([str(tmp_path / "convo.json")])
+        corpus.conversations[0]  # noqa: pointless-statement
+        corpus_in = pickle.loads(pickle.dumps(corpus))
+        assert not corpus_in.conversations._cache  # noqa: W0212
+        assert corpus_in.conversations[0].utterances == convo.utterances
@@ -1,6 +1,10 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext as does_not_raise
+import numpy as np
 import pytest
 from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.utterance import Utterance
 
 
 class TestConversation:
@@ -38,10 +42,56 @@ class TestConversation:
         with pytest.raises(TypeError, match="cannot be imported as a Conversation"):
             Conversation.from_json("tests/testdata/dummy_corpus.json")
 
+    def test_from_records(self, convo_utts, convo_meta):
+        records = [{"utterance": u.utterance_raw, "participant": u.participant, "time": u.time}
+                   for u in convo_utts]
+        records[0] = {"utterance": "X0 utterance A", "participant": "A", "begin": 0, "end": 1000}
+        convo = Conversation.from_records(records, convo_meta)
+        assert convo.utterances == convo_utts
+        assert convo.metadata == convo_meta
+
     def test_conversation_properties(self, convo):
         assert convo.participants == {"A", "B", "C", None}
         assert len(convo) == 10
 
+    def test_participant_counts(self, convo):
+        assert convo.participant_counts == {"A": 3, "B": 4, "C": 2, None: 1}
+        convo.remove(participant="C")
+        # the cached counts are reset when utterances are removed
+        assert convo.participant_counts == {"A": 3, "B": 4, None: 1}
+        assert convo.participants == {"A", "B", None}
+
+    def test_sequence_protocol(self, convo):
+        assert convo[0] is convo.utterances[0]
+        assert convo[-1] is convo.utterances[-1]
+        assert list(convo) == convo.utterances
+        sliced = convo[2:5]
+        assert isinstance(sliced, Conversation)
+        assert len(sliced) == 3
+        assert sliced[0] is convo.utterances[2]
+        with pytest.raises(IndexError):
+            convo[10]  # noqa pointless-statement
+
+    def test_get_utterance(self):
+        convo = Conversation.from_cha("tests/testdata/file01.cha")
+        # parsers identify utterances by position
+        assert [u.utterance_id for u in convo] == [f"u{i}" for i in range(len(convo))]
+        assert convo.get_utterance("u3") is convo[3]
+        # identifiers are kept in sub-conversations
+        assert convo[2:5].get_utterance("u3") is convo[3]
+        convo.remove(participant="MS. A")
+        with pytest.raises(KeyError, match="u0"):
+            convo.get_utterance("u0")
+
+    def test_utterance_ids(self, convo_utts):
+        convo_utts[1].utterance_id = "first"
+        convo = Conversation(convo_utts)
+        # utterances passed to a conversation are not changed
+        assert [u.utterance_id for u in convo_utts] == [None, "first"] + [None] * 8
+        assert convo.get_utterance("first") is convo_utts[1]
+        with pytest.raises(KeyError):
+            convo.get_utterance(None)
+
     def test_conversation_selection(self, convo):
         selected_convo = convo.select(participant="A")
         assert selected_convo.participants == {"A"}
@@ -69,6 +119,22 @@ class TestConversation:
         convo.remove(time=None)
         assert len(convo) == 6
 
+    def test_copy_on_write(self, convo_utts, convo_meta):
+        shared = Conversation(convo_utts, convo_meta)
+        convo = Conversation(convo_utts, convo_meta, copy_on_write=True)
+        convo.calculate_FTO()
+        assert [u.FTO for u in convo_utts] == [None] * len(convo_utts)
+        assert [u.FTO for u in shared.utterances] == [None] * len(convo_utts)
+        assert convo.utterances[1].FTO == -100
+        assert "Calculations" in convo.metadata
+        assert "Calculations" not in shared.metadata
+        assert pickle.loads(pickle.dumps(convo))._copy_on_write  # noqa: W0212
+
+    def test_concurrent_caches(self, convo):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            dfs = list(executor.map(lambda _: convo.utterance_df, range(32)))
+        assert all(df is dfs[0] for df in dfs)
+
 
 class TestConversationMetrics:
     @pytest.mark.parametrize("args, error",
@@ -169,3 +235,103 @@ class TestConversationMetrics:
 
         # utterance fto is calculated correctly
         assert convo_fto.utterances[index].FTO == expected_fto
+
+    def test_transitions(self, convo):
+        transitions = convo.transitions()
+        assert len(transitions) == len(convo) - 1
+        assert list(transitions["source"].unique()) == ["file.cha"]
+        # vectorised results correspond to the pairwise utterance methods
+        for row in transitions.itertuples():
+            utterance = convo.utterances[row.index]
+            prior = convo.utterances[row.prior_index]
+            expected_duration = utterance.overlap_duration(prior)
+            if expected_duration is None:
+                assert np.isnan(row.overlap_duration)
+                assert np.isnan(row.offset)
+            else:
+                assert row.overlap_duration == expected_duration
+                assert row.overlap_percentage == pytest.approx(utterance.overlap_percentage(prior))
+                assert row.offset == prior.until(utterance)
+        assert list(transitions["transition"]) == [
+            "overlap", "overlap", "overlap", "gap", "gap", "overlap", None, None, "overlap"]
+        assert transitions["same_speaker"].isna().sum() == 2
+
+    def test_transitions_pause(self, convo):
+        convo.remove(participant="C")
+        convo.remove(participant=None)
+        transitions = convo.transitions()
+        # B (5000 - 8000) is followed by B (9000 - 12500)
+        assert transitions["transition"].iloc[-1] == "pause"
+        assert transitions["offset"].iloc[-1] == 1000
+
+    def test_to_turns_alternating(self, convo):
+        # without consecutive utterances by the same participant, every utterance is a turn
+        turns = convo.to_turns()
+        assert [u.time for u in turns.utterances] == [u.time for u in convo.utterances]
+        assert [u.utterance for u in turns.utterances] == [u.utterance for u in convo.utterances]
+        assert turns.metadata == convo.metadata
+
+    @pytest.mark.parametrize("max_gap, expected_texts, expected_times", [
+        (None, ["utt X0 - A", "utt X1 - B utt X2 - B utt X3 - B utt X4 - B"], [[0, 1000], [200, 1500]]),
+        (100, ["utt X0 - A", "utt X1 - B utt X2 - B utt X3 - B", "utt X4 - B"],
+         [[0, 1000], [200, 900], [1100, 1500]]),
+    ])
+    def test_to_turns_merge(self, convo_fto, max_gap, expected_texts, expected_times):
+        convo_fto.calculate_FTO()
+        turns = convo_fto.to_turns(max_gap=max_gap)
+        first_turns = turns.utterances[:len(expected_texts)]
+        assert [u.utterance_raw for u in first_turns] == expected_texts
+        assert [u.time for u in first_turns] == expected_times
+        # utterances without timing or participant are kept separately
+        assert "utt X5 - A" in [u.utterance_raw for u in turns.utterances]
+        assert "utt X8 - None" in [u.utterance_raw for u in turns.utterances]
+        # calculations do not apply to the turns
+        assert "Calculations" not in turns.metadata
+        # the original conversation is unchanged
+        assert len(convo_fto) == 12
+
+    def test_to_turns_nested(self):
+        # a short utterance within a long one by the same participant does not split the turn
+        convo = Conversation([Utterance("long", participant="A", time=[0, 5000]),
+                              Utterance("short", participant="A", time=[1000, 1200]),
+                              Utterance("after", participant="A", time=[5050, 6000]),
+                              Utterance("other", participant="B", time=[6100, 7000]),
+                              Utterance("later", participant="B", time=[9000, 9500])])
+        turns = convo.to_turns(max_gap=100)
+        assert [u.utterance_raw for u in turns] == ["long short after", "other", "later"]
+        assert [u.time for u in turns] == [[0, 6000], [6100, 7000], [9000, 9500]]
+
+    @pytest.fixture
+    def convo_activity(self):
+        return Conversation([Utterance("a", participant="A", time=[0, 25]),
+                             Utterance("b", participant="A", time=[20, 31]),
+                             Utterance("c", participant="B", time=[45, 50]),
+                             Utterance("d", participant="B", time=None),
+                             Utterance("e", participant=None, time=[6, 7]),
+                             Utterance("f", participant="A", time=[52, 70])])
+
+    def test_activity_matrix(self, convo_activity):
+        matrix, participants = convo_activity.activity_matrix(bin_ms=10)
+        assert participants == ["A", "B"]
+        assert matrix.dtype == bool
+        assert matrix.astype(int).tolist() == [[1, 1, 1, 1, 0, 1, 1],
+                                               [0, 0, 0, 0, 1, 0, 0]]
+
+    def test_activity_matrix_fraction(self, convo_activity):
+        matrix, _ = convo_activity.activity_matrix(bin_ms=10, fraction=True)
+        np.testing.assert_allclose(matrix, [[1, 1, 1, 0.1, 0, 0.8, 1],
+                                            [0, 0, 0, 0, 0.5, 0, 0]])
+
+    def test_activity_matrix_run_length(self, convo_activity):
+        runs, participants = convo_activity.activity_matrix(bin_ms=10, run_length=True)
+        assert participants == ["A", "B"]
+        assert runs["A"].tolist() == [[0, 4], [5, 7]]
+        assert runs["B"].tolist() == [[4, 5]]
+        with pytest.raises(ValueError):
+            convo_activity.activity_matrix(fraction=True, run_length=True)
+
+    def test_activity_matrix_empty(self, empty_convo):
+        matrix, participants = empty_convo.activity_matrix()
+        assert matrix.shape == (0, 0)
+        assert not participants
+        assert empty_convo.activity_matrix(run_length=True) == ({}, [])
@@ -2,6 +2,7 @@ import json
 import os
 from contextlib import nullcontext as does_not_raise
 import pytest
+from sktalk.corpus.conversation import Conversation
 from sktalk.corpus.corpus import Corpus
 
 
@@ -72,3 +73,122 @@ class TestCorpus():
             Corpus.from_json("tests/testdata/dummy_conversation.json")
 
         # assert json_in.utterances[0].utterance == "Hello world"
+
+    def test_transitions(self, my_corpus_with_convo):
+        transitions = my_corpus_with_convo.transitions()
+        assert len(transitions) == 18
+        assert list(transitions.index) == list(range(18))
+
+    def test_transitions_empty(self, my_corpus):
+        transitions = my_corpus.transitions()
+        assert transitions.empty
+        assert "offset" in transitions.columns
+
+    def test_activity_matrices(self, my_corpus_with_convo):
+        activity = my_corpus_with_convo.activity_matrices(bin_ms=100)
+        source, matrix, participants = next(activity)
+        assert source == "file.cha"
+        assert participants == ["A", "B", "C"]
+        assert matrix.shape == (3, 130)
+        assert len(list(activity)) == 1
+
+    def test_add(self, my_corpus_with_convo, convo):
+        other = Corpus([convo], language="Dutch", importer="John Doe")
+        combined = my_corpus_with_convo + other
+        assert isinstance(combined, Corpus)
+        assert len(combined.conversations) == 3
+        # conversations are shared, not copied
+        assert all(c is convo for c in combined.conversations)
+        assert combined.metadata == {"language": ["French", "Dutch"],
+                                     "importer": "John Doe",
+                                     "collections": ["IADV", "Callosum"]}
+        # the original corpora are unchanged
+        assert len(my_corpus_with_convo.conversations) == 2
+        with pytest.raises(TypeError):
+            my_corpus_with_convo + convo  # noqa pointless-statement
+
+    def test_merge_metadata(self):
+        a, b, c = Corpus(key="a", tags=["x"]), Corpus(key="b", tags=["x", "y"]), Corpus(key="c", other=1)
+        assert ((a + b) + c).metadata == (a + (b + c)).metadata == {"key": ["a", "b", "c"],
+                                                                    "tags": ["x", "y"],
+                                                                    "other": 1}
+        # a list value remains a list, also without conflicts
+        assert (a + a).metadata == {"key": "a", "tags": ["x"]}
+
+    def test_concat(self, my_corpus_with_convo, convo):
+        expected = my_corpus_with_convo.utterance_df
+        combined = Corpus.concat([my_corpus_with_convo, Corpus([convo])], language="mixed")
+        assert combined.metadata["language"] == "mixed"
+        # the cached dataframe is reused, and extended when it is used
+        assert combined._utterance_df_parts  # noqa: W0212
+        assert Corpus.concat([my_corpus_with_convo]).utterance_df is not expected
+        assert len(combined.utterance_df) == len(expected) + len(convo)
+
+    def test_extend_caches(self, my_corpus_with_convo, convo):
+        utterance_df = my_corpus_with_convo.utterance_df
+        metadata_df = my_corpus_with_convo.metadata_df
+        my_corpus_with_convo.extend([convo, convo])
+        assert len(my_corpus_with_convo.conversations) == 4
+        assert len(my_corpus_with_convo.utterance_df) == 2 * len(utterance_df)
+        assert len(my_corpus_with_convo.metadata_df) == 2 * len(metadata_df)
+        rebuilt = Corpus(list(my_corpus_with_convo.conversations), **my_corpus_with_convo.metadata)
+        assert my_corpus_with_convo.utterance_df.equals(rebuilt.utterance_df)
+        assert my_corpus_with_convo.metadata_df.equals(rebuilt.metadata_df)
+        with pytest.raises(TypeError, match="type Conversation"):
+            my_corpus_with_convo.extend([convo, "Not A Conversation"])
+
+    def test_extend_repeatedly(self, my_corpus_with_convo, convo):
+        expected = my_corpus_with_convo.utterance_df
+        for _ in range(3):
+            my_corpus_with_convo += Corpus([convo])
+        # the cached dataframe is not copied on every addition, but once when it is used
+        assert my_corpus_with_convo._utterance_df_parts[0] is expected  # noqa: W0212
+        assert len(my_corpus_with_convo._utterance_df_parts) == 4  # noqa: W0212
+        rebuilt = Corpus(list(my_corpus_with_convo.conversations))
+        assert my_corpus_with_convo.utterance_df.equals(rebuilt.utterance_df)
+        assert not my_corpus_with_convo._utterance_df_parts  # noqa: W0212
+
+    def test_lookup(self, my_corpus_with_convo, convo):
+        other = Conversation(convo.utterances[:2], {"source": "other.cha"})
+        assert my_corpus_with_convo.source_index == {"file.cha": [0, 1]}
+        my_corpus_with_convo.append(other)
+        assert my_corpus_with_convo.get_conversation("other.cha") is other
+        assert my_corpus_with_convo.get_conversation("file.cha") is convo
+        assert my_corpus_with_convo.conversations_with("C") == [convo, convo]
+        assert my_corpus_with_convo.participant_index["A"] == {0: 3, 1: 3, 2: 1}
+        with pytest.raises(KeyError, match="No conversation with source"):
+            my_corpus_with_convo.get_conversation("missing.cha")
+
+    def test_remove(self, my_corpus_with_convo, convo):
+        other = Conversation(convo.utterances[:2], {"source": "other.cha"})
+        my_corpus_with_convo.append(other)
+        assert len(my_corpus_with_convo.utterance_df) == 22
+        my_corpus_with_convo.remove("file.cha")
+        assert my_corpus_with_convo.conversations == [other]
+        assert my_corpus_with_convo.source_index == {"other.cha": [0]}
+        assert my_corpus_with_convo.participant_index == {"A": {0: 1}, "B": {0: 1}}
+        assert my_corpus_with_convo.conversations_with("C") == []
+        assert my_corpus_with_convo.utterance_df["source"].tolist() == ["other.cha", "other.cha"]
+        with pytest.raises(KeyError, match="No conversation with source"):
+            my_corpus_with_convo.remove("file.cha")
+
+    def test_map(self, my_corpus_with_convo, convo):
+        my_corpus_with_convo.append(Conversation(convo.utterances[:5], {"source": "other"}))
+        assert my_corpus_with_convo.map(len, workers=2) == [10, 10, 5]
+        sources = my_corpus_with_convo.map(lambda c: c.utterance_df["source"].iloc[0])
+        assert sources == ["file.cha", "file.cha", "other"]
+
+    @pytest.mark.parametrize("path", ["corpus.json", "corpus.json.gz"])
+    def test_from_json_selection(self, my_corpus_with_convo, convo_fto, tmp_path, path):
+        my_corpus_with_convo.append(Conversation(convo_fto.utterances, convo_fto.metadata | {"source": "other.cha"}))
+        my_corpus_with_convo.write_json(tmp_path / path)
+        corpus = Corpus.from_json(tmp_path / path, sources=["other.cha"])
+        assert [c.metadata["source"] for c in corpus.conversations] == ["other.cha"]
+        assert corpus.conversations[0].asdict() == my_corpus_with_convo.conversations[2].asdict()
+        corpus = Corpus.from_json(tmp_path / path, fields=["participant", "time"])
+        assert len(corpus.conversations) == 3
+        utterance = corpus.conversations[0].utterances[0]
+        assert utterance.time == [0, 1000]
+        assert utterance.utterance == "X0 utterance A"
+        assert utterance.FTO is None
+        assert corpus.metadata == Corpus.from_json(tmp_path / path).metadata
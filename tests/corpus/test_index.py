@@ -0,0 +1,82 @@
+import pytest
+from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.corpus import Corpus
+from sktalk.corpus.index import TextIndex
+from sktalk.corpus.utterance import Utterance
+
+
+@pytest.fixture
+def search_corpus(convo):
+    other = Conversation([Utterance("Hello world", participant="A"),
+                          Utterance("the world is big, hello", participant="B"),
+                          Utterance("Helicopters are loud", participant="A")],
+                         {"source": "other.cha"})
+    return Corpus([convo, other])
+
+
+class TestTextIndex:
+    @pytest.mark.parametrize("query, expected", [
+        ("hello", [(1, 0), (1, 1)]),
+        ("HELLO", [(1, 0), (1, 1)]),
+        ("hello world", [(1, 0)]),
+        ("world hello", []),
+        ("world is", [(1, 1)]),
+        ("hel*", [(1, 0), (1, 1), (1, 2)]),
+        ("helic*", [(1, 2)]),
+        ("the wor*", [(1, 1)]),
+        ("utterance", [(0, i) for i in range(10)]),
+        ("X6", [(0, 6)]),
+        ("nonexistent", []),
+        ("", [])
+    ])
+    def test_search(self, search_corpus, query, expected):
+        assert search_corpus.search(query) == expected
+
+    def test_append(self, search_corpus):
+        search_corpus.build_index()
+        search_corpus.append(Conversation([Utterance("hello again")]))
+        assert len(search_corpus.index) == 3
+        assert search_corpus.search("hello") == [(1, 0), (1, 1), (2, 0)]
+        assert search_corpus.index.matches(search_corpus.conversations)
+
+    def test_remove(self, search_corpus, convo):
+        search_corpus.append(Conversation([Utterance("hello again")], {"source": "third.cha"}))
+        search_corpus.build_index()
+        search_corpus.remove("other.cha")
+        assert search_corpus.search("hello") == [(1, 0)]
+        assert search_corpus.search("hel*") == [(1, 0)]
+        assert search_corpus.search("utterance") == [(0, i) for i in range(10)]
+        assert "helicopters" not in search_corpus.index.vocabulary
+        assert search_corpus.index.matches(search_corpus.conversations)
+
+    def test_persist(self, search_corpus, tmp_path):
+        path = tmp_path / "corpus.json"
+        search_corpus.search("hello")
+        search_corpus.write_json(path)
+        assert (tmp_path / "corpus_index.json").exists()
+        corpus_in = Corpus.from_json(path)
+        assert corpus_in._index is not None  # noqa: W0212
+        assert corpus_in.search("hel*") == search_corpus.search("hel*")
+
+    def test_persist_outdated(self, search_corpus, tmp_path):
+        path = tmp_path / "corpus.json"
+        index = TextIndex.from_conversations(search_corpus.conversations[:1])
+        index.write_json(tmp_path / "corpus_index.json")
+        search_corpus.write_json(path)
+        corpus_in = Corpus.from_json(path)
+        # the outdated index is not used
+        assert corpus_in._index is None  # noqa: W0212
+        assert corpus_in.search("hello") == [(1, 0), (1, 1)]
+
+    def test_remove_persisted(self, search_corpus, tmp_path):
+        # conversations keep their identifiers in the index when earlier conversations are removed
+        search_corpus.append(Conversation([Utterance("hello again")], {"source": "third.cha"}))
+        search_corpus.build_index()
+        search_corpus.remove("file.cha")
+        search_corpus.index.write_json(tmp_path / "index.json")
+        index = TextIndex.from_json(tmp_path / "index.json")
+        assert index.search("hello", search_corpus.conversations) == [(0, 0), (0, 1), (1, 0)]
+        index.remove(0)
+        index.add(Conversation([Utterance("hello there")]))
+        assert index.search("hello", None) == [(0, 0), (1, 0)]
+        assert index.vocabulary == ["again", "hello", "there"]
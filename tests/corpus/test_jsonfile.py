@@ -0,0 +1,80 @@
+import json
+import pytest
+from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.corpus import Corpus
+from sktalk.corpus.jsonfile import dumps
+from sktalk.corpus.jsonfile import iter_items
+from sktalk.corpus.jsonfile import json_path
+from sktalk.corpus.jsonfile import open_json
+from sktalk.corpus.jsonfile import sidecar_path
+
+
+class TestJsonFile:
+    @pytest.mark.parametrize("path, expected, expected_sidecar", [
+        ("file", "file.json", "file_index.json"),
+        ("file.json", "file.json", "file_index.json"),
+        ("file.gz", "file.json.gz", "file_index.json.gz"),
+        ("file.json.xz", "file.json.xz", "file_index.json.xz"),
+    ])
+    def test_paths(self, path, expected, expected_sidecar):
+        assert str(json_path(path)) == expected
+        assert str(sidecar_path(path, "index")) == expected_sidecar
+
+    @pytest.mark.parametrize("indent", [4, 2, None])
+    def test_dumps(self, convo, indent):
+        obj = convo.asdict()
+        assert json.loads(dumps(obj, indent)) == json.loads(json.dumps(obj))
+        if indent is None:
+            assert dumps(obj, indent) == json.dumps(obj, separators=(",", ":"))
+        with pytest.raises(ValueError, match="Unknown JSON backend"):
+            dumps(obj, backend="unknown")
+
+    @pytest.mark.parametrize("suffix", [".json", ".json.gz", ".json.xz"])
+    def test_compressed_roundtrip(self, convo, tmp_path, suffix):
+        path = tmp_path / f"convo{suffix}"
+        convo.write_json(path, indent=None)
+        with open(path, "rb") as f:
+            assert f.read(1) != b"{" or suffix == ".json"
+        assert Conversation.from_json(path).asdict() == convo.asdict()
+
+    @pytest.mark.parametrize("indent", [4, 2, None])
+    def test_corpus_streaming(self, my_corpus_with_convo, tmp_path, indent):
+        path = tmp_path / "corpus.json.gz"
+        my_corpus_with_convo.build_index()
+        my_corpus_with_convo.write_json(path, indent=indent)
+        with open_json(path) as f:
+            assert f.read() == dumps(my_corpus_with_convo.asdict(), indent)
+        assert (tmp_path / "corpus_index.json.gz").exists()
+        corpus = Corpus.from_json(path)
+        assert corpus.index.vocabulary == my_corpus_with_convo.index.vocabulary
+
+    @pytest.mark.parametrize("indent", [None, 2, 4])
+    def test_orjson(self, my_corpus_with_convo, tmp_path, indent):
+        pytest.importorskip("orjson")
+        path = tmp_path / "corpus.json"
+        my_corpus_with_convo.write_json(path, indent=indent, backend="orjson")
+        with open_json(path) as f:
+            assert f.read() == dumps(my_corpus_with_convo.asdict(), indent=indent)
+        corpus = Corpus.from_json(path, backend="orjson")
+        assert len(corpus.conversations) == 2
+
+    def test_orjson_default(self, my_corpus_with_convo, tmp_path):
+        pytest.importorskip("orjson")
+        my_corpus_with_convo.write_json(tmp_path / "orjson.json", backend="orjson")
+        my_corpus_with_convo.write_json(tmp_path / "json.json")
+        assert (tmp_path / "orjson.json").read_text() == (tmp_path / "json.json").read_text()
+
+    @pytest.mark.parametrize("chunksize", [1, 16, 1 << 20])
+    def test_iter_items(self, chunksize):
+        path = "tests/testdata/dummy_corpus.json"
+        with open(path, encoding="utf-8") as f:
+            expected = json.load(f)
+        items = list(iter_items(path, chunksize=chunksize))
+        assert [key for key, _ in items] == ["type", "date", "Conversations", "Conversations"]
+        assert [value for _, value in items[2:]] == expected["Conversations"]
+
+    def test_iter_items_invalid(self, tmp_path):
+        path = tmp_path / "invalid.json"
+        path.write_text('{"Conversations": [{"source": "a"}', encoding="utf-8")
+        with pytest.raises(ValueError, match="end of JSON"):
+            list(iter_items(path))
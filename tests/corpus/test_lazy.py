@@ -0,0 +1,86 @@
+import io
+import json
+import pytest
+from sktalk.corpus.lazy import ConversationSequence
+from sktalk.corpus.lazy import LazyCorpus
+
+
+class TestConversationSequence:
+    def test_cache(self, conversation_files):
+        sequence = ConversationSequence(conversation_files, max_cached=2)
+        assert len(sequence) == 3
+        first = sequence[0]
+        assert first.metadata["source"] == "convo0"
+        # cached conversations are not parsed again
+        assert sequence[0] is first
+        assert sequence[-1].metadata["source"] == "convo2"
+        sequence[1]  # noqa: pointless-statement
+        # least recently used conversation is removed from the cache
+        assert sequence[0] is not first
+        assert [c.metadata["source"] for c in sequence[1:]] == ["convo1", "convo2"]
+
+    def test_append(self, convo, conversation_files):
+        sequence = ConversationSequence(conversation_files[:1])
+        sequence.append(convo)
+        assert sequence[1] is convo
+        with pytest.raises(TypeError, match="type Conversation"):
+            sequence.append("file.txt")
+
+
+class TestLazyCorpus:
+    def test_conversations(self, conversation_files):
+        corpus = LazyCorpus(conversation_files, max_cached=1, language="eng")
+        assert len(corpus.conversations) == 3
+        assert [len(c) for c in corpus.conversations] == [10, 9, 8]
+        assert len(corpus.utterance_df) == 27
+        assert len(corpus.metadata_df) == 3
+        assert corpus.search("X2") == [(0, 2), (1, 1), (2, 0)]
+
+    def test_from_directory(self, conversation_files, tmp_path):
+        corpus = LazyCorpus.from_directory(tmp_path, "*.json")
+        assert corpus.conversations.references == conversation_files
+
+    def test_add(self, convo, conversation_files):
+        combined = LazyCorpus(conversation_files[:2]) + LazyCorpus(conversation_files[2:] + [convo])
+        assert isinstance(combined, LazyCorpus)
+        assert combined.conversations.references == conversation_files + [convo]
+
+    def test_remove(self, conversation_files):
+        corpus = LazyCorpus(conversation_files, max_cached=3)
+        third = corpus.conversations[2]
+        assert corpus.get_conversation("convo1").metadata["source"] == "convo1"
+        corpus.remove("convo1")
+        assert corpus.conversations.references == [conversation_files[0], conversation_files[2]]
+        # cached conversations keep their place
+        assert corpus.conversations[1] is third
+        assert corpus.source_index == {"convo0": [0], "convo2": [1]}
+        assert corpus._participants is None  # noqa: W0212
+
+    def test_source_index(self, convo, monkeypatch):
+        # the source of CHAT and ELAN files is their path, so they are not parsed to find it
+        monkeypatch.setitem(ConversationSequence.PARSERS, ".cha", pytest.fail)
+        corpus = LazyCorpus(["a.cha", "b.cha", convo, "c.cha"])
+        assert corpus.source_index == {"a.cha": [0], "b.cha": [1], "file.cha": [2], "c.cha": [3]}
+        corpus.append("d.cha")
+        corpus.remove("b.cha")
+        assert corpus.source_index == {"a.cha": [0], "file.cha": [1], "c.cha": [2], "d.cha": [3]}
+        assert corpus.get_conversation("file.cha") is convo
+
+    def test_calculate_FTO(self, convo, conversation_files):
+        corpus = LazyCorpus(conversation_files, max_cached=1)
+        corpus.append(convo)
+        corpus.calculate_FTO(window=5000)
+        assert convo.metadata["Calculations"]["FTO"]["window"] == 5000
+        for conversation in corpus.conversations:
+            assert conversation.metadata["Calculations"]["FTO"]["window"] == 5000
+
+    def test_write_json(self, conversation_files, tmp_path):
+        corpus = LazyCorpus(conversation_files, max_cached=1, language="eng")
+        corpus.write_json(tmp_path / "corpus.json")
+        with open(tmp_path / "corpus.json", encoding="utf-8") as f:
+            corpus_read = json.load(f)
+        assert corpus_read == corpus.asdict()
+        # output is identical to writing the full dictionary at once
+        file = io.StringIO()
+        corpus._dump_json(file)  # noqa: W0212
+        assert file.getvalue() == json.dumps(corpus.asdict(), indent=4)
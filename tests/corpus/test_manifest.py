@@ -0,0 +1,65 @@
+import json
+import os
+import shutil
+import pytest
+from sktalk.corpus.lazy import LazyCorpus
+from sktalk.corpus.manifest import Manifest
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source"
+    os.makedirs(path / "site")
+    shutil.copy("tests/testdata/file01.cha", path / "site" / "a.cha")
+    shutil.copy("tests/testdata/file01.cha", path / "b.cha")
+    return path
+
+
+def build(source, output, capsys, **calculation):
+    corpus = LazyCorpus.build(source, output, "**/*.cha", {"calculate_FTO": calculation})
+    return corpus, capsys.readouterr().out.strip()
+
+
+class TestManifest:
+    def test_build(self, source, tmp_path, capsys):
+        output = tmp_path / "corpus"
+        corpus, message = build(source, output, capsys, window=5000)
+        assert message.endswith("2 of 2 conversations rebuilt, 0 removed")
+        assert corpus.conversations.references == [str(output / "b.cha.json"), str(output / "site" / "a.cha.json")]
+        assert corpus.conversations[0].metadata["Calculations"]["FTO"]["window"] == 5000
+        with open(output / Manifest.FILENAME, encoding="utf-8") as f:
+            manifest = json.load(f)
+        assert manifest["files"]["site/a.cha"]["calculations"] == [["calculate_FTO", {"window": 5000}]]
+
+    def test_rebuild(self, source, tmp_path, capsys):
+        output = tmp_path / "corpus"
+        build(source, output, capsys, window=5000)
+        _, message = build(source, output, capsys, window=5000)
+        assert message.endswith("0 of 2 conversations rebuilt, 0 removed")
+        # touched files are not rebuilt
+        os.utime(source / "b.cha")
+        _, message = build(source, output, capsys, window=5000)
+        assert message.endswith("0 of 2 conversations rebuilt, 0 removed")
+        with open(source / "b.cha", "a", encoding="utf-8") as f:
+            f.write("*A:\tone more .\n")
+        _, message = build(source, output, capsys, window=5000)
+        assert message.endswith("1 of 2 conversations rebuilt, 0 removed")
+        _, message = build(source, output, capsys, window=2000)
+        assert message.endswith("2 of 2 conversations rebuilt, 0 removed")
+
+    def test_removed_and_new(self, source, tmp_path, capsys):
+        output = tmp_path / "corpus"
+        build(source, output, capsys)
+        os.remove(source / "b.cha")
+        shutil.copy("tests/testdata/file01.cha", source / "c.cha")
+        corpus, message = build(source, output, capsys)
+        assert message.endswith("1 of 2 conversations rebuilt, 1 removed")
+        assert not (output / "b.cha.json").exists()
+        assert len(corpus.conversations) == 2
+
+    def test_parser_version(self, source, tmp_path, capsys, monkeypatch):
+        output = tmp_path / "corpus"
+        build(source, output, capsys)
+        monkeypatch.setattr(Manifest, "PARSER_VERSION", Manifest.PARSER_VERSION + 1)
+        _, message = build(source, output, capsys)
+        assert message.endswith("2 of 2 conversations rebuilt, 0 removed")
@@ -0,0 +1,90 @@
+import pytest
+from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.corpus import Corpus
+from sktalk.corpus.parsing.parser import InputFile
+from sktalk.corpus.query import Query
+
+
+@pytest.fixture
+def convo(convo_utts, convo_meta):
+    # utterances identified by position, as by the parsers
+    return Conversation(InputFile._assign_ids(convo_utts), convo_meta)  # noqa: W0212
+
+
+class TestQuery:
+    @pytest.mark.parametrize("expr, expected", [
+        ("participant == 'A'", [0, 2, 4]),
+        ("participant in {'A', 'C'}", [0, 2, 4, 6, 9]),
+        ("participant not in ['A', 'B', 'C']", [7]),
+        ("participant is None", [7]),
+        ("participant != 'B'", [0, 2, 4, 6, 9]),
+        ("begin >= 5000", [5, 6, 8, 9]),
+        ("begin between 1000 and 5000", [2, 3, 4, 5]),
+        ("1000 <= begin < 5000", [2, 3, 4]),
+        ("end - begin > 2500", [1, 2, 5, 8]),
+        ("duration > 2500 and not participant == 'B'", [2]),
+        ("begin >= 12000 or utterance_id == 'u0'", [0, 9]),
+        ("begin is None", [7]),
+        ("begin != 0", [1, 2, 3, 4, 5, 6, 8, 9]),
+        ("n_words == 3", list(range(10))),
+        ("index between -1 and 1", [0, 1]),
+        ("begin between 0 and 1000 + 500", [0, 1, 2, 3]),
+        ("begin between (0) and 10", [0]),
+        ("not end - begin between 1000 and 3000 and participant == 'B'", [3, 8]),
+        ("utterance == 'X0 between 1 and 2'", []),
+        ("True", list(range(10))),
+        ("True and participant == 'A'", [0, 2, 4]),
+        ("participant == 'A' or False", [0, 2, 4]),
+        ("begin > None", []),
+        ("participant != None", []),
+    ])
+    def test_query(self, convo, expr, expected):
+        selected = convo.query(expr)
+        assert isinstance(selected, Conversation)
+        assert [u.utterance_id for u in selected] == [f"u{i}" for i in expected]
+        # the selection shares the utterances and metadata of the conversation
+        assert all(u is convo.get_utterance(u.utterance_id) for u in selected)
+        assert selected.metadata == convo.metadata
+
+    @pytest.mark.parametrize("expr, message", [
+        ("speaker == 'A'", "Unknown column 'speaker'"),
+        ("begin >", "Invalid query"),
+        ("begin between 0", "should be followed by `low and high`"),
+        ("between 0 and 10", "needs a value"),
+        ("len(utterance) > 3", "Call is not supported"),
+        ("begin is 0", "can only be used with None"),
+    ])
+    def test_invalid(self, convo, expr, message):
+        with pytest.raises(ValueError, match=message):
+            convo.query(expr)
+
+    def test_FTO(self, convo_fto):
+        convo_fto.calculate_FTO()
+        query = Query("FTO between -500 and 1000")
+        expected = [u for u in convo_fto if u.FTO is not None and -500 <= u.FTO <= 1000]
+        assert convo_fto.query(query).utterances == expected
+
+    def test_view_calculation(self, convo_fto):
+        # calculations on a view update the shared utterances, and the caches of both conversations
+        view = convo_fto.query("begin is not None")
+        assert len(convo_fto.query("FTO is not None")) == 0
+        view.calculate_FTO()
+        expected = [u for u in convo_fto if u.FTO is not None and u.FTO > 0]
+        assert expected
+        assert view.query("FTO > 0").utterances == expected
+        assert convo_fto.query("FTO > 0").utterances == expected
+        assert convo_fto.utterance_df["FTO"].notna().sum() == len(convo_fto.query("FTO is not None"))
+
+    def test_empty(self, empty_convo):
+        assert len(empty_convo.query("participant == 'A'")) == 0
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_corpus(self, convo, workers):
+        other = Conversation(convo.utterances[:2], {"source": "other.cha"})
+        corpus = Corpus([convo, other], language="eng")
+        selected = corpus.query("participant == 'B' and begin > 1000", workers=workers)
+        assert selected.metadata == {"language": "eng"}
+        # conversations without matching utterances are left out
+        assert [c.metadata["source"] for c in selected.conversations] == ["file.cha"]
+        assert [u.utterance_id for u in selected.conversations[0]] == ["u3", "u5", "u8"]
+        assert len(corpus.query("participant == 'A'", workers=workers).conversations) == 2
@@ -0,0 +1,60 @@
+import sqlite3
+import pytest
+from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.corpus import Corpus
+
+
+@pytest.fixture
+def database(my_corpus_with_convo, convo_fto, tmp_path):
+    my_corpus_with_convo.append(Conversation(convo_fto.utterances, convo_fto.metadata | {"source": "other.cha"}))
+    path = tmp_path / "corpus.db"
+    my_corpus_with_convo.to_sqlite(path)
+    return path
+
+
+class TestSqlite:
+    def test_roundtrip(self, my_corpus_with_convo, database):
+        corpus = Corpus.from_sqlite(database)
+        assert corpus.asdict() == my_corpus_with_convo.asdict()
+
+    def test_empty_conversation(self, my_corpus_with_convo, tmp_path):
+        my_corpus_with_convo.append(Conversation([], {"source": "empty.cha"}, suppress_warnings=True))
+        my_corpus_with_convo.to_sqlite(tmp_path / "corpus.db")
+        corpus = Corpus.from_sqlite(tmp_path / "corpus.db")
+        assert corpus.asdict() == my_corpus_with_convo.asdict()
+        # conversations without matching utterances are left out
+        assert len(Corpus.from_sqlite(tmp_path / "corpus.db", where="participant = 'A'").conversations) == 2
+
+    def test_where_metadata(self, database):
+        corpus = Corpus.from_sqlite(database, where="metadata IS NULL AND conversations.source = ?",
+                                    params=("other.cha",))
+        assert [c.metadata["source"] for c in corpus.conversations] == ["other.cha"]
+        corpus = Corpus.from_sqlite(database, where="conversations.conversation_metadata LIKE ?",
+                                    params=('%"other.cha"%',))
+        assert len(corpus.conversations) == 1
+
+    def test_overwrite(self, database):
+        Corpus(language="Dutch").to_sqlite(database)
+        corpus = Corpus.from_sqlite(database)
+        assert not corpus.conversations
+        assert corpus.metadata == {"language": "Dutch"}
+
+    def test_where(self, my_corpus_with_convo, database):
+        corpus = Corpus.from_sqlite(database, where='participant = ? AND "end" < ?', params=("A", 5000))
+        expected = [[u for u in c.utterances if u.participant == "A" and u.time and u.time[1] < 5000]
+                    for c in my_corpus_with_convo.conversations]
+        assert [c.utterances for c in corpus.conversations] == expected
+
+    def test_sources(self, database):
+        corpus = Corpus.from_sqlite(database, sources=["other.cha"])
+        assert [c.metadata["source"] for c in corpus.conversations] == ["other.cha"]
+
+    def test_metadata(self, database):
+        with sqlite3.connect(database) as connection:
+            rows = connection.execute("SELECT DISTINCT value FROM metadata WHERE key = 'Participants_A_name'")
+            assert rows.fetchall() == [("Aone",)]
+        corpus = Corpus.from_sqlite(database,
+                                    where="conversations.conversation_id IN "
+                                          "(SELECT conversation_id FROM metadata WHERE key = ? AND value = ?)",
+                                    params=("source", "other.cha"))
+        assert len(corpus.conversations) == 1
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from sktalk.corpus.conversation import Conversation
+from sktalk.corpus.corpus import Corpus
+from sktalk.corpus.lazy import LazyCorpus
+from sktalk.corpus.stats import QuantileSketch
+from sktalk.corpus.stats import Summary
+
+
+class TestQuantileSketch:
+    def test_exact(self):
+        values = np.arange(100.0)
+        sketch = QuantileSketch(capacity=100)
+        sketch.add(values[:40])
+        sketch.merge(QuantileSketch(capacity=100).merge(QuantileSketch()).merge(QuantileSketch(capacity=100)))
+        sketch.add(values[40:])
+        assert sketch.quantiles([0.1, 0.5]) == np.quantile(values, [0.1, 0.5]).tolist()
+        assert sketch.mean() == pytest.approx(values.mean())
+        assert QuantileSketch().quantiles([0.5]) == [None]
+        assert QuantileSketch().mean() is None
+
+    def test_bounded(self):
+        values = np.random.default_rng(0).normal(size=20000)
+        sketches = [QuantileSketch(capacity=200) for _ in range(4)]
+        for i, chunk in enumerate(np.array_split(values, 40)):
+            sketches[i % 4].add(chunk)
+        sketch = sketches[0]
+        for other in sketches[1:]:
+            sketch.merge(other)
+        assert len(sketch) == len(values)
+        assert sum(len(level) for level in sketch._levels) < 200 * len(sketch._levels)  # noqa: W0212
+        ranks = np.searchsorted(np.sort(values), sketch.quantiles([0.25, 0.5, 0.75])) / len(values)
+        assert ranks == pytest.approx([0.25, 0.5, 0.75], abs=0.02)
+        assert sketch.mean() == pytest.approx(values.mean())
+
+
+class TestSummary:
+    def test_from_conversation(self, convo):
+        stats = Summary.from_conversation(convo).asdict()
+        assert stats == {"source": "file.cha", "utterances": 10, "duration": 13000.0, "words": 30,
+                         "participants": 3, "FTO_mean": None, "FTO_q25": None, "FTO_median": None,
+                         "FTO_q75": None, "untimed": 0.1}
+
+    def test_empty(self, empty_convo):
+        stats = Summary.from_conversation(empty_convo).asdict()
+        assert stats["utterances"] == 0
+        assert stats["duration"] is None
+        assert stats["untimed"] is None
+
+    def test_merge(self, convo_fto):
+        convo_fto.calculate_FTO()
+        first, second = convo_fto[:5], convo_fto[5:]
+        merged = Summary.from_conversation(first).merge(Summary.from_conversation(second)).asdict()
+        expected = Summary.from_conversation(convo_fto).asdict()
+        assert merged["utterances"] == expected["utterances"]
+        assert merged["words"] == expected["words"]
+        # participants are counted per conversation
+        assert merged["participants"] == Summary.from_conversation(first).n_participants \
+            + Summary.from_conversation(second).n_participants
+        # quantiles of merged summaries are exact, as long as the sketch is not compacted
+        assert merged["FTO_mean"] == pytest.approx(expected["FTO_mean"])
+        assert merged["FTO_median"] == pytest.approx(expected["FTO_median"])
+        fto = convo_fto.utterance_df["FTO"].dropna().astype(float)
+        assert expected["FTO_median"] == pytest.approx(fto.median())
+
+
+class TestCorpusStats:
+    def test_stats(self, convo, convo_fto):
+        convo_fto.calculate_FTO()
+        corpus = Corpus([convo, Conversation(convo_fto.utterances, {"source": "fto.cha"})])
+        df = corpus.stats(workers=2)
+        assert df["source"].tolist() == ["file.cha", "fto.cha", "total"]
+        total = df.iloc[-1]
+        assert total["utterances"] == len(convo) + len(convo_fto)
+        assert total["words"] == df["words"].iloc[:2].sum()
+        assert total["duration"] == df["duration"].iloc[:2].sum()
+        assert total["participants"] == df["participants"].iloc[:2].sum()
+        assert total["FTO_mean"] == pytest.approx(df["FTO_mean"].iloc[1])
+        n_untimed = (df["untimed"] * df["utterances"]).iloc[:2].sum()
+        assert total["untimed"] == pytest.approx(n_untimed / total["utterances"])
+
+    def test_lazy(self, conversation_files):
+        lazy = LazyCorpus(conversation_files, max_cached=1).stats(workers=2)
+        loaded = Corpus([Conversation.from_json(path) for path in conversation_files]).stats()
+        assert lazy.equals(loaded)
+        assert lazy["utterances"].tolist() == [10, 9, 8, 27]
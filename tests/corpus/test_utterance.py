@@ -1,4 +1,7 @@
+import dataclasses
+import warnings
 from contextlib import nullcontext as does_not_raise
+import numpy as np
 import pytest
 from sktalk.corpus.utterance import Utterance
 
@@ -50,6 +53,18 @@ class TestUtterance():
             assert utt.time == time_out
             assert utt.begin_timestamp == timestamp_begin
 
+    def test_replace(self):
+        utt = Utterance("Hello big world [laugh]", time=[0, 1000])
+        replaced = dataclasses.replace(utt, utterance="One")
+        assert replaced.utterance_list == ["One"]
+        assert replaced.n_words == 1
+
+    def test_from_cleaned(self):
+        utt = Utterance("Hello (3.1) world", participant="A", time=[0, 1000])
+        cleaned = Utterance._from_cleaned(utt.utterance, utt.utterance_raw,  # noqa: W0212
+                                          participant="A", time=[0, 1000])
+        assert cleaned == utt
+
     def test_asdict(self):
         utt = Utterance(
             utterance="Hello world"
@@ -97,3 +112,37 @@ class TestUtterance():
     def test_to_timestamp(self, milliseconds, timestamp):
         utt = Utterance(utterance="")
         assert utt._to_timestamp(milliseconds) == timestamp   # noqa: W0212
+
+    def test_from_arrays(self):
+        texts = ["Hello [laugh]", "world", "text", "more text", "last"]
+        participants = ["A", "B", None, "A", "B"]
+        begin = [0, 1706326, None, 29, 222222]
+        end = [1000, 1706400, None, 10, 400000]
+        with pytest.warns(match="1 utterances have invalid time") as record:
+            utterances = Utterance.from_arrays(texts, participants, begin, end)
+        assert len(record) == 1
+        for i, utterance in enumerate(utterances):
+            time = None if begin[i] is None else [begin[i], end[i]]
+            if i == 3:
+                time = None
+            assert utterance == Utterance(texts[i], participant=participants[i], time=time)
+
+    @pytest.mark.parametrize("begin, end", [
+        ("0", "1000"),
+        (0.0, 1000.0),
+        (0, 1000.5),
+        (np.nan, 1000),
+    ])
+    def test_from_arrays_as_single(self, begin, end):
+        # times are validated as when the utterance is created on its own
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = Utterance("text", time=[begin, end])
+            utterance, = Utterance.from_arrays(["text"], begin=[begin], end=[end])
+        assert utterance == expected
+        if expected.time is not None:
+            assert [type(time) for time in utterance.time] == [type(begin), type(end)]
+
+    @pytest.mark.parametrize("milliseconds, timestamp", milliseconds_timestamp)
+    def test_to_timestamps(self, milliseconds, timestamp):
+        assert Utterance._to_timestamps([milliseconds]) == [timestamp]   # noqa: W0212
@@ -0,0 +1,70 @@
+import json
+import math
+import os
+import shutil
+import pytest
+from sktalk.cli import main
+
+
+FILES = ["tests/testdata/file01.cha", "tests/testdata/file02.eaf"]
+
+
+class TestCli:
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_convert(self, tmp_path, capsys, jobs):
+        assert main(["convert", *FILES, "-o", str(tmp_path), "-j", jobs]) == 0
+        assert sorted(os.listdir(tmp_path)) == [".sktalk.json", "file01.json", "file02.json"]
+        with open(tmp_path / "file01.json", encoding="utf-8") as f:
+            assert len(json.load(f)["Utterances"]) == 15
+        assert "Processed 2 files (27 utterances)" in capsys.readouterr().err
+        # up-to-date outputs are skipped
+        assert main(["convert", *FILES, "-o", str(tmp_path), "-j", jobs]) == 0
+        assert "Processed 0 files (0 utterances)" in capsys.readouterr().err
+        assert main(["convert", *FILES, "-o", str(tmp_path), "--force"]) == 0
+        assert "Processed 2 files" in capsys.readouterr().err
+
+    def test_directory_csv(self, tmp_path, capsys):
+        assert main(["convert", "tests/testdata", "-o", str(tmp_path), "-f", "csv"]) == 0
+        assert sorted(os.listdir(tmp_path)) == [".sktalk.json", "file01.csv", "file01_metadata.csv"]
+        assert "Object saved" not in capsys.readouterr().out
+
+    def test_fto(self, tmp_path, capsys):
+        assert main(["convert", FILES[0], "-o", str(tmp_path)]) == 0
+        # outputs of another subcommand, or with other parameters, are not up to date
+        for window in ["5000", "5000", "3000"]:
+            assert main(["fto", FILES[0], "-o", str(tmp_path), "--window", window]) == 0
+            with open(tmp_path / "file01.json", encoding="utf-8") as f:
+                conversation = json.load(f)
+            assert conversation["Calculations"]["FTO"]["window"] == int(window)
+            assert any(u["FTO"] is not None for u in conversation["Utterances"])
+        err = capsys.readouterr().err.splitlines()
+        assert [line.split()[1] for line in err] == ["1", "1", "0", "1"]
+
+    def test_output_conflicts(self, tmp_path, capsys):
+        shutil.copy(FILES[1], tmp_path / "file01.eaf")
+        assert main(["convert", FILES[0], str(tmp_path / "file01.eaf"), "-o", str(tmp_path)]) == 1
+        err = capsys.readouterr().err
+        assert "would be written for each of" in err
+        assert "2 failed" in err
+        assert not (tmp_path / "file01.json").exists()
+        (tmp_path / "input.json").write_text("{}", encoding="utf-8")
+        assert main(["convert", str(tmp_path / "input.json")]) == 1
+        assert "would overwrite the input" in capsys.readouterr().err
+
+    def test_stats(self, tmp_path, capsys):
+        assert main(["stats", *FILES]) == 0
+        out = capsys.readouterr().out.splitlines()
+        assert out[0].split() == ["source", "utterances", "duration", "words", "participants",
+                                  "FTO_mean", "FTO_q25", "FTO_median", "FTO_q75", "untimed"]
+        assert out[1].split()[:2] == [FILES[0], "15"]
+        assert out[-1].split()[0] == "total"
+        # the FTO is calculated before the conversations are summarised
+        assert math.isfinite(float(out[-1].split()[5]))
+        assert main(["stats", *FILES, "-o", str(tmp_path / "stats.csv")]) == 0
+        assert (tmp_path / "stats.csv").exists()
+
+    def test_failure(self, tmp_path, capsys):
+        assert main(["convert", FILES[0], "README.md", "-o", str(tmp_path)]) == 1
+        err = capsys.readouterr().err
+        assert "Could not process README.md" in err
+        assert "1 failed" in err
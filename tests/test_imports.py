@@ -0,0 +1,27 @@
+import subprocess
+import sys
+import pytest
+
+
+HEAVY_DEPENDENCIES = ["pandas", "numpy", "pylangacq", "pympi"]
+
+
+@pytest.mark.parametrize("statement", [
+    "import sktalk",
+    "from sktalk import Utterance",
+    "from sktalk import Conversation, Corpus",
+])
+def test_import_is_lazy(statement):
+    """Importing sktalk and its main classes should not import heavy dependencies."""
+    code = f"{statement}; import sys; print(','.join(m for m in {HEAVY_DEPENDENCIES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_attributes():
+    import sktalk  # noqa: import-outside-toplevel
+    from sktalk.corpus.conversation import Conversation  # noqa: import-outside-toplevel
+    assert sktalk.Conversation is Conversation
+    assert "Corpus" in dir(sktalk)
+    with pytest.raises(AttributeError):
+        sktalk.Nonexistent  # noqa: pointless-statement
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+from sktalk.corpus.conversation import Conversation
+from sktalk.profiling import Profile
+from sktalk.profiling import instrument
+from sktalk.profiling import profile
+
+
+class TestProfile:
+    def test_record(self):
+        prof = Profile()
+        prof.record("stage", 0.5, 10)
+        prof.record("stage", 1.5, 30)
+        result = prof.asdict()["stage"]
+        assert result["calls"] == 2
+        assert result["total_time"] == 2.0
+        assert result["mean_time"] == 1.0
+        assert result["utterances"] == 40
+        assert result["utterances_per_second"] == 20
+        prof.reset()
+        assert not prof.asdict()
+
+    def test_to_df(self):
+        prof = Profile()
+        prof.record("stage", 0.5, 10)
+        df = prof.to_df()
+        assert isinstance(df, pd.DataFrame)
+        assert df.loc["stage", "calls"] == 1
+
+
+class TestInstrument:
+    def test_inactive(self):
+        calls = []
+
+        @instrument("stage")
+        def func(x):
+            calls.append(x)
+            return x
+        assert func(1) == 1
+        with profile() as prof:
+            assert func(2) == 2
+        assert func(3) == 3
+        assert calls == [1, 2, 3]
+        assert prof.asdict()["stage"]["calls"] == 1
+
+    def test_nested_profiles(self):
+        @instrument("stage", count=lambda result, *_: result)
+        def func(x):
+            return x
+        with profile() as outer:
+            func(2)
+            with profile() as inner:
+                func(3)
+        assert outer.asdict()["stage"]["utterances"] == 5
+        assert inner.asdict()["stage"]["utterances"] == 3
+
+    @pytest.mark.parametrize("path, reader", [
+        ("tests/testdata/file01.cha", "pylangacq.read_chat"),
+        ("tests/testdata/file02.eaf", "pympi.Eaf")
+    ])
+    def test_parse_stages(self, path, reader):
+        with profile() as prof:
+            convo = Conversation.from_cha(path) if path.endswith(".cha") else Conversation.from_eaf(path)
+            convo.calculate_FTO()
+        stages = prof.asdict()
+        assert stages["InputFile.parse"]["utterances"] == len(convo)
+        # calculating FTO constructs sub-conversations
+        assert stages["Conversation.__init__"]["calls"] > 1
+        assert stages["Conversation.calculate_FTO"]["utterances"] == len(convo)
+        assert stages["Utterance.__post_init__"]["calls"] >= len(convo)
+        assert stages[reader]["calls"] >= 1
+
+    def test_metadata_stage(self, convo):
+        with profile() as prof:
+            convo.metadata_df  # noqa: pointless-statement
+        assert prof.asdict()["Writer._metadata_to_df"]["calls"] == 1